@@ -0,0 +1,149 @@
+import threading
+from bisect import bisect_left
+
+COMPLETION_LIMIT = 8
+# Keys examined per lookup; a one-letter prefix over a huge index still answers within a keystroke.
+COMPLETION_SCAN_LIMIT = 2000
+TOKEN_LOOKBACK = 100
+
+
+def completion_token(text_before_caret):
+	"""The @mention or #hashtag being typed at the end of text_before_caret, or None."""
+	tail = text_before_caret[-TOKEN_LOOKBACK:]
+	start = max(tail.rfind(" "), tail.rfind("\n"), tail.rfind("\t")) + 1
+	token = tail[start:]
+	# "@" or "#" glued to a word ("mail@host", "c#") is not a completion.
+	if len(token) < 2 or token[0] not in "@#" or token[1] in "@#":
+		return None
+	return token
+
+
+class PrefixIndex:
+	"""Lower-cased keys kept sorted for bisect prefix lookups, each mapping to a set of item ids.
+
+	Keys added since the last lookup are merged in lazily, so feeding the index from worker
+	threads costs a dict update per key.
+	"""
+
+	def __init__(self):
+		self.keys = {}
+		self._sorted = []
+		self._pending = []
+
+	def add(self, key, item_id):
+		key = key.lower()
+		if not key:
+			return
+		ids = self.keys.get(key)
+		if ids is None:
+			ids = self.keys[key] = set()
+			self._pending.append(key)
+		ids.add(item_id)
+
+	def matches(self, prefix, scan_limit=COMPLETION_SCAN_LIMIT):
+		if self._pending:
+			self._sorted.extend(self._pending)
+			self._sorted.sort()
+			self._pending = []
+		prefix = prefix.lower()
+		found = set()
+		i = bisect_left(self._sorted, prefix)
+		end = min(len(self._sorted), i + scan_limit)
+		while i < end and self._sorted[i].startswith(prefix):
+			found.update(self.keys[self._sorted[i]])
+			i += 1
+		return found
+
+
+class CompletionIndex:
+	"""Accounts and hashtags seen anywhere in the client, for @mention and #hashtag completion."""
+
+	def __init__(self):
+		self.accounts = {}
+		self.tags = {}
+		self.seen = {}
+		self.account_keys = PrefixIndex()
+		self.tag_keys = PrefixIndex()
+		self._lock = threading.Lock()
+
+	def _add_account(self, acct, username="", display_name="", account_id=None):
+		acct = (acct or "").lstrip("@")
+		if not acct:
+			return
+		key = "@" + acct.lower()
+		known = self.accounts.get(key)
+		if known is None or (display_name and not known["display_name"]):
+			self.accounts[key] = {"acct": acct, "display_name": display_name or "", "id": account_id}
+		self.seen[key] = self.seen.get(key, 0) + 1
+		self.account_keys.add(acct, key)
+		if username:
+			self.account_keys.add(username, key)
+		for word in (display_name or "").split():
+			self.account_keys.add(word, key)
+
+	def _add_tag(self, name):
+		name = (name or "").lstrip("#")
+		if not name:
+			return
+		key = "#" + name.lower()
+		self.tags.setdefault(key, name)
+		self.seen[key] = self.seen.get(key, 0) + 1
+		self.tag_keys.add(name, key)
+
+	def _add_status(self, status):
+		for source in (status, status.get("reblog")):
+			if not source:
+				continue
+			account = source.get("account") or {}
+			self._add_account(account.get("acct"), account.get("username"), account.get("display_name"), account.get("id"))
+			for mention in source.get("mentions") or []:
+				self._add_account(mention.get("acct"), mention.get("username"), "", mention.get("id"))
+			for tag in source.get("tags") or []:
+				self._add_tag(tag.get("name"))
+
+	def add_items(self, items):
+		"""Feeds statuses and notifications; safe to call from worker threads."""
+		with self._lock:
+			for item in items or []:
+				if not item:
+					continue
+				if "type" in item and "content" not in item:
+					# Grouped notifications carry a sample of the accounts behind them.
+					for account in item.get("accounts") or [item.get("account")]:
+						account = account or {}
+						self._add_account(account.get("acct"), account.get("username"), account.get("display_name"), account.get("id"))
+					item = item.get("status")
+				if item:
+					self._add_status(item)
+
+	def add_accounts(self, accounts):
+		with self._lock:
+			for account in accounts or []:
+				if account:
+					self._add_account(account.get("acct"), account.get("username"), account.get("display_name"), account.get("id"))
+
+	def add_tags(self, tags):
+		with self._lock:
+			for tag in tags or []:
+				self._add_tag(tag.get("name") if isinstance(tag, dict) else tag)
+
+	def complete(self, token, limit=COMPLETION_LIMIT):
+		"""Completions for an "@..." or "#..." token as dicts with the text to insert and a label to show."""
+		if not token or len(token) < 2 or token[0] not in "@#":
+			return []
+		prefix = token[1:].lower()
+		with self._lock:
+			if token[0] == "@":
+				keys = self.account_keys.matches(prefix)
+			else:
+				keys = self.tag_keys.matches(prefix)
+			# Exact handles first, then whatever has turned up most often, then the shortest.
+			ranked = sorted(keys, key=lambda key: (key[1:] != prefix, -self.seen.get(key, 0), len(key), key))[:limit]
+			if token[0] == "#":
+				return [{"text": "#" + self.tags[key], "label": "#" + self.tags[key]} for key in ranked]
+			results = []
+			for key in ranked:
+				account = self.accounts[key]
+				label = f"{account['display_name']} (@{account['acct']})" if account["display_name"] else f"@{account['acct']}"
+				results.append({"text": "@" + account["acct"], "label": label})
+			return results
@@ -0,0 +1,188 @@
+import threading
+import time
+
+from mastodon import MastodonNotFoundError
+
+from mastodon_api import fetch_accounts, fetch_collection
+
+
+RELATIONSHIP_TTL = 300
+ACCOUNT_TTL = 120
+# Thread contexts change with every reply, so a prefetched one is only trusted briefly.
+CONTEXT_TTL = 30
+# Mastodon rejects relationship lookups for more than 40 ids at once.
+RELATIONSHIP_BATCH_SIZE = 40
+# The multi-id accounts endpoint has the same 40 id limit.
+ACCOUNT_BATCH_SIZE = 40
+# Collection detail is dropped on any of our own edits; the TTL only bounds changes made elsewhere.
+COLLECTION_TTL = 600
+
+
+class TTLCache:
+	"""Thread-safe mapping whose entries expire after a fixed number of seconds."""
+
+	def __init__(self, ttl, clock=time.monotonic):
+		self.ttl = ttl
+		self.clock = clock
+		self._entries = {}
+		self._lock = threading.Lock()
+
+	def get(self, key, default=None):
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				return default
+			stored_at, value = entry
+			if self.clock() - stored_at > self.ttl:
+				del self._entries[key]
+				return default
+			return value
+
+	def set(self, key, value):
+		with self._lock:
+			self._entries[key] = (self.clock(), value)
+		return value
+
+	def pop(self, key, default=None):
+		value = self.get(key, default)
+		self.invalidate(key)
+		return value
+
+	def invalidate(self, key):
+		with self._lock:
+			self._entries.pop(key, None)
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+
+	def __contains__(self, key):
+		return self.get(key) is not None
+
+
+def _unique_ids(account_ids):
+	seen = set()
+	ids = []
+	for account_id in account_ids:
+		if account_id is None:
+			continue
+		account_id = str(account_id)
+		if account_id not in seen:
+			seen.add(account_id)
+			ids.append(account_id)
+	return ids
+
+
+class RelationshipCache(TTLCache):
+	"""Relationships to other accounts, keyed by account id."""
+
+	def __init__(self, ttl=RELATIONSHIP_TTL, clock=time.monotonic):
+		super().__init__(ttl, clock)
+
+	def get(self, account_id, default=None):
+		return super().get(str(account_id), default)
+
+	def invalidate(self, account_id):
+		super().invalidate(str(account_id))
+
+	def store(self, relationship):
+		"""Cache a relationship as returned by the relationships, follow, block or mute endpoints."""
+		if relationship and relationship.get("id") is not None:
+			self.set(str(relationship["id"]), relationship)
+		return relationship
+
+	def missing(self, account_ids):
+		return [account_id for account_id in _unique_ids(account_ids) if self.get(account_id) is None]
+
+	def fetch(self, mastodon, account_ids):
+		"""Return relationships for account_ids, requesting only the ones not already cached."""
+		ids = _unique_ids(account_ids)
+		missing = [account_id for account_id in ids if self.get(account_id) is None]
+		for start in range(0, len(missing), RELATIONSHIP_BATCH_SIZE):
+			for relationship in mastodon.account_relationships(missing[start:start + RELATIONSHIP_BATCH_SIZE]) or []:
+				self.store(relationship)
+		return {account_id: self.get(account_id) for account_id in ids if self.get(account_id) is not None}
+
+	def lookup(self, mastodon, account_id):
+		return self.fetch(mastodon, [account_id]).get(str(account_id))
+
+
+class AccountCache(TTLCache):
+	"""Accounts keyed by id, hydrated in batches through the multi-id accounts endpoint."""
+
+	def __init__(self, ttl=ACCOUNT_TTL, clock=time.monotonic):
+		super().__init__(ttl, clock)
+		# Cleared on servers older than 4.3, which only serve accounts one at a time.
+		self.batched = True
+
+	def get(self, account_id, default=None):
+		return super().get(str(account_id), default)
+
+	def set(self, account_id, account):
+		return super().set(str(account_id), account)
+
+	def invalidate(self, account_id):
+		super().invalidate(str(account_id))
+
+	def store(self, accounts):
+		for account in accounts or []:
+			if account and account.get("id") is not None:
+				self.set(account["id"], account)
+
+	def fetch(self, mastodon, account_ids):
+		"""Return {id: account} for account_ids, requesting only the ones not already cached."""
+		ids = _unique_ids(account_ids)
+		missing = [account_id for account_id in ids if self.get(account_id) is None]
+		for start in range(0, len(missing), ACCOUNT_BATCH_SIZE):
+			batch = missing[start:start + ACCOUNT_BATCH_SIZE]
+			if self.batched:
+				try:
+					self.store(fetch_accounts(mastodon, batch))
+					continue
+				except MastodonNotFoundError:
+					self.batched = False
+			self.store(mastodon.account(account_id) for account_id in batch)
+		return {account_id: self.get(account_id) for account_id in ids if self.get(account_id) is not None}
+
+
+class CollectionCache(TTLCache):
+	"""Collection detail (the collection and its member accounts in item order), keyed by collection id."""
+
+	def __init__(self, ttl=COLLECTION_TTL, clock=time.monotonic):
+		super().__init__(ttl, clock)
+
+	def get(self, collection_id, default=None):
+		return super().get(str(collection_id), default)
+
+	def invalidate(self, collection_id):
+		super().invalidate(str(collection_id))
+
+	def load(self, mastodon, collection, accounts):
+		"""Returns (collection, member accounts): one request for the collection, plus one per 40 members it did not embed."""
+		detail = self.get(collection["id"])
+		if detail is not None:
+			return detail
+		data = fetch_collection(mastodon, collection["id"])
+		full_collection = data.get("collection", collection) if isinstance(data, dict) else collection
+		embedded = (data.get("accounts") if isinstance(data, dict) else None) or []
+		accounts.store(embedded)
+		member_ids = [item.get("account_id") for item in full_collection.get("items") or []] or [account.get("id") for account in embedded]
+		found = accounts.fetch(mastodon, member_ids)
+		detail = (full_collection, [found[account_id] for account_id in _unique_ids(member_ids) if account_id in found])
+		self.set(str(collection["id"]), detail)
+		return detail
+
+
+def author_ids(items):
+	"""Account ids of the authors (and boosters) in a page of statuses or notifications."""
+	ids = []
+	for item in items or []:
+		if not item:
+			continue
+		account = item.get("account")
+		if account:
+			ids.append(account.get("id"))
+		for nested in (item.get("reblog"), item.get("status")):
+			if nested and nested.get("account"):
+				ids.append(nested["account"].get("id"))
+	return _unique_ids(ids)
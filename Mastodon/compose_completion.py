@@ -0,0 +1,89 @@
+import wx
+
+from autocomplete import TOKEN_LOOKBACK, completion_token
+from prefetch import RateBudget
+from tasks import BackgroundTask
+
+# Tokens the local index knows nothing about are looked up on the server, at most this often.
+REMOTE_LOOKUPS_PER_MINUTE = 20
+
+
+class ComposeCompleter:
+	"""Offers @mention and #hashtag completions for a composer text control on Ctrl+Space.
+
+	Suggestions open in a choice dialog whose list takes the focus, so screen readers read each
+	one as it is selected; Enter inserts the choice and Escape goes back to the text unchanged.
+	Typing, Tab, Enter and the arrow keys in the text control are never intercepted.
+	"""
+
+	def __init__(self, text_ctrl, index, remote_lookup=None):
+		self.text = text_ctrl
+		self.index = index
+		self.remote_lookup = remote_lookup
+		self.looked_up = set()
+		self.lookups = RateBudget(REMOTE_LOOKUPS_PER_MINUTE)
+		self.lookup_task = None
+		text_ctrl.Bind(wx.EVT_CHAR_HOOK, self.on_char_hook)
+		text_ctrl.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+	def _text_before_caret(self):
+		caret = self.text.GetInsertionPoint()
+		# GetRange keeps positions and text consistent even where the control counts line breaks as two characters.
+		return self.text.GetRange(max(0, caret - TOKEN_LOOKBACK), caret), caret
+
+	def on_char_hook(self, event):
+		if event.GetKeyCode() == wx.WXK_SPACE and event.GetModifiers() == wx.MOD_CONTROL:
+			self.complete()
+		else:
+			event.Skip()
+
+	def complete(self):
+		before, _ = self._text_before_caret()
+		token = completion_token(before)
+		if not token:
+			wx.Bell()
+			return
+		matches = self.index.complete(token)
+		if matches:
+			self.choose(token, matches)
+		elif self.remote_lookup and token.lower() not in self.looked_up and self.lookups.take():
+			self.looked_up.add(token.lower())
+			self.lookup_task = BackgroundTask(lambda: self.remote_lookup(token), lambda result: self._lookup_done(token), lambda ex: wx.Bell(), wx.CallAfter).start()
+		else:
+			wx.Bell()
+
+	def _lookup_done(self, token):
+		if not self.text:
+			return
+		before, _ = self._text_before_caret()
+		# Only offer what was asked for if the caret is still on the same token.
+		if completion_token(before) != token:
+			return
+		matches = self.index.complete(token)
+		if matches:
+			self.choose(token, matches)
+		else:
+			wx.Bell()
+
+	def choose(self, token, matches):
+		dialog = wx.SingleChoiceDialog(self.text.GetTopLevelParent(), f"Completions for {token}:", "Complete", [match["label"] for match in matches])
+		try:
+			if dialog.ShowModal() == wx.ID_OK:
+				self.insert(token, matches[dialog.GetSelection()]["text"])
+		finally:
+			dialog.Destroy()
+			self.text.SetFocus()
+
+	def insert(self, token, completion):
+		_, caret = self._text_before_caret()
+		start = caret - len(token)
+		insert = completion + " "
+		self.text.Replace(start, caret, insert)
+		self.text.SetInsertionPoint(start + len(insert))
+
+	def on_destroy(self, event):
+		event.Skip()
+		if event.GetEventObject() is self.text:
+			if self.lookup_task:
+				self.lookup_task.cancel()
+			self.text = None
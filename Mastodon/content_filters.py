@@ -0,0 +1,265 @@
+import re
+import threading
+from datetime import datetime, timezone
+
+from post_rendering import derived_text, status_text
+
+FILTER_CONTEXTS = ("home", "notifications", "public", "thread", "account")
+LOCAL_FILTER_KINDS = ("keyword", "regex", "account", "boosts")
+ALL_ACCOUNTS = "*"
+
+# Which v2 filter context governs each timeline kind; kinds missing here (sent, favourites, bookmarks, search) are never filtered.
+_TIMELINE_CONTEXTS = {
+	"home": "home",
+	"list": "home",
+	"direct_messages": "home",
+	"local": "public",
+	"federated": "public",
+	"hashtag": "public",
+	"notifications": "notifications",
+	"mentions": "notifications",
+	"thread": "thread",
+	"user": "account",
+}
+
+
+def timeline_context(key):
+	return _TIMELINE_CONTEXTS.get((key or "").partition(":")[0])
+
+
+class AhoCorasick:
+	"""Finds every occurrence of many keywords in one pass over the text, however many keywords there are."""
+
+	def __init__(self, keywords):
+		self.keywords = list(keywords)
+		goto, fail, out = [{}], [0], [[]]
+		for index, keyword in enumerate(self.keywords):
+			state = 0
+			for ch in keyword:
+				if ch not in goto[state]:
+					goto.append({})
+					fail.append(0)
+					out.append([])
+					goto[state][ch] = len(goto) - 1
+				state = goto[state][ch]
+			out[state].append(index)
+		queue = list(goto[0].values())
+		for state in queue:
+			for ch, child in goto[state].items():
+				queue.append(child)
+				fallback = fail[state]
+				while fallback and ch not in goto[fallback]:
+					fallback = fail[fallback]
+				fail[child] = goto[fallback].get(ch, 0)
+				out[child] = out[child] + out[fail[child]]
+		self.goto, self.fail, self.out = goto, fail, out
+
+	def __bool__(self):
+		return bool(self.keywords)
+
+	def finditer(self, text):
+		"""Yields (start, end, keyword index) for each match."""
+		goto, fail, out, keywords = self.goto, self.fail, self.out, self.keywords
+		state = 0
+		for position, ch in enumerate(text):
+			while state and ch not in goto[state]:
+				state = fail[state]
+			state = goto[state].get(ch, 0)
+			for index in out[state]:
+				yield position + 1 - len(keywords[index]), position + 1, index
+
+
+def _is_word_char(text, position):
+	return 0 <= position < len(text) and (text[position].isalnum() or text[position] == "_")
+
+
+def filter_text(status):
+	"""Everything a v2 filter keyword is matched against: body, content warning, poll options and media descriptions."""
+	parts = [status_text(status), status.get("spoiler_text") or ""]
+	parts.extend(option.get("title") or "" for option in (status.get("poll") or {}).get("options") or [])
+	parts.extend(media.get("description") or "" for media in status.get("media_attachments") or [])
+	return "\n".join(parts).lower()
+
+
+def valid_pattern(pattern):
+	try:
+		re.compile(pattern, re.IGNORECASE)
+	except re.error:
+		return False
+	return True
+
+
+def _joins_cleanly(compiled):
+	"""True if a rule's pattern means the same once wrapped and joined to others in one alternation.
+
+	Joining renumbers groups, which retargets backreferences and can clash on group names, and
+	inline flags such as (?i) are only allowed at the very start of the whole pattern.
+	"""
+	if compiled.groups:
+		return False
+	try:
+		re.compile(f"(?:{compiled.pattern})")
+	except re.error:
+		return False
+	return True
+
+
+def _acct(account):
+	return ((account or {}).get("acct") or "").lower()
+
+
+def _expired(server_filter, now):
+	expires_at = server_filter.get("expires_at")
+	if not expires_at:
+		return False
+	if isinstance(expires_at, str):
+		try:
+			expires_at = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+		except ValueError:
+			return False
+	return expires_at <= now
+
+
+def server_filter_rules(server_filters, now=None):
+	"""Turns /api/v2/filters results into rules. Only "hide" filters remove posts; "warn" ones are left to the server's markers."""
+	now = now or datetime.now(timezone.utc)
+	rules = []
+	for server_filter in server_filters or []:
+		if server_filter.get("filter_action", "warn") != "hide" or _expired(server_filter, now):
+			continue
+		contexts = list(server_filter.get("context") or FILTER_CONTEXTS)
+		title = server_filter.get("title") or ""
+		for keyword in server_filter.get("keywords") or []:
+			rules.append({"kind": "keyword", "value": keyword.get("keyword") or "", "whole_word": bool(keyword.get("whole_word")), "contexts": contexts, "title": title})
+		for filtered_status in server_filter.get("statuses") or []:
+			rules.append({"kind": "status", "value": str(filtered_status.get("status_id")), "contexts": contexts, "title": title})
+	return rules
+
+
+def describe_rule(rule):
+	kind, value = rule.get("kind"), rule.get("value")
+	if kind == "keyword":
+		return f"Keyword: {value}" + (" (whole word)" if rule.get("whole_word") else "")
+	if kind == "regex":
+		return f"Pattern: {value}"
+	if kind == "account":
+		return f"Account: @{value}"
+	if kind == "boosts":
+		return "All boosts" if value == ALL_ACCOUNTS else f"Boosts by @{value}"
+	return f"{kind}: {value}"
+
+
+class CompiledFilters:
+	"""The rules for one context, compiled into a keyword automaton, one combined regex and id sets.
+
+	Patterns that would change meaning inside the combined regex keep a regex of their own.
+	"""
+
+	def __init__(self, rules):
+		keywords = [rule for rule in rules if rule["kind"] == "keyword" and rule.get("value")]
+		self.keyword_rules = keywords
+		self.automaton = AhoCorasick(rule["value"].lower() for rule in keywords)
+		joined, self.separate_patterns = [], []
+		for rule in rules:
+			if rule["kind"] != "regex" or not rule.get("value"):
+				continue
+			try:
+				compiled = re.compile(rule["value"], re.IGNORECASE)
+			except re.error:
+				# Invalid rules (say, hand-edited into thrive.ini) are skipped rather than breaking every filter.
+				continue
+			if _joins_cleanly(compiled):
+				joined.append(rule["value"])
+			else:
+				self.separate_patterns.append(compiled)
+		self.pattern = re.compile("|".join(f"(?:{p})" for p in joined), re.IGNORECASE) if joined else None
+		self.accounts = {rule["value"].lstrip("@").lower() for rule in rules if rule["kind"] == "account"}
+		self.boosters = {rule["value"].lstrip("@").lower() for rule in rules if rule["kind"] == "boosts"}
+		self.status_ids = {rule["value"] for rule in rules if rule["kind"] == "status"}
+
+	def __bool__(self):
+		return bool(self.automaton or self.pattern or self.separate_patterns or self.accounts or self.boosters or self.status_ids)
+
+	def _matches_text(self, text):
+		for start, end, index in self.automaton.finditer(text):
+			if not self.keyword_rules[index].get("whole_word"):
+				return True
+			if not _is_word_char(text, start - 1) and not _is_word_char(text, end):
+				return True
+		if self.pattern and self.pattern.search(text):
+			return True
+		return any(pattern.search(text) for pattern in self.separate_patterns)
+
+	def hides_status(self, status):
+		source = status.get("reblog") or status
+		if str(source.get("id")) in self.status_ids or str(status.get("id")) in self.status_ids:
+			return True
+		if source is not status and (ALL_ACCOUNTS in self.boosters or _acct(status.get("account")) in self.boosters):
+			return True
+		if self.accounts and (_acct(status.get("account")) in self.accounts or _acct(source.get("account")) in self.accounts):
+			return True
+		if not (self.automaton or self.pattern or self.separate_patterns):
+			return False
+		return self._matches_text(derived_text.get(source, "filter_text", filter_text))
+
+	def hides(self, item):
+		if not item:
+			return False
+		if "type" in item and "content" not in item:
+			if self.accounts and _acct(item.get("account")) in self.accounts:
+				return True
+			return bool(item.get("status")) and self.hides_status(item["status"])
+		return self.hides_status(item)
+
+
+class FilterEngine:
+	"""Local rules plus the account's server-side filters, compiled once per context and swapped in whole on change.
+
+	Posts (and boosts) by own_account_id are never hidden.
+	"""
+
+	def __init__(self, local_rules=(), server_filters=(), own_account_id=None):
+		self._lock = threading.Lock()
+		self.own_account_id = str(own_account_id) if own_account_id is not None else None
+		self.local_rules = list(local_rules)
+		self.server_rules = server_filter_rules(server_filters)
+		self._compiled = {}
+
+	def set_local_rules(self, rules):
+		with self._lock:
+			self.local_rules = list(rules)
+			self._compiled = {}
+
+	def set_server_filters(self, server_filters):
+		rules = server_filter_rules(server_filters)
+		with self._lock:
+			self.server_rules = rules
+			self._compiled = {}
+
+	def compiled(self, context):
+		with self._lock:
+			compiled = self._compiled.get(context)
+			if compiled is None:
+				rules = [rule for rule in self.local_rules + self.server_rules if context in (rule.get("contexts") or FILTER_CONTEXTS)]
+				compiled = self._compiled[context] = CompiledFilters(rules)
+			return compiled
+
+	def _own(self, item):
+		if self.own_account_id is None or not item or ("type" in item and "content" not in item):
+			return False
+		return str((item.get("account") or {}).get("id")) == self.own_account_id
+
+	def hides(self, item, context):
+		if context is None or self._own(item):
+			return False
+		compiled = self.compiled(context)
+		return bool(compiled) and compiled.hides(item)
+
+	def apply(self, items, context):
+		"""The items that survive the filters for a context (all of them for unfiltered contexts)."""
+		if context is None:
+			return list(items or [])
+		compiled = self.compiled(context)
+		if not compiled:
+			return list(items or [])
+		return [item for item in items or [] if self._own(item) or not compiled.hides(item)]
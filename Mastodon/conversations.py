@@ -0,0 +1,67 @@
+import threading
+
+
+class ConversationStore:
+	"""Direct-message conversations by id, with the unread flag and participants their rows leave out.
+
+	Each row of the direct_messages timeline is a conversation's last status. The store keeps
+	the conversation behind every row so a streamed conversation event can replace the row it
+	belongs to, and so unread conversations can be counted and marked read.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._conversations = {}
+		self._by_status = {}
+
+	def _remember(self, conversation):
+		status = conversation.get("last_status") or {}
+		conversation_id = str(conversation.get("id"))
+		with self._lock:
+			previous = self._conversations.get(conversation_id)
+			if previous and (previous.get("last_status") or {}).get("id") is not None:
+				self._by_status.pop(str(previous["last_status"]["id"]), None)
+			self._conversations[conversation_id] = conversation
+			if status.get("id") is not None:
+				self._by_status[str(status["id"])] = conversation_id
+			return previous
+
+	def add_page(self, page):
+		"""Records a page of /api/v1/conversations and returns the last statuses to list, newest first."""
+		statuses = []
+		for conversation in page or []:
+			if not conversation.get("last_status"):
+				continue
+			self._remember(conversation)
+			statuses.append(conversation["last_status"])
+		return statuses
+
+	def conversation_for(self, status):
+		"""The conversation a listed status is the last post of, or None."""
+		with self._lock:
+			conversation_id = self._by_status.get(str((status or {}).get("id")))
+			return self._conversations.get(conversation_id) if conversation_id else None
+
+	def update(self, items, conversation):
+		"""Takes in a streamed conversation; returns (index of the row in items it replaces or None, its last status)."""
+		previous = self._remember(conversation)
+		index = None
+		if previous and previous.get("last_status"):
+			old_id = str(previous["last_status"].get("id"))
+			index = next((i for i, item in enumerate(items) if str(item.get("id")) == old_id), None)
+		return index, conversation.get("last_status")
+
+	def is_unread(self, status):
+		return bool((self.conversation_for(status) or {}).get("unread"))
+
+	def mark_read(self, status):
+		"""Clears the unread flag of the conversation behind status; returns its id, or None if it was already read."""
+		conversation = self.conversation_for(status)
+		if not conversation or not conversation.get("unread"):
+			return None
+		self._remember(dict(conversation, unread=False))
+		return conversation.get("id")
+
+	def unread_total(self, items):
+		"""How many of the listed conversations are unread."""
+		return sum(1 for status in items or [] if self.is_unread(status))
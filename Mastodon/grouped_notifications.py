@@ -0,0 +1,131 @@
+from markers import id_newer
+from mastodon_api import GROUPED_NOTIFICATION_TYPES
+
+# The server samples at most this many accounts per group; the rest are fetched when a group is expanded.
+GROUP_SAMPLE_SIZE = 8
+
+
+def _name(account):
+	account = account or {}
+	return account.get("display_name") or account.get("username") or "Unknown"
+
+
+def is_expandable(item):
+	"""True for a notification group standing in for more than one notification."""
+	return (item or {}).get("notifications_count", 1) > 1 and bool(item.get("group_key"))
+
+
+def group_actor_label(item):
+	"""Who a notification row is about: "Alex", "Alex and Sam" or "Alex and 11 others"."""
+	accounts = [account for account in (item.get("accounts") or [item.get("account")]) if account]
+	count = item.get("notifications_count", 1)
+	if count <= 1 or not accounts:
+		return _name(item.get("account"))
+	if count == 2 and len(accounts) >= 2:
+		return f"{_name(accounts[0])} and {_name(accounts[1])}"
+	others = count - 1
+	return f"{_name(accounts[0])} and {others} {'other' if others == 1 else 'others'}"
+
+
+def single_group(notification):
+	"""A v1 notification in the shape of a one-notification group."""
+	return dict(notification, accounts=[notification.get("account")], notifications_count=1)
+
+
+def groups_from_page(page):
+	"""Turns a /api/v2/notifications page into one item per group.
+
+	Each item is shaped like a v1 notification (id, type, created_at, account, status) so rows,
+	filters and actions treat it the same way, plus the sampled accounts and the group's size.
+	Accounts and statuses arrive once per page and are shared between the groups that use them.
+	A plain list (the v1 endpoint, on servers without grouping) becomes one group per notification.
+	"""
+	if isinstance(page, list):
+		return [single_group(notification) for notification in page]
+	page = page or {}
+	accounts = {str(account["id"]): account for account in page.get("accounts") or []}
+	statuses = {str(status["id"]): status for status in page.get("statuses") or []}
+	items = []
+	for group in page.get("notification_groups") or []:
+		sample = [accounts[str(account_id)] for account_id in group.get("sample_account_ids") or [] if str(account_id) in accounts]
+		status_id = group.get("status_id")
+		items.append({
+			"id": group.get("most_recent_notification_id"),
+			"group_key": group.get("group_key"),
+			"type": group.get("type"),
+			"created_at": group.get("latest_page_notification_at"),
+			"account": sample[0] if sample else {},
+			"accounts": sample,
+			"notifications_count": group.get("notifications_count", 1),
+			"status": statuses.get(str(status_id)) if status_id is not None else None,
+		})
+	return items
+
+
+def grouped_page_cursor(page):
+	"""The max_id for the page after this one: the oldest notification any of its groups covered.
+
+	Groups are ordered by their newest notification, so a group higher up can reach further back
+	than the last one; the smallest page_min_id across the page is the cursor.
+	"""
+	if isinstance(page, list):
+		return page[-1].get("id") if page else None
+	oldest = None
+	for group in (page or {}).get("notification_groups") or []:
+		min_id = group.get("page_min_id") or group.get("most_recent_notification_id")
+		if min_id is not None and (oldest is None or id_newer(oldest, min_id)):
+			oldest = min_id
+	return oldest
+
+
+def merge_older_groups(existing, older):
+	"""Appends an older page of groups, folding groups already listed into their row by group_key.
+
+	A group can span pages; its newer row already carries the group's total count, so only the
+	sampled accounts it lacks are taken from the older page. Returns the groups appended.
+	"""
+	rows = {item.get("group_key"): index for index, item in enumerate(existing) if item.get("group_key")}
+	seen = {item.get("id") for item in existing}
+	added = []
+	for group in older:
+		index = rows.get(group.get("group_key"))
+		if index is not None:
+			row = existing[index]
+			known = {(account or {}).get("id") for account in row.get("accounts") or []}
+			extra = [account for account in group.get("accounts") or [] if account and account.get("id") not in known]
+			if extra:
+				existing[index] = dict(row, accounts=(list(row.get("accounts") or []) + extra)[:GROUP_SAMPLE_SIZE])
+			continue
+		if group.get("id") in seen:
+			continue
+		seen.add(group.get("id"))
+		if group.get("group_key"):
+			rows[group["group_key"]] = len(existing)
+		existing.append(group)
+		added.append(group)
+	return added
+
+
+def merge_notification(items, notification):
+	"""Folds a streamed v1 notification into the loaded groups.
+
+	Returns (index, item): index is the position of the group it joined (None when it starts a
+	new one) and item is the group to show at the top.
+	"""
+	group_key = notification.get("group_key")
+	account = notification.get("account") or {}
+	if group_key and notification.get("type") in GROUPED_NOTIFICATION_TYPES:
+		for index, group in enumerate(items):
+			if group.get("group_key") != group_key:
+				continue
+			others = [a for a in group.get("accounts") or [] if a and a.get("id") != account.get("id")]
+			return index, dict(
+				group,
+				id=notification.get("id"),
+				created_at=notification.get("created_at"),
+				account=account,
+				accounts=([account] + others)[:GROUP_SAMPLE_SIZE],
+				notifications_count=group.get("notifications_count", 1) + 1,
+				status=notification.get("status") or group.get("status"),
+			)
+	return None, single_group(notification)
@@ -0,0 +1,110 @@
+import time
+
+from mastodon import MastodonNotFoundError
+
+from cache import TTLCache
+from mastodon_api import fetch_statuses
+
+# GET /api/v1/statuses accepts at most 20 ids per request.
+HYDRATE_BATCH_SIZE = 20
+# Counts and flags on a status loaded longer ago than this are refreshed when it is on screen.
+STATUS_FRESH_TTL = 120
+# Milliseconds between refreshes of the rows on screen; each run is capped at HYDRATE_MAX_BATCHES requests.
+HYDRATE_INTERVAL = 60000
+HYDRATE_MAX_BATCHES = 3
+# Milliseconds the list must stay put after a selection change or timeline switch before its rows are refreshed.
+HYDRATE_SCROLL_DELAY = 500
+
+
+def _status_of(item):
+	if item and "type" in item and "content" not in item:
+		return item.get("status")
+	return item
+
+
+def shallow_quote_id(status):
+	"""The id of a quoted post the server sent without its content (a nested or not yet loaded quote)."""
+	quote = (status or {}).get("quote")
+	if not isinstance(quote, dict) or quote.get("quoted_status"):
+		return None
+	quoted_id = quote.get("quoted_status_id")
+	return str(quoted_id) if quoted_id is not None else None
+
+
+def hydrated_item(item, fresh):
+	"""item with its post (or the post it boosts) swapped for a fresh copy and shallow quotes filled in.
+
+	Returns item itself when nothing in fresh changes it, so callers can skip redrawing the row.
+	"""
+	status = _status_of(item)
+	if not status:
+		return item
+	source = status.get("reblog") or status
+	new_source = fresh.get(str(source.get("id")), source)
+	quoted_id = shallow_quote_id(new_source)
+	if quoted_id in fresh:
+		new_source = dict(new_source, quote=dict(new_source["quote"], quoted_status=fresh[quoted_id]))
+	if new_source == source:
+		return item
+	new_status = new_source if source is status else dict(status, reblog=new_source)
+	return new_status if status is item else dict(item, status=new_status)
+
+
+class StatusHydrator:
+	"""Refreshes stale statuses and resolves shallow quotes with the multi-id statuses endpoint.
+
+	Statuses count as fresh for a while after they arrive from the server, so only the ones
+	that have gone stale (or still lack their quoted post) cost a slot in a batch.
+	"""
+
+	def __init__(self, ttl=STATUS_FRESH_TTL, batch_size=HYDRATE_BATCH_SIZE, clock=time.monotonic):
+		self.batch_size = batch_size
+		self.fresh = TTLCache(ttl, clock)
+		# Cleared if the server turns out not to support the endpoint (Mastodon before 4.3).
+		self.supported = True
+
+	def mark_fresh(self, items):
+		"""Records statuses (and notifications' statuses) just received from the server."""
+		for item in items or []:
+			status = _status_of(item)
+			if not status:
+				continue
+			for nested in (status, status.get("reblog")):
+				if nested and nested.get("id") is not None:
+					self.fresh.set(str(nested["id"]), True)
+
+	def stale_ids(self, items, limit=None):
+		"""Ids to request for items, in order: stale posts and the ids of quotes that arrived without content."""
+		ids = {}
+		for item in items or []:
+			status = _status_of(item)
+			if not status:
+				continue
+			source = status.get("reblog") or status
+			if source.get("id") is not None and str(source["id"]) not in self.fresh:
+				ids[str(source["id"])] = True
+			quoted_id = shallow_quote_id(source)
+			if quoted_id and quoted_id not in self.fresh:
+				ids[quoted_id] = True
+			if limit is not None and len(ids) >= limit:
+				break
+		return list(ids)[:limit]
+
+	def fetch(self, mastodon, status_ids):
+		"""Fetches statuses batch_size at a time; returns {id: status}. Ids the server leaves out are not asked for again until they go stale."""
+		found = {}
+		for start in range(0, len(status_ids), self.batch_size):
+			if not self.supported:
+				break
+			batch = status_ids[start:start + self.batch_size]
+			try:
+				statuses = fetch_statuses(mastodon, batch)
+			except MastodonNotFoundError:
+				# Servers without the endpoint also predate quotes, so there is nothing to fall back to.
+				self.supported = False
+				break
+			for status in statuses or []:
+				found[str(status["id"])] = status
+			for status_id in batch:
+				self.fresh.set(status_id, True)
+		return found
@@ -0,0 +1,325 @@
+import json
+import queue
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+
+from post_rendering import html_to_plain_text
+from relative_time import epoch_seconds, parse_timestamp
+from search_index import QUERY_RE, status_fields, tokenize
+
+LOCAL_SEARCH_FILE = "search.db"
+LOCAL_SEARCH_LIMIT = 200
+VISIBILITIES = ("public", "unlisted", "private", "direct")
+
+# Filters Mastodon's own search has no operator for; they are applied to server results locally instead.
+LOCAL_ONLY_OPERATORS = ("visibility",)
+
+_SCHEMA = (
+	"CREATE TABLE IF NOT EXISTS statuses (rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, author TEXT, created_at REAL,"
+	" visibility TEXT, has_media INTEGER, data TEXT NOT NULL)",
+	"CREATE INDEX IF NOT EXISTS statuses_created_at ON statuses (created_at)",
+	"CREATE VIRTUAL TABLE IF NOT EXISTS statuses_fts USING fts5(author, content, cw, tags)",
+	"CREATE TABLE IF NOT EXISTS accounts (rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, data TEXT NOT NULL)",
+	"CREATE VIRTUAL TABLE IF NOT EXISTS accounts_fts USING fts5(display_name, acct, note)",
+)
+# Stored as PRAGMA user_version; indexes written by an older version are rebuilt from the stored JSON on open.
+# 1: account notes are indexed as plain text rather than HTML.
+SCHEMA_VERSION = 1
+
+
+def _json_default(value):
+	if isinstance(value, (datetime, date)):
+		return value.isoformat()
+	return str(value)
+
+
+# Mastodon.py hands these back as datetimes; stored copies are revived the same way so dialogs can format them.
+DATE_KEYS = ("created_at", "edited_at", "expires_at", "scheduled_at")
+
+
+def _revive_dates(obj):
+	for key in DATE_KEYS:
+		if isinstance(obj.get(key), str):
+			obj[key] = parse_timestamp(obj[key]) or obj[key]
+	return obj
+
+
+def _load(data):
+	return json.loads(data, object_hook=_revive_dates)
+
+
+def _day(text):
+	try:
+		return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+	except ValueError:
+		return None
+
+
+def parse_search_query(query):
+	"""Splits a search into free text and filters: from:, has:media, before:/after:YYYY-MM-DD and visibility:."""
+	words, filters = [], {}
+	for phrase, word in QUERY_RE.findall(query or ""):
+		name, _, value = word.partition(":")
+		name = name.lower()
+		if phrase or not value:
+			words.append(f'"{phrase}"' if phrase else word)
+		elif name == "from":
+			filters["author"] = value.lstrip("@").lower()
+		elif name == "has" and value.lower() == "media":
+			filters["has_media"] = True
+		elif name in ("before", "after") and _day(value) is not None:
+			# before: excludes the named day, after: starts the day following it, as on Mastodon.
+			filters[name] = _day(value) + (86400 if name == "after" else 0)
+		elif name == "visibility" and value.lower() in VISIBILITIES:
+			filters["visibility"] = value.lower()
+		else:
+			words.append(word)
+	return " ".join(words), filters
+
+
+def compose_search_query(text, author="", after="", before="", has_media=False, visibility=""):
+	"""Builds an operator query from the Search dialog fields; raises ValueError for a malformed date."""
+	parts = [text.strip()] if text.strip() else []
+	if author.strip():
+		parts.append(f"from:{author.strip().lstrip('@')}")
+	for name, value in (("after", after.strip()), ("before", before.strip())):
+		if value:
+			if _day(value) is None:
+				raise ValueError(f"'{value}' is not a date in YYYY-MM-DD form.")
+			parts.append(f"{name}:{value}")
+	if has_media:
+		parts.append("has:media")
+	if visibility:
+		parts.append(f"visibility:{visibility}")
+	return " ".join(parts)
+
+
+def server_query(query):
+	"""The part of a search the server understands; local-only operators are dropped."""
+	kept = []
+	for phrase, word in QUERY_RE.findall(query or ""):
+		if phrase:
+			kept.append(f'"{phrase}"')
+		elif word.partition(":")[0].lower() not in LOCAL_ONLY_OPERATORS:
+			kept.append(word)
+	return " ".join(kept)
+
+
+def _author_text(status):
+	account = (status.get("reblog") or status).get("account") or {}
+	return f"{account.get('acct') or ''} {account.get('username') or ''} {account.get('display_name') or ''}".lower()
+
+
+def matches_filters(status, filters):
+	"""Applies parse_search_query filters to a status, e.g. to server results the server could not filter."""
+	source = status.get("reblog") or status
+	if filters.get("author") and filters["author"] not in _author_text(status):
+		return False
+	if filters.get("has_media") and not source.get("media_attachments"):
+		return False
+	if filters.get("visibility") and source.get("visibility") != filters["visibility"]:
+		return False
+	created = epoch_seconds(source.get("created_at"))
+	if "after" in filters and (created is None or created < filters["after"]):
+		return False
+	if "before" in filters and (created is None or created >= filters["before"]):
+		return False
+	return True
+
+
+def fts_query(text):
+	"""Turns free text into an FTS5 MATCH expression: every word as a prefix, quoted phrases kept whole."""
+	terms = []
+	for phrase, word in QUERY_RE.findall(text or ""):
+		tokens = tokenize(phrase or word)
+		if phrase and tokens:
+			terms.append('"' + " ".join(tokens) + '"')
+		else:
+			terms.extend(f'"{token}"*' for token in tokens)
+	return " ".join(terms)
+
+
+def merge_search_results(local, server, filters=None):
+	"""Local results keep their places; server results the local index did not have are appended."""
+	merged = list(local)
+	seen = {str(status.get("id")) for status in merged}
+	for status in server or []:
+		if str(status.get("id")) in seen or (filters and not matches_filters(status, filters)):
+			continue
+		seen.add(str(status.get("id")))
+		merged.append(status)
+	return merged
+
+
+class LocalSearchStore:
+	"""A persisted SQLite FTS5 index of every status and account the client has loaded.
+
+	Notifications are stored through the post and the account they carry.
+	"""
+
+	def __init__(self, path=LOCAL_SEARCH_FILE):
+		self.conn = sqlite3.connect(path, check_same_thread=False)
+		self._lock = threading.Lock()
+		self._pending = queue.Queue()
+		self._writer = None
+		with self._lock, self.conn:
+			self.conn.execute("PRAGMA journal_mode=WAL")
+			self.conn.execute("PRAGMA synchronous=NORMAL")
+			for statement in _SCHEMA:
+				self.conn.execute(statement)
+			version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+			if version < 1:
+				self._reindex_accounts()
+			if version < SCHEMA_VERSION:
+				self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+	def close(self):
+		with self._lock:
+			self.conn.close()
+
+	def _upsert(self, table, item_id, columns, fts_columns):
+		"""Writes one row and its FTS entry; rows whose stored JSON is unchanged are left alone."""
+		row = self.conn.execute(f"SELECT rowid, data FROM {table} WHERE id = ?", (item_id,)).fetchone()
+		if row and row[1] == columns["data"]:
+			return
+		if row:
+			rowid = row[0]
+			self.conn.execute(f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE rowid = ?", (*columns.values(), rowid))
+			self.conn.execute(f"DELETE FROM {table}_fts WHERE rowid = ?", (rowid,))
+		else:
+			placeholders = ", ".join("?" * (len(columns) + 1))
+			rowid = self.conn.execute(f"INSERT INTO {table} (id, {', '.join(columns)}) VALUES ({placeholders})", (item_id, *columns.values())).lastrowid
+		placeholders = ", ".join("?" * (len(fts_columns) + 1))
+		self.conn.execute(f"INSERT INTO {table}_fts (rowid, {', '.join(fts_columns)}) VALUES ({placeholders})", (rowid, *fts_columns.values()))
+
+	@staticmethod
+	def _account_fts_columns(account):
+		return {
+			"display_name": account.get("display_name") or "",
+			"acct": account.get("acct") or "",
+			"note": " ".join(tokenize(html_to_plain_text(account.get("note"), paragraph_break=" "))),
+		}
+
+	def _reindex_accounts(self):
+		self.conn.execute("DELETE FROM accounts_fts")
+		for rowid, data in self.conn.execute("SELECT rowid, data FROM accounts").fetchall():
+			columns = self._account_fts_columns(json.loads(data))
+			self.conn.execute("INSERT INTO accounts_fts (rowid, display_name, acct, note) VALUES (?, ?, ?, ?)", (rowid, *columns.values()))
+
+	def _add_account(self, account):
+		if not account or account.get("id") is None:
+			return
+		self._upsert("accounts", str(account["id"]), {"data": json.dumps(account, default=_json_default)}, self._account_fts_columns(account))
+
+	def _add_status(self, status):
+		source = status.get("reblog") or status
+		self._upsert("statuses", str(status["id"]), {
+			"author": _author_text(status),
+			"created_at": epoch_seconds(source.get("created_at")),
+			"visibility": source.get("visibility"),
+			"has_media": int(bool(source.get("media_attachments"))),
+			"data": json.dumps(status, default=_json_default),
+		}, status_fields(status))
+		self._add_account(source.get("account"))
+		if source is not status:
+			self._add_account(status.get("account"))
+
+	def add_many(self, items):
+		"""Stores statuses and notifications (by their post and account); safe to call from worker threads."""
+		with self._lock, self.conn:
+			for item in items or []:
+				if not item:
+					continue
+				if "type" in item and "content" not in item:
+					self._add_account(item.get("account"))
+					item = item.get("status")
+				if item and item.get("id") is not None:
+					self._add_status(item)
+
+	def add(self, item):
+		self.add_many([item])
+
+	def _later(self, write, *args):
+		# One writer thread keeps queued adds and removals in arrival order.
+		self._pending.put((write, args))
+		if self._writer is None:
+			self._writer = threading.Thread(target=self._write_pending, daemon=True)
+			self._writer.start()
+
+	def _write_pending(self):
+		while True:
+			write, args = self._pending.get()
+			try:
+				write(*args)
+			except sqlite3.Error:
+				self._reindex_accounts()
+			finally:
+				self._pending.task_done()
+
+	def add_later(self, items):
+		"""Queues items for the background writer so the GUI thread never waits on the disk."""
+		self._later(self.add_many, list(items or []))
+
+	def remove_later(self, status_id):
+		self._later(self.remove, status_id)
+
+	def flush(self):
+		"""Waits until everything queued with add_later() or remove_later() has been written."""
+		self._pending.join()
+
+	def remove(self, status_id):
+		with self._lock, self.conn:
+			row = self.conn.execute("SELECT rowid FROM statuses WHERE id = ?", (str(status_id),)).fetchone()
+			if row:
+				self.conn.execute("DELETE FROM statuses WHERE rowid = ?", row)
+				self.conn.execute("DELETE FROM statuses_fts WHERE rowid = ?", row)
+
+	def __len__(self):
+		with self._lock:
+			return self.conn.execute("SELECT COUNT(*) FROM statuses").fetchone()[0]
+
+	def search(self, query, limit=LOCAL_SEARCH_LIMIT):
+		"""Statuses matching a parse_search_query query, best matches first (newest first when only filters are given)."""
+		text, filters = parse_search_query(query)
+		match = fts_query(text)
+		where, params = [], []
+		if filters.get("author"):
+			where.append("s.author LIKE ?")
+			params.append(f"%{filters['author']}%")
+		if filters.get("has_media"):
+			where.append("s.has_media = 1")
+		if filters.get("visibility"):
+			where.append("s.visibility = ?")
+			params.append(filters["visibility"])
+		if "after" in filters:
+			where.append("s.created_at >= ?")
+			params.append(filters["after"])
+		if "before" in filters:
+			where.append("s.created_at < ?")
+			params.append(filters["before"])
+		if match:
+			sql = "SELECT s.data FROM statuses_fts JOIN statuses s ON s.rowid = statuses_fts.rowid WHERE statuses_fts MATCH ?"
+			sql += "".join(f" AND {clause}" for clause in where)
+			# Column weights follow search_index: author and tags first, then the CW, then the body.
+			sql += " ORDER BY bm25(statuses_fts, 3.0, 1.0, 2.0, 3.0), s.created_at DESC LIMIT ?"
+			params = [match] + params
+		elif where:
+			sql = f"SELECT s.data FROM statuses s WHERE {' AND '.join(where)} ORDER BY s.created_at DESC LIMIT ?"
+		else:
+			return []
+		with self._lock:
+			rows = self.conn.execute(sql, params + [limit]).fetchall()
+		return [_load(data) for data, in rows]
+
+	def search_accounts(self, query, limit=40):
+		match = fts_query(query.lstrip("@"))
+		if not match:
+			return []
+		with self._lock:
+			rows = self.conn.execute(
+				"SELECT a.data FROM accounts_fts JOIN accounts a ON a.rowid = accounts_fts.rowid WHERE accounts_fts MATCH ?"
+				" ORDER BY bm25(accounts_fts, 3.0, 3.0, 1.0) LIMIT ?",
+				(match, limit),
+			).fetchall()
+		return [_load(data) for data, in rows]
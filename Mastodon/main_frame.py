@@ -1,29 +1,56 @@
 import wx
 import os
 import threading
+import json
 import webbrowser
 from datetime import datetime
-from mastodon import StreamListener
-from utils import strip_html, get_time_ago
+from mastodon import MastodonNotFoundError, StreamListener
+from utils import strip_html
 from post_dialog import PostDetailsDialog
 from profile_dialog import ViewProfileDialog
 from settings_dialog import SettingsDialog
+from post_rendering import account_label, derived_text, html_to_plain_text, status_quote, status_snippet, status_text
+from cache import CONTEXT_TTL, AccountCache, CollectionCache, RelationshipCache, TTLCache, author_ids
+from pagination import ACCOUNT_PAGE_SIZE, AccountPager, near_end
+from timelines import TIMELINE_PAGE_SIZE, build_timeline, mention_statuses, merge_older
+from prefetch import Prefetcher
+from threads import ReplyIndex, chunk_bounds, splice_positions
+from tasks import BackgroundTask, TaskGroup, run_concurrently
+from relative_time import TIME_REFRESH_INTERVAL, relative_label
+from row_templates import DEFAULT_ROW_TEMPLATE, RowTemplate, RowTemplateError
+from search_index import SearchIndex
+from autocomplete import COMPLETION_LIMIT, CompletionIndex
+from compose_completion import ComposeCompleter
+from hydration import HYDRATE_INTERVAL, HYDRATE_MAX_BATCHES, HYDRATE_SCROLL_DELAY, StatusHydrator, hydrated_item
+from trends import TrendsCache
+from grouped_notifications import group_actor_label, is_expandable, merge_notification, merge_older_groups
+from unread import UNREAD_MAX_INTERVAL, UNREAD_MIN_INTERVAL, UnreadCounter, unread_label
+from markers import MARKER_CLOSE_TIMEOUT, MARKER_LOCAL_SAVE_DELAY, MARKER_SAVE_DELAY, MARKER_TIMELINES, ReadPositions, unread_count
+from polling import POLL_TICK, RefreshScheduler, rate_limit_state
+from conversations import ConversationStore
+from content_filters import LOCAL_FILTER_KINDS, FilterEngine, describe_rule, timeline_context, valid_pattern
+from local_search import LocalSearchStore, compose_search_query, merge_search_results, parse_search_query
 from mastodon_api import (
 	add_collection_account,
 	create_collection,
 	delete_collection,
+	dismiss_notification_group,
 	fetch_account_collections,
 	fetch_account_in_collections,
-	fetch_account_statuses,
 	fetch_annual_report,
 	fetch_annual_report_state,
-	fetch_collection,
 	fetch_current_profile,
-	fetch_notification_policy,
+	fetch_markers,
+	fetch_favourited_by,
+	fetch_notification_group_accounts,
 	fetch_notifications,
+	fetch_notification_policy,
+	fetch_reblogged_by,
+	fetch_unread_count,
 	generate_annual_report,
 	remove_collection_item,
 	revoke_collection_item,
+	save_markers,
 	search_v2,
 	update_collection,
 	update_current_profile,
@@ -32,7 +59,6 @@ from mastodon_api import (
 from sound_lib import stream
 from sound_lib.main import BassError
 from easysettings import EasySettings
-import re
 import queue
 import io
 import urllib.request
@@ -143,15 +169,15 @@ class UserSelectionDialog(wx.Dialog):
     def get_selected_account(self):
         return self.selected_account
 
-_SINGULAR_RE = re.compile(r"\b1 (\w+)s( ago)?\b")
-
-def singularize_time(text):
-	if not text: return text
-	return _SINGULAR_RE.sub(r"1 \1\2", text)
+LOADING_TEXT = "Loading..."
+# Timelines the user stream keeps current, and so the ones polled while it is down.
+POLLED_TIMELINES = ("home", "notifications", "direct_messages")
+# Tree nodes that show an unread count after their name.
+UNREAD_NODE_LABELS = {"home": "Home", "direct_messages": "Direct Messages", "notifications": "Notifications", "mentions": "Mentions"}
 
 def formatted_time(created_at):
 	if not created_at: return ''
-	return singularize_time(get_time_ago(created_at))
+	return relative_label(created_at)
 
 class SysListViewAdapter(wx.ListCtrl):
 	def __init__(self, parent, *args, **kwargs):
@@ -212,6 +238,12 @@ class SysListViewAdapter(wx.ListCtrl):
 		if avatar_url:
 			self.item_avatar_map[index] = avatar_url
 
+	def set_headers(self, headers):
+		for c, text in enumerate(headers):
+			column = self.GetColumn(c)
+			column.SetText(text)
+			self.SetColumn(c, column)
+
 	def GetSelection(self):
 		sel = self.GetFirstSelected()
 		return sel if sel != -1 else wx.NOT_FOUND
@@ -267,6 +299,9 @@ class CustomStreamListener(StreamListener):
     def on_delete(self, status_id): wx.CallAfter(self.frame.handle_post_deletion, status_id)
     def on_notification(self, notification): wx.CallAfter(self.frame.add_notification, notification)
     def on_status_update(self, status): wx.CallAfter(self.frame.handle_status_update, status)
+    def on_conversation(self, conversation): wx.CallAfter(self.frame.update_conversation, conversation)
+    def on_filters_changed(self): self.frame.refresh_server_filters()
+    def handle_heartbeat(self): wx.CallAfter(self.frame.on_stream_alive)
 
 class ThriveFrame(wx.Frame):
     def __init__(self, *args, **kwargs):
@@ -281,6 +316,35 @@ class ThriveFrame(wx.Frame):
         self.poll_duration_labels = ["5 minutes", "30 minutes", "1 hour", "6 hours", "12 hours", "1 day", "3 days", "7 days"]
         self.poll_duration_seconds = [300, 1800, 3600, 21600, 43200, 86400, 259200, 604800]
         self.show_avatars = False
+        self.relationships = RelationshipCache()
+        self.account_cache = AccountCache()
+        self.collection_cache = CollectionCache()
+        self.trends = TrendsCache()
+        self.context_cache = TTLCache(CONTEXT_TTL)
+        self.prefetcher = Prefetcher()
+        self.reply_index = ReplyIndex()
+        self.search_index = SearchIndex()
+        self.completions = CompletionIndex()
+        self.hydrator = StatusHydrator()
+        self.hydrating = False
+        self.hydrate_call = None
+        self.read_positions = ReadPositions(self.load_read_positions())
+        self.marker_save_call = None
+        self.marker_local_save_call = None
+        try:
+            self.local_search = LocalSearchStore()
+        except Exception:
+            # No writable directory or an SQLite build without FTS5: search falls back to the server alone.
+            self.local_search = None
+        self.thread_render_generation = 0
+        self.thread_rendering = None
+        self.timelines = {}
+        self.conversations = ConversationStore()
+        self.mentions_backfilled = False
+        self.grouped_notifications = bool(EasySettings("thrive.ini").get("grouped_notifications", True))
+        self.load_row_templates()
+        self.filters = FilterEngine(self.load_local_filter_rules(), own_account_id=(self.me or {}).get("id"))
+        self.refresh_server_filters()
         
         self.image_cache = {}
         self.image_download_queue = queue.Queue()
@@ -300,7 +364,9 @@ class ThriveFrame(wx.Frame):
         settings_menu = wx.Menu()
         settings_item = settings_menu.Append(wx.ID_ANY, "&Settings...\tAlt-S", "Open Settings")
         notification_policy_item = settings_menu.Append(wx.ID_ANY, "Notification &Filters...", "Choose which notifications are accepted, filtered, or dropped")
+        local_filters_item = settings_menu.Append(wx.ID_ANY, "&Local Filters...", "Hide posts by keyword, pattern, account or boost on this computer")
         self.Bind(wx.EVT_MENU, self.open_settings, settings_item)
+        self.Bind(wx.EVT_MENU, self.on_local_filters, local_filters_item)
         self.Bind(wx.EVT_MENU, self.on_notification_policy, notification_policy_item)
         menubar.Append(settings_menu, "&Client")
         view_menu = wx.Menu()
@@ -415,6 +481,7 @@ class ThriveFrame(wx.Frame):
         vbox = wx.BoxSizer(wx.VERTICAL)
         self.toot_label = wx.StaticText(self.panel, label="&Create New Post")
         self.toot_input = wx.TextCtrl(self.panel, style=wx.TE_MULTILINE, size=(-1, 80))
+        self.attach_completion(self.toot_input)
         self.cw_label = wx.StaticText(self.panel, label="Content w&arning:")
         self.cw_input = wx.TextCtrl(self.panel, size=(400, -1))
         self.cw_input.Hide()
@@ -536,22 +603,31 @@ class ThriveFrame(wx.Frame):
         self.timeline_tree = wx.TreeCtrl(self.panel, style=wx.TR_HAS_BUTTONS | wx.TR_HIDE_ROOT)
         self.root = self.timeline_tree.AddRoot("Timelines")
         self.timeline_nodes = {
-            "home": self.timeline_tree.AppendItem(self.root, "Home"),
+            "home": self.timeline_tree.AppendItem(self.root, UNREAD_NODE_LABELS["home"]),
             "local": self.timeline_tree.AppendItem(self.root, "Local"),
             "federated": self.timeline_tree.AppendItem(self.root, "Federated"),
             "sent": self.timeline_tree.AppendItem(self.root, "Sent"),
-            "direct_messages": self.timeline_tree.AppendItem(self.root, "Direct Messages"),
+            "direct_messages": self.timeline_tree.AppendItem(self.root, UNREAD_NODE_LABELS["direct_messages"]),
             "favourites": self.timeline_tree.AppendItem(self.root, "Favourites"),
             "bookmarks": self.timeline_tree.AppendItem(self.root, "Bookmarks"),
-            "notifications": self.timeline_tree.AppendItem(self.root, "Notifications"),
-            "mentions": self.timeline_tree.AppendItem(self.root, "Mentions"),
+            "notifications": self.timeline_tree.AppendItem(self.root, UNREAD_NODE_LABELS["notifications"]),
+            "mentions": self.timeline_tree.AppendItem(self.root, UNREAD_NODE_LABELS["mentions"]),
         }
+        for key, node in self.timeline_nodes.items():
+            self.timeline_tree.SetItemData(node, key)
         self.timeline_tree.Bind(wx.EVT_TREE_SEL_CHANGED, self.on_timeline_selected)
         
         self.posts_list = SysListViewAdapter(self.panel)
         self.posts_list.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_post_selected)
         self.posts_list.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_post_activated)
         self.posts_list.Bind(wx.EVT_CONTEXT_MENU, self.on_post_context_menu)
+        self.posts_list.set_headers(self.status_row.headers)
+        self.time_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.refresh_visible_times, self.time_timer)
+        self.time_timer.Start(TIME_REFRESH_INTERVAL)
+        self.hydrate_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.hydrate_visible, self.hydrate_timer)
+        self.hydrate_timer.Start(HYDRATE_INTERVAL)
 
         if is_windows_dark_mode():
             dark_color = wx.Colour(40, 40, 40)
@@ -572,13 +648,22 @@ class ThriveFrame(wx.Frame):
         vbox.Add(hbox, 1, wx.EXPAND, 0)
         self.panel.SetSizer(vbox)
         self.Bind(wx.EVT_CHAR_HOOK, self.on_key_press)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
         self.setup_accelerators()
         
         self.timeline_tree.SelectItem(self.timeline_nodes["home"])
         for key in self.timelines_data.keys():
+            # Mentions are filled in from the notifications as they load.
+            if key in MARKER_TIMELINES or key == "mentions": continue
             threading.Thread(target=lambda k=key: self.load_timeline(k), daemon=True).start()
+        threading.Thread(target=self.load_marked_timelines, daemon=True).start()
 
+        self.refresh = RefreshScheduler(POLLED_TIMELINES)
+        self.poll_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.poll_due_timelines, self.poll_timer)
         self.start_streaming()
+        self.unread = {key: UnreadCounter() for key in ("notifications", "mentions")}
+        self.unread_call = wx.CallLater(UNREAD_MIN_INTERVAL * 1000, self.poll_unread)
 
     def image_downloader_worker(self):
         while True:
@@ -618,10 +703,24 @@ class ThriveFrame(wx.Frame):
         self.show_avatars = self.show_avatars_item.IsChecked()
         self.on_refresh(event)
 
+    def register_timeline_node(self, key, node):
+        self.timeline_nodes[key] = node
+        self.timeline_tree.SetItemData(node, key)
+
+    def current_timeline_key(self, node=None):
+        node = node if node is not None else self.timeline_tree.GetSelection()
+        if not node.IsOk(): return None
+        return self.timeline_tree.GetItemData(node)
+
+    def timeline_for(self, key):
+        if key not in self.timelines:
+            self.timelines[key] = build_timeline(self.mastodon, self.me, key, grouped_notifications=self.grouped_notifications, conversations=self.conversations)
+        return self.timelines[key]
+
     def get_selected_status(self):
         selection = self.posts_list.GetSelection()
         if selection == wx.NOT_FOUND: return None, None
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         if not key: return None, None
         try:
             item = self.timelines_data[key][selection]
@@ -676,7 +775,7 @@ class ThriveFrame(wx.Frame):
         dm_item = menu.Append(wx.ID_ANY, "Send &Direct Message\tCtrl+D")
         
         # Notification-specific items
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         if key in ("notifications", "mentions"):
             menu.AppendSeparator()
             dismiss_notif_item = menu.Append(wx.ID_ANY, "D&ismiss Notification")
@@ -687,6 +786,9 @@ class ThriveFrame(wx.Frame):
             sel = self.posts_list.GetSelection()
             if sel != wx.NOT_FOUND and sel < len(self.timelines_data.get(key, [])):
                 notif = self.timelines_data[key][sel]
+                if key == "notifications" and is_expandable(notif):
+                    expand_item = menu.Append(wx.ID_ANY, "Show &Everyone in This Group...")
+                    self.Bind(wx.EVT_MENU, self.on_expand_notification_group, expand_item)
                 if notif.get('type') == 'follow_request':
                     accept_item = menu.Append(wx.ID_ANY, "&Accept Follow Request")
                     reject_item = menu.Append(wx.ID_ANY, "Re&ject Follow Request")
@@ -745,6 +847,7 @@ class ThriveFrame(wx.Frame):
         panel = wx.Panel(dialog)
         vbox = wx.BoxSizer(wx.VERTICAL)
         reply_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE, size=(480, 100))
+        self.attach_completion(reply_text)
         reply_text.SetValue(reply_users.strip() + " ")
         reply_text.SetInsertionPointEnd()
         privacy_label = wx.StaticText(panel, label="P&rivacy:")
@@ -799,6 +902,7 @@ class ThriveFrame(wx.Frame):
         panel = wx.Panel(dialog)
         vbox = wx.BoxSizer(wx.VERTICAL)
         quote_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE, size=(480, 100))
+        self.attach_completion(quote_text)
         quote_text.SetFocus()
         privacy_label = wx.StaticText(panel, label="P&rivacy:")
         quote_privacy_choice = wx.Choice(panel, choices=self.privacy_options)
@@ -896,7 +1000,7 @@ class ThriveFrame(wx.Frame):
         status, _ = self.get_selected_status()
         if not status: return
         source = status.get('reblog') or status
-        content = strip_html((source.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', '\n\n')).strip()
+        content = status_text(source)
         if pyperclip:
             pyperclip.copy(content)
         else:
@@ -918,20 +1022,71 @@ class ThriveFrame(wx.Frame):
         status, _ = self.get_selected_status()
         if not status: return
         source = status.get('reblog') or status
-        try:
-            context = self.mastodon.status_context(source['id'])
-            ancestors = context.get('ancestors', [])
-            descendants = context.get('descendants', [])
-            thread = ancestors + [source] + descendants
-            timeline_key = f"thread:{source['id']}"
-            self.timelines_data[timeline_key] = thread
-            if timeline_key not in self.timeline_nodes:
-                author = source['account'].get('display_name') or source['account'].get('username', '')
-                node = self.timeline_tree.AppendItem(self.root, f"Thread by {author}")
-                self.timeline_nodes[timeline_key] = node
-                if open_timelinesnd: open_timelinesnd.play()
+        # Show what we already hold right away; status_context only fills in the gaps.
+        timeline_key = f"thread:{source['id']}"
+        self.timelines_data[timeline_key] = self.known_thread(source)
+        if timeline_key not in self.timeline_nodes:
+            author = source['account'].get('display_name') or source['account'].get('username', '')
+            node = self.timeline_tree.AppendItem(self.root, f"Thread by {author}")
+            self.register_timeline_node(timeline_key, node)
+            if open_timelinesnd: open_timelinesnd.play()
+        if self.current_timeline_key() == timeline_key:
+            self.render_thread_rows(timeline_key)
+        else:
             self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
-        except Exception as e: wx.MessageBox(f"Error loading thread: {e}", "Thread Error")
+        
+        def on_context(context):
+            self.splice_timeline(timeline_key, self.known_thread(source))
+        
+        def on_failed(ex):
+            wx.MessageBox(f"Error loading thread: {ex}", "Thread Error")
+        
+        BackgroundTask(lambda: self.fetch_context(source['id']), on_context, on_failed, wx.CallAfter).start()
+
+    def splice_timeline(self, key, items):
+        old_items = self.timelines_data.get(key, [])
+        self.timelines_data[key] = items
+        if self.current_timeline_key() != key: return
+        inserts = splice_positions([item.get('id') for item in old_items], [item.get('id') for item in items])
+        if inserts is None or self.thread_rendering == key:
+            self.render_thread_rows(key)
+            return
+        # Inserting around the reader keeps their place instead of rebuilding the list under them.
+        by_id = {str(item.get('id')): item for item in items}
+        for index, status_id in inserts:
+            row, avatar_url = self.row_from_status(by_id[status_id])
+            self.posts_list.Insert(row, index, avatar_url)
+            self.queue_avatar_download(avatar_url)
+
+    def render_thread_rows(self, key):
+        """Show a thread up to its focused post at once, then add the remaining replies a chunk per event-loop turn."""
+        self.thread_render_generation += 1
+        generation = self.thread_render_generation
+        items = self.timelines_data.get(key, [])
+        ids = [str(item.get('id')) for item in items]
+        focus_id = key.split(":", 1)[1]
+        focus = ids.index(focus_id) if focus_id in ids else 0
+        self.posts_list.Clear()
+        
+        def append_chunk(bounds):
+            if generation != self.thread_render_generation or self.current_timeline_key() != key: return
+            start, end = bounds[0]
+            for item in items[start:end]:
+                row, avatar_url = self.row_from_status(item)
+                if row:
+                    self.posts_list.Append(row, avatar_url)
+                    self.queue_avatar_download(avatar_url)
+            if start == 0 and focus < self.posts_list.GetItemCount():
+                self.posts_list.Select(focus)
+                self.posts_list.Focus(focus)
+            if len(bounds) > 1:
+                wx.CallAfter(append_chunk, bounds[1:])
+            else:
+                self.thread_rendering = None
+        
+        bounds = chunk_bounds(len(items), focus + 1)
+        self.thread_rendering = key if bounds else None
+        if bounds: append_chunk(bounds)
 
     def on_follow_user(self, event):
         status, _ = self.get_selected_status()
@@ -939,16 +1094,15 @@ class ThriveFrame(wx.Frame):
         source = status.get('reblog') or status
         account = source['account']
         try:
-            relationships = self.mastodon.account_relationships(account['id'])
-            rel = relationships[0] if relationships else {}
+            rel = self.relationships.lookup(self.mastodon, account['id']) or {}
             display = account.get('display_name') or account.get('username', '')
             if rel.get('following'):
                 if wx.MessageBox(f"Unfollow {display}?", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-                    self.mastodon.account_unfollow(account['id'])
+                    self.relationships.store(self.mastodon.account_unfollow(account['id']))
                     if unfollowsnd: unfollowsnd.play()
                     wx.MessageBox(f"Unfollowed {display}.", "Follow")
             else:
-                self.mastodon.account_follow(account['id'])
+                self.relationships.store(self.mastodon.account_follow(account['id']))
                 if followsnd: followsnd.play()
                 wx.MessageBox(f"Now following {display}.", "Follow")
         except Exception as e:
@@ -961,16 +1115,15 @@ class ThriveFrame(wx.Frame):
         source = status.get('reblog') or status
         account = source['account']
         try:
-            relationships = self.mastodon.account_relationships(account['id'])
-            rel = relationships[0] if relationships else {}
+            rel = self.relationships.lookup(self.mastodon, account['id']) or {}
             display = account.get('display_name') or account.get('username', '')
             if rel.get('blocking'):
                 if wx.MessageBox(f"Unblock {display}?", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-                    self.mastodon.account_unblock(account['id'])
+                    self.relationships.store(self.mastodon.account_unblock(account['id']))
                     wx.MessageBox(f"Unblocked {display}.", "Block")
             else:
                 if wx.MessageBox(f"Block {display}? You won't see their posts.", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-                    self.mastodon.account_block(account['id'])
+                    self.relationships.store(self.mastodon.account_block(account['id']))
                     wx.MessageBox(f"Blocked {display}.", "Block")
         except Exception as e:
             if errorsnd: errorsnd.play()
@@ -982,14 +1135,13 @@ class ThriveFrame(wx.Frame):
         source = status.get('reblog') or status
         account = source['account']
         try:
-            relationships = self.mastodon.account_relationships(account['id'])
-            rel = relationships[0] if relationships else {}
+            rel = self.relationships.lookup(self.mastodon, account['id']) or {}
             display = account.get('display_name') or account.get('username', '')
             if rel.get('muting'):
-                self.mastodon.account_unmute(account['id'])
+                self.relationships.store(self.mastodon.account_unmute(account['id']))
                 wx.MessageBox(f"Unmuted {display}.", "Mute")
             else:
-                self.mastodon.account_mute(account['id'])
+                self.relationships.store(self.mastodon.account_mute(account['id']))
                 wx.MessageBox(f"Muted {display}.", "Mute")
         except Exception as e: wx.MessageBox(f"Error: {e}", "Mute Error")
 
@@ -1000,11 +1152,12 @@ class ThriveFrame(wx.Frame):
         if source.get('account', {}).get('id') != (self.me or {}).get('id'):
             wx.MessageBox("You can only edit your own posts.", "Edit Error")
             return
-        content = strip_html((source.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', '\n\n')).strip()
+        content = status_text(source)
         dialog = wx.Dialog(self, title="Edit Post", size=(500, 300))
         panel = wx.Panel(dialog)
         vbox = wx.BoxSizer(wx.VERTICAL)
         edit_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE, size=(480, 150))
+        self.attach_completion(edit_text)
         edit_text.SetValue(content)
         edit_text.SetInsertionPointEnd()
         spoiler_label = wx.StaticText(panel, label="Content &Warning:")
@@ -1056,23 +1209,65 @@ class ThriveFrame(wx.Frame):
         except Exception as e: wx.MessageBox(f"Error: {e}", "Pin Error")
 
     def on_search(self, event):
-        dlg = wx.TextEntryDialog(self, "Enter search query:", "Search")
-        if dlg.ShowModal() == wx.ID_OK:
-            query = dlg.GetValue().strip()
-            if query:
-                if self._open_search_collection(query):
-                    dlg.Destroy()
-                    return
-                if searchsnd: searchsnd.play()
-                timeline_key = f"search:{query}"
-                self.timelines_data[timeline_key] = []
-                if timeline_key not in self.timeline_nodes:
-                    node = self.timeline_tree.AppendItem(self.root, f"Search: {query}")
-                    self.timeline_nodes[timeline_key] = node
-                    if open_timelinesnd: open_timelinesnd.play()
-                self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
-                threading.Thread(target=self.load_timeline, args=(timeline_key,), daemon=True).start()
+        dlg = wx.Dialog(self, title="Search")
+        grid = wx.FlexGridSizer(cols=2, vgap=5, hgap=5)
+        grid.AddGrowableCol(1)
+        fields = {}
+        for name, label in (("text", "&Search for:"), ("author", "&From (account):"), ("after", "Posted a&fter (YYYY-MM-DD):"), ("before", "Posted &before (YYYY-MM-DD):")):
+            grid.Add(wx.StaticText(dlg, label=label), 0, wx.ALIGN_CENTER_VERTICAL)
+            fields[name] = wx.TextCtrl(dlg, size=(280, -1))
+            grid.Add(fields[name], 1, wx.EXPAND)
+        grid.Add(wx.StaticText(dlg, label="&Visibility:"), 0, wx.ALIGN_CENTER_VERTICAL)
+        visibility_choice = wx.Choice(dlg, choices=["Any"] + self.privacy_options)
+        visibility_choice.SetSelection(0)
+        grid.Add(visibility_choice, 1, wx.EXPAND)
+        has_media = wx.CheckBox(dlg, label="Only posts with &media")
+        people = wx.CheckBox(dlg, label="Search for &people instead of posts")
+        dlg_sizer = wx.BoxSizer(wx.VERTICAL)
+        dlg_sizer.Add(grid, 1, wx.ALL | wx.EXPAND, 10)
+        dlg_sizer.Add(has_media, 0, wx.LEFT | wx.RIGHT, 10)
+        dlg_sizer.Add(people, 0, wx.ALL, 10)
+        dlg_sizer.Add(dlg.CreateButtonSizer(wx.OK | wx.CANCEL), 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+        dlg.SetSizerAndFit(dlg_sizer)
+        fields["text"].SetFocus()
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy()
+            return
+        values = {name: control.GetValue().strip() for name, control in fields.items()}
+        visibility = self.privacy_values[visibility_choice.GetSelection() - 1] if visibility_choice.GetSelection() > 0 else ""
+        search_people = people.GetValue()
+        try:
+            query = compose_search_query(values["text"], values["author"], values["after"], values["before"], has_media.GetValue(), visibility)
+        except ValueError as e:
+            wx.MessageBox(str(e), "Search", wx.OK | wx.ICON_ERROR)
+            query = ""
         dlg.Destroy()
+        if not query: return
+        if search_people:
+            self._show_account_list(f"People matching '{values['text']}'", lambda: self.search_accounts(values["text"]), "No matching people found.")
+            return
+        if self._open_search_collection(query):
+            return
+        if searchsnd: searchsnd.play()
+        timeline_key = f"search:{query}"
+        self.timelines_data[timeline_key] = []
+        if timeline_key not in self.timeline_nodes:
+            node = self.timeline_tree.AppendItem(self.root, f"Search: {query}")
+            self.register_timeline_node(timeline_key, node)
+            if open_timelinesnd: open_timelinesnd.play()
+        self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
+        threading.Thread(target=self.load_timeline, args=(timeline_key,), daemon=True).start()
+
+    def search_accounts(self, query):
+        """Accounts seen locally first, then any the server finds that were not among them."""
+        accounts = self.local_search.search_accounts(query) if self.local_search else []
+        try:
+            server = search_v2(self.mastodon, query, type="accounts").get("accounts") or []
+        except Exception:
+            if not accounts: raise
+            server = []
+        seen = {str(account.get("id")) for account in accounts}
+        return accounts + [account for account in server if str(account.get("id")) not in seen]
 
     def _open_search_collection(self, query):
         if not query.lower().startswith(("http://", "https://")):
@@ -1137,20 +1332,67 @@ class ThriveFrame(wx.Frame):
         self.timelines_data[timeline_key] = []
         if timeline_key not in self.timeline_nodes:
             node = self.timeline_tree.AppendItem(self.root, f"{display} (@{acct})")
-            self.timeline_nodes[timeline_key] = node
+            self.register_timeline_node(timeline_key, node)
         self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
         threading.Thread(target=self.load_timeline, args=(timeline_key,), daemon=True).start()
 
-    def _show_account_list(self, title, accounts):
+    def _bind_account_pager(self, dlg, listbox, pager, tasks, title, empty_text):
+        """Fill listbox from pager, fetching the next page whenever the selection nears the end."""
+        def refresh_title():
+            more = "+" if pager.has_more else ""
+            dlg.SetTitle(f"{title} ({len(pager.items)}{more})")
+        
+        def clear_tail():
+            while listbox.GetCount() > len(pager.items):
+                listbox.Delete(listbox.GetCount() - 1)
+        
+        def on_page(page):
+            pager.loading = False
+            first = not pager.started
+            added = pager.add_page(page)
+            self.completions.add_accounts(added)
+            if first:
+                listbox.Set([account_label(acc) for acc in pager.items] or [empty_text])
+                listbox.SetSelection(0)
+            else:
+                clear_tail()
+                for acc in added:
+                    listbox.Append(account_label(acc))
+            refresh_title()
+            if near_end(listbox.GetSelection(), len(pager.items)): load_more()
+        
+        def on_failed(ex):
+            pager.loading = False
+            if not pager.started:
+                listbox.Set([f"Error: {ex}"])
+            else:
+                clear_tail()
+                listbox.Append(f"Error: {ex}")
+        
+        def load_more():
+            if pager.loading or not pager.has_more: return
+            pager.loading = True
+            if pager.started:
+                clear_tail()
+                listbox.Append(LOADING_TEXT)
+            tasks.run(pager.fetch, on_page, on_failed)
+        
+        def on_select(e):
+            if near_end(listbox.GetSelection(), len(pager.items)): load_more()
+            e.Skip()
+        
+        listbox.Bind(wx.EVT_LISTBOX, on_select)
+        load_more()
+        return refresh_title
+
+    def _show_account_list(self, title, fetch_accounts, empty_text="No accounts to show."):
         dlg = wx.Dialog(self, title=title, size=(500, 400))
         panel = wx.Panel(dlg)
         sizer = wx.BoxSizer(wx.VERTICAL)
-        listbox = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 300))
-        for acc in accounts:
-            display = acc.get('display_name') or acc.get('username', '')
-            acct = acc.get('acct', '')
-            listbox.Append(f"{display} (@{acct})")
+        listbox = wx.ListBox(panel, choices=[LOADING_TEXT], style=wx.LB_SINGLE, size=(-1, 300))
         sizer.Add(listbox, 1, wx.EXPAND | wx.ALL, 10)
+        pager = AccountPager(self.mastodon, fetch_accounts)
+        accounts = pager.items
         
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
         view_btn = wx.Button(panel, label="&View Profile")
@@ -1161,13 +1403,13 @@ class ThriveFrame(wx.Frame):
         
         def on_view(e):
             sel = listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(accounts): return
             acc = accounts[sel]
             try:
-                full_acc = self.mastodon.account(acc['id'])
+                full_acc = self.fetch_account(acc['id'])
             except Exception:
                 full_acc = acc
-            profile_dlg = ViewProfileDialog(dlg, full_acc, self.mastodon, self.me)
+            profile_dlg = ViewProfileDialog(dlg, full_acc, self.mastodon, self.me, self.relationships)
             profile_dlg.ShowModal()
             profile_dlg.Destroy()
         
@@ -1185,48 +1427,34 @@ class ThriveFrame(wx.Frame):
                 w.SetBackgroundColour(dark_color)
                 w.SetForegroundColour(light_text_color)
         
+        tasks = TaskGroup(wx.CallAfter)
+        self._bind_account_pager(dlg, listbox, pager, tasks, title, empty_text)
         dlg.ShowModal()
+        tasks.cancel()
         dlg.Destroy()
 
     def on_view_followers(self, event):
-        try:
-            accounts = self.mastodon.account_followers(self.me['id'], limit=80)
-            self._show_account_list(f"Followers ({len(accounts)})", accounts)
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        self._show_account_list("Followers", lambda: self.mastodon.account_followers(self.me['id'], limit=ACCOUNT_PAGE_SIZE))
 
     def on_view_following(self, event):
-        try:
-            accounts = self.mastodon.account_following(self.me['id'], limit=80)
-            self._show_account_list(f"Following ({len(accounts)})", accounts)
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        self._show_account_list("Following", lambda: self.mastodon.account_following(self.me['id'], limit=ACCOUNT_PAGE_SIZE))
 
     def on_view_blocked(self, event):
-        try:
-            accounts = self.mastodon.blocks(limit=80)
-            self._show_account_list(f"Blocked Users ({len(accounts)})", accounts)
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        self._show_account_list("Blocked Users", lambda: self.mastodon.blocks(limit=ACCOUNT_PAGE_SIZE))
 
     def on_view_muted(self, event):
-        try:
-            accounts = self.mastodon.mutes(limit=80)
-            self._show_account_list(f"Muted Users ({len(accounts)})", accounts)
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        self._show_account_list("Muted Users", lambda: self.mastodon.mutes(limit=ACCOUNT_PAGE_SIZE))
 
     def on_view_follow_requests(self, event):
         try:
-            accounts = self.mastodon.follow_requests(limit=80)
-            if not accounts:
-                wx.MessageBox("No pending follow requests.", "Follow Requests")
-                return
-            dlg = wx.Dialog(self, title=f"Follow Requests ({len(accounts)})", size=(500, 400))
+            dlg = wx.Dialog(self, title="Follow Requests", size=(500, 400))
             panel = wx.Panel(dlg)
             sizer = wx.BoxSizer(wx.VERTICAL)
-            listbox = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 300))
-            for acc in accounts:
-                display = acc.get('display_name') or acc.get('username', '')
-                acct = acc.get('acct', '')
-                listbox.Append(f"{display} (@{acct})")
+            listbox = wx.ListBox(panel, choices=[LOADING_TEXT], style=wx.LB_SINGLE, size=(-1, 300))
             sizer.Add(listbox, 1, wx.EXPAND | wx.ALL, 10)
+            pager = AccountPager(self.mastodon, lambda: self.mastodon.follow_requests(limit=ACCOUNT_PAGE_SIZE))
+            accounts = pager.items
+            tasks = TaskGroup(wx.CallAfter)
             
             btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
             accept_btn = wx.Button(panel, label="&Accept")
@@ -1239,21 +1467,23 @@ class ThriveFrame(wx.Frame):
             
             def on_accept(e):
                 sel = listbox.GetSelection()
-                if sel == wx.NOT_FOUND: return
+                if sel == wx.NOT_FOUND or sel >= len(accounts): return
                 try:
                     self.mastodon.follow_request_authorize(accounts[sel]['id'])
                     listbox.Delete(sel)
-                    accounts.pop(sel)
+                    pager.remove(sel)
+                    refresh_title()
                     wx.MessageBox("Follow request accepted.", "Accepted")
                 except Exception as ex: wx.MessageBox(f"Error: {ex}", "Error")
             
             def on_reject(e):
                 sel = listbox.GetSelection()
-                if sel == wx.NOT_FOUND: return
+                if sel == wx.NOT_FOUND or sel >= len(accounts): return
                 try:
                     self.mastodon.follow_request_reject(accounts[sel]['id'])
                     listbox.Delete(sel)
-                    accounts.pop(sel)
+                    pager.remove(sel)
+                    refresh_title()
                     wx.MessageBox("Follow request rejected.", "Rejected")
                 except Exception as ex: wx.MessageBox(f"Error: {ex}", "Error")
             
@@ -1271,22 +1501,35 @@ class ThriveFrame(wx.Frame):
                     w.SetBackgroundColour(dark_color)
                     w.SetForegroundColour(light_text_color)
             
+            refresh_title = self._bind_account_pager(dlg, listbox, pager, tasks, "Follow Requests", "No pending follow requests.")
             dlg.ShowModal()
+            tasks.cancel()
             dlg.Destroy()
         except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
 
     def on_dismiss_notification(self, event):
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         if key not in ("notifications", "mentions"): return
         sel = self.posts_list.GetSelection()
         if sel == wx.NOT_FOUND: return
         try:
             notif = self.timelines_data[key][sel]
-            self.mastodon.notifications_dismiss(notif['id'])
+            if is_expandable(notif): dismiss_notification_group(self.mastodon, notif['group_key'])
+            else: self.mastodon.notifications_dismiss(notif['id'])
             self.timelines_data[key].pop(sel)
             self.posts_list.Delete(sel)
         except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
 
+    def on_expand_notification_group(self, event):
+        """Lists every account behind a grouped notification row, a page at a time."""
+        sel = self.posts_list.GetSelection()
+        items = self.timelines_data.get("notifications", [])
+        if self.current_timeline_key() != "notifications" or sel == wx.NOT_FOUND or sel >= len(items): return
+        group = items[sel]
+        if not is_expandable(group): return
+        title = self.format_notification_for_display(group).partition(":")[0]
+        self._show_account_list(title, lambda: fetch_notification_group_accounts(self.mastodon, group["group_key"], limit=ACCOUNT_PAGE_SIZE))
+
     def on_clear_all_notifications(self, event):
         if wx.MessageBox("Clear all notifications? This cannot be undone.", "Confirm", wx.YES_NO | wx.ICON_QUESTION) != wx.YES:
             return
@@ -1294,13 +1537,13 @@ class ThriveFrame(wx.Frame):
             self.mastodon.notifications_clear()
             self.timelines_data["notifications"] = []
             self.timelines_data["mentions"] = []
-            key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+            key = self.current_timeline_key()
             if key in ("notifications", "mentions"):
                 self.posts_list.Clear()
         except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
 
     def on_accept_follow_request(self, event):
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         sel = self.posts_list.GetSelection()
         if sel == wx.NOT_FOUND or not key: return
         try:
@@ -1311,7 +1554,7 @@ class ThriveFrame(wx.Frame):
         except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
 
     def on_reject_follow_request(self, event):
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         sel = self.posts_list.GetSelection()
         if sel == wx.NOT_FOUND or not key: return
         try:
@@ -1328,48 +1571,38 @@ class ThriveFrame(wx.Frame):
     def on_view_bookmarks_timeline(self, event):
         self.timeline_tree.SelectItem(self.timeline_nodes.get("bookmarks", self.timeline_tree.GetSelection()))
 
-    def on_instance_info(self, event):
-        try:
-            instance = self.mastodon.instance()
-            instance_v2 = {}
-            try:
-                instance_v2 = self.mastodon.instance_v2()
-            except Exception:
-                pass
-            title = instance.get('title', 'Unknown')
-            desc = strip_html(instance.get('description', '') or instance.get('short_description', '') or '')
-            version = instance.get('version', 'Unknown')
-            users = instance.get('stats', {}).get('user_count', '?')
-            statuses = instance.get('stats', {}).get('status_count', '?')
-            domains = instance.get('stats', {}).get('domain_count', '?')
-            uri = instance.get('uri', '')
-            contact = instance.get('contact_account', {})
-            admin = contact.get('display_name') or contact.get('username', 'Unknown') if contact else 'Unknown'
-            api_version = (instance_v2.get('api_versions') or {}).get('mastodon', 'Unknown') if instance_v2 else 'Unknown'
-            accounts_config = ((instance_v2.get('configuration') or {}).get('accounts') or {}) if instance_v2 else {}
-            thumbnail_desc = strip_html(((instance_v2.get('thumbnail') or {}).get('description') or '') if instance_v2 else '')
-            wrapstodon = instance_v2.get('wrapstodon') if instance_v2 else None
-            limits = []
-            if accounts_config.get('max_display_name_length') is not None:
-                limits.append(f"Display name length: {accounts_config.get('max_display_name_length')}")
-            if accounts_config.get('max_note_length') is not None:
-                limits.append(f"Bio length: {accounts_config.get('max_note_length')}")
-            if accounts_config.get('max_profile_fields') is not None:
-                limits.append(f"Profile fields: {accounts_config.get('max_profile_fields')}")
-            if accounts_config.get('profile_field_name_limit') is not None:
-                limits.append(f"Field label length: {accounts_config.get('profile_field_name_limit')}")
-            if accounts_config.get('profile_field_value_limit') is not None:
-                limits.append(f"Field value length: {accounts_config.get('profile_field_value_limit')}")
-            wrapstodon_text = "Not currently offered"
-            if wrapstodon:
-                wrapstodon_text = f"Offered for {wrapstodon}"
-                try:
-                    state = fetch_annual_report_state(self.mastodon, wrapstodon).get("state", "unknown")
-                    wrapstodon_text += f" ({state})"
-                except Exception:
-                    pass
-
-            info = f"""Instance: {title}
+    def _format_instance_info(self, instance, instance_v2, wrapstodon_state=None):
+        title = instance.get('title', 'Unknown')
+        desc = strip_html(instance.get('description', '') or instance.get('short_description', '') or '')
+        version = instance.get('version', 'Unknown')
+        users = instance.get('stats', {}).get('user_count', '?')
+        statuses = instance.get('stats', {}).get('status_count', '?')
+        domains = instance.get('stats', {}).get('domain_count', '?')
+        uri = instance.get('uri', '')
+        contact = instance.get('contact_account', {})
+        admin = contact.get('display_name') or contact.get('username', 'Unknown') if contact else 'Unknown'
+        api_version = (instance_v2.get('api_versions') or {}).get('mastodon', 'Unknown') if instance_v2 else 'Unknown'
+        accounts_config = ((instance_v2.get('configuration') or {}).get('accounts') or {}) if instance_v2 else {}
+        thumbnail_desc = strip_html(((instance_v2.get('thumbnail') or {}).get('description') or '') if instance_v2 else '')
+        wrapstodon = instance_v2.get('wrapstodon') if instance_v2 else None
+        limits = []
+        if accounts_config.get('max_display_name_length') is not None:
+            limits.append(f"Display name length: {accounts_config.get('max_display_name_length')}")
+        if accounts_config.get('max_note_length') is not None:
+            limits.append(f"Bio length: {accounts_config.get('max_note_length')}")
+        if accounts_config.get('max_profile_fields') is not None:
+            limits.append(f"Profile fields: {accounts_config.get('max_profile_fields')}")
+        if accounts_config.get('profile_field_name_limit') is not None:
+            limits.append(f"Field label length: {accounts_config.get('profile_field_name_limit')}")
+        if accounts_config.get('profile_field_value_limit') is not None:
+            limits.append(f"Field value length: {accounts_config.get('profile_field_value_limit')}")
+        wrapstodon_text = "Not currently offered"
+        if wrapstodon:
+            wrapstodon_text = f"Offered for {wrapstodon}"
+            if wrapstodon_state:
+                wrapstodon_text += f" ({wrapstodon_state})"
+
+        return title, f"""Instance: {title}
 URI: {uri}
 Version: {version}
 Mastodon API version: {api_version}
@@ -1386,157 +1619,227 @@ Account limits:
 
 Description:
 {desc}"""
-            dlg = wx.Dialog(self, title=f"Instance Info: {title}", size=(550, 400))
-            panel = wx.Panel(dlg)
-            sizer = wx.BoxSizer(wx.VERTICAL)
-            text = wx.TextCtrl(panel, value=info, style=wx.TE_MULTILINE | wx.TE_READONLY)
-            sizer.Add(text, 1, wx.EXPAND | wx.ALL, 10)
-            wrap_btn = None
-            if wrapstodon:
-                wrap_btn = wx.Button(panel, label="&Wrapstodon")
-                sizer.Add(wrap_btn, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
-            close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
-            sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
-            panel.SetSizer(sizer)
 
-            def on_wrapstodon(e):
+    def on_instance_info(self, event):
+        dlg = wx.Dialog(self, title="Instance Info", size=(550, 400))
+        panel = wx.Panel(dlg)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        text = wx.TextCtrl(panel, value=LOADING_TEXT, style=wx.TE_MULTILINE | wx.TE_READONLY)
+        sizer.Add(text, 1, wx.EXPAND | wx.ALL, 10)
+        wrap_btn = wx.Button(panel, label="&Wrapstodon")
+        wrap_btn.Hide()
+        sizer.Add(wrap_btn, 0, wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+        close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
+        sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+        panel.SetSizer(sizer)
+        loaded = {"instance": None, "instance_v2": {}, "wrapstodon_state": None}
+
+        def render():
+            if loaded["instance"] is None:
+                return
+            title, info = self._format_instance_info(loaded["instance"], loaded["instance_v2"], loaded["wrapstodon_state"])
+            dlg.SetTitle(f"Instance Info: {title}")
+            # Keep the reader's caret where it was when later parts arrive.
+            position = text.GetInsertionPoint()
+            text.SetValue(info)
+            text.SetInsertionPoint(min(position, text.GetLastPosition()))
+
+        def on_instance(instance):
+            loaded["instance"] = instance
+            render()
+
+        def on_instance_v2(result):
+            instance_v2, state = result
+            loaded["instance_v2"] = instance_v2 or {}
+            loaded["wrapstodon_state"] = state
+            if loaded["instance_v2"].get('wrapstodon'):
+                wrap_btn.Show()
+                panel.Layout()
+            render()
+
+        def fetch_instance_v2():
+            instance_v2 = self.mastodon.instance_v2()
+            wrapstodon = instance_v2.get('wrapstodon') if instance_v2 else None
+            state = None
+            if wrapstodon:
                 try:
                     state = fetch_annual_report_state(self.mastodon, wrapstodon).get("state", "unknown")
-                    if state == "eligible":
-                        if wx.MessageBox(f"Generate your {wrapstodon} Wrapstodon report?", "Wrapstodon", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-                            generate_annual_report(self.mastodon, wrapstodon)
-                            wx.MessageBox("Wrapstodon generation has started.", "Wrapstodon")
-                    elif state == "available":
-                        report = fetch_annual_report(self.mastodon, wrapstodon)
-                        reports = report.get("annual_reports", []) if isinstance(report, dict) else []
-                        share_url = reports[0].get("share_url", "") if reports else ""
-                        wx.MessageBox(f"Your {wrapstodon} Wrapstodon report is available.\n{share_url}", "Wrapstodon")
-                    elif state == "generating":
-                        wx.MessageBox("Your Wrapstodon report is still generating.", "Wrapstodon")
-                    else:
-                        wx.MessageBox("Your account is not eligible for Wrapstodon right now.", "Wrapstodon")
-                except Exception as ex:
-                    wx.MessageBox(f"Error loading Wrapstodon: {ex}", "Wrapstodon", wx.OK | wx.ICON_ERROR)
+                except Exception:
+                    pass
+            return instance_v2, state
 
-            if wrap_btn:
-                wrap_btn.Bind(wx.EVT_BUTTON, on_wrapstodon)
-            if is_windows_dark_mode():
-                dc = wx.Colour(40, 40, 40)
-                lt = wx.WHITE
-                WxMswDarkMode().enable(dlg)
-                dlg.SetBackgroundColour(dc); panel.SetBackgroundColour(dc)
-                text.SetBackgroundColour(dc); text.SetForegroundColour(lt)
-                if wrap_btn:
-                    wrap_btn.SetBackgroundColour(dc); wrap_btn.SetForegroundColour(lt)
-                close_btn.SetBackgroundColour(dc); close_btn.SetForegroundColour(lt)
-            dlg.ShowModal()
-            dlg.Destroy()
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        def on_failed(ex):
+            text.SetValue(f"Error: {ex}")
+
+        def on_wrapstodon(e):
+            wrapstodon = loaded["instance_v2"].get('wrapstodon')
+            try:
+                state = fetch_annual_report_state(self.mastodon, wrapstodon).get("state", "unknown")
+                if state == "eligible":
+                    if wx.MessageBox(f"Generate your {wrapstodon} Wrapstodon report?", "Wrapstodon", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
+                        generate_annual_report(self.mastodon, wrapstodon)
+                        wx.MessageBox("Wrapstodon generation has started.", "Wrapstodon")
+                elif state == "available":
+                    report = fetch_annual_report(self.mastodon, wrapstodon)
+                    reports = report.get("annual_reports", []) if isinstance(report, dict) else []
+                    share_url = reports[0].get("share_url", "") if reports else ""
+                    wx.MessageBox(f"Your {wrapstodon} Wrapstodon report is available.\n{share_url}", "Wrapstodon")
+                elif state == "generating":
+                    wx.MessageBox("Your Wrapstodon report is still generating.", "Wrapstodon")
+                else:
+                    wx.MessageBox("Your account is not eligible for Wrapstodon right now.", "Wrapstodon")
+            except Exception as ex:
+                wx.MessageBox(f"Error loading Wrapstodon: {ex}", "Wrapstodon", wx.OK | wx.ICON_ERROR)
+
+        wrap_btn.Bind(wx.EVT_BUTTON, on_wrapstodon)
+        if is_windows_dark_mode():
+            dc = wx.Colour(40, 40, 40)
+            lt = wx.WHITE
+            WxMswDarkMode().enable(dlg)
+            dlg.SetBackgroundColour(dc); panel.SetBackgroundColour(dc)
+            text.SetBackgroundColour(dc); text.SetForegroundColour(lt)
+            wrap_btn.SetBackgroundColour(dc); wrap_btn.SetForegroundColour(lt)
+            close_btn.SetBackgroundColour(dc); close_btn.SetForegroundColour(lt)
+
+        tasks = TaskGroup(wx.CallAfter)
+        tasks.run(self.mastodon.instance, on_instance, on_failed)
+        tasks.run(fetch_instance_v2, on_instance_v2)
+        dlg.ShowModal()
+        tasks.cancel()
+        dlg.Destroy()
 
     def on_edit_my_profile(self, event):
         if not self.mastodon or not self.me: return
-        profile_api_available = True
-        try:
-            profile = fetch_current_profile(self.mastodon)
-        except Exception:
-            profile_api_available = False
-            profile = self.me
-        accounts_config = {}
-        try:
-            accounts_config = (self.mastodon.instance_v2().get("configuration") or {}).get("accounts") or {}
-        except Exception:
-            pass
-        max_fields = accounts_config.get("max_profile_fields") or len((profile.get("fields") or self.me.get("fields") or [])) or 4
-        try:
-            max_fields = int(max_fields)
-        except (TypeError, ValueError):
-            max_fields = 4
+        state = {"profile": self.me, "profile_api_available": False}
 
-        dlg = wx.Dialog(self, title="Edit My Profile", size=(600, 720))
+        dlg = wx.Dialog(self, title="Edit My Profile (loading)", size=(600, 720))
         panel = wx.Panel(dlg)
         sizer = wx.BoxSizer(wx.VERTICAL)
         
         sizer.Add(wx.StaticText(panel, label="Display &Name:"), 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
         name_input = wx.TextCtrl(panel, size=(-1, 30))
-        name_input.SetValue(profile.get('display_name', self.me.get('display_name', '')))
         sizer.Add(name_input, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
         
         sizer.Add(wx.StaticText(panel, label="&Bio:"), 0, wx.LEFT | wx.RIGHT, 10)
         bio_input = wx.TextCtrl(panel, style=wx.TE_MULTILINE, size=(-1, 90))
-        source = profile.get('source', {})
-        bio_input.SetValue(profile.get('note', '') if profile_api_available else (source.get('note', '') or strip_html(self.me.get('note', ''))))
         sizer.Add(bio_input, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
         
         sizer.Add(wx.StaticText(panel, label="Profile &Fields:"), 0, wx.LEFT | wx.RIGHT, 10)
-        fields = profile.get('fields', []) or self.me.get('source', {}).get('fields', []) or self.me.get('fields', [])
+        fields_sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(fields_sizer, 0, wx.EXPAND)
         field_inputs = []
-        for i in range(max_fields):
-            fsizer = wx.BoxSizer(wx.HORIZONTAL)
-            name_lbl = wx.StaticText(panel, label=f"Label {i+1}:")
-            name_ctrl = wx.TextCtrl(panel, size=(150, -1))
-            val_lbl = wx.StaticText(panel, label="Value:")
-            val_ctrl = wx.TextCtrl(panel, size=(250, -1))
-            if i < len(fields):
-                name_ctrl.SetValue(fields[i].get('name', ''))
-                val_ctrl.SetValue(strip_html(fields[i].get('value', '')))
-            fsizer.Add(name_lbl, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 3)
-            fsizer.Add(name_ctrl, 0, wx.RIGHT, 8)
-            fsizer.Add(val_lbl, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 3)
-            fsizer.Add(val_ctrl, 1)
-            sizer.Add(fsizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
-            field_inputs.append((name_ctrl, val_ctrl))
 
         sizer.Add(wx.StaticText(panel, label="Avatar &Description:"), 0, wx.LEFT | wx.RIGHT, 10)
-        avatar_desc_input = wx.TextCtrl(panel, value=profile.get("avatar_description", ""), size=(-1, 30))
+        avatar_desc_input = wx.TextCtrl(panel, size=(-1, 30))
         sizer.Add(avatar_desc_input, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
 
         sizer.Add(wx.StaticText(panel, label="Header Des&cription:"), 0, wx.LEFT | wx.RIGHT, 10)
-        header_desc_input = wx.TextCtrl(panel, value=profile.get("header_description", ""), size=(-1, 30))
+        header_desc_input = wx.TextCtrl(panel, size=(-1, 30))
         sizer.Add(header_desc_input, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
 
         sizer.Add(wx.StaticText(panel, label="Attribution &Domains, comma separated:"), 0, wx.LEFT | wx.RIGHT, 10)
-        attribution_input = wx.TextCtrl(panel, value=", ".join(profile.get("attribution_domains", []) or []), size=(-1, 30))
+        attribution_input = wx.TextCtrl(panel, size=(-1, 30))
         sizer.Add(attribution_input, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
         
         locked_check = wx.CheckBox(panel, label="&Lock account (require follow approval)")
-        locked_check.SetValue(profile.get('locked', self.me.get('locked', False)))
         sizer.Add(locked_check, 0, wx.LEFT | wx.RIGHT, 10)
         
         bot_check = wx.CheckBox(panel, label="Mark as &bot account")
-        bot_check.SetValue(profile.get('bot', self.me.get('bot', False)))
         sizer.Add(bot_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
 
         discoverable_check = wx.CheckBox(panel, label="Show in profile directory and discovery")
-        discoverable_check.SetValue(bool(profile.get("discoverable", False)))
         sizer.Add(discoverable_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
 
         indexable_check = wx.CheckBox(panel, label="Allow public posts to be searchable")
-        indexable_check.SetValue(bool(profile.get("indexable", not profile.get("noindex", False))))
         sizer.Add(indexable_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
 
         hide_collections_check = wx.CheckBox(panel, label="Hide follows and followers")
-        hide_collections_check.SetValue(bool(profile.get("hide_collections", False)))
         sizer.Add(hide_collections_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
 
         show_media_check = wx.CheckBox(panel, label="Show Media tab")
-        show_media_check.SetValue(bool(profile.get("show_media", True)))
         sizer.Add(show_media_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
 
         show_media_replies_check = wx.CheckBox(panel, label="Include replies in Media tab")
-        show_media_replies_check.SetValue(bool(profile.get("show_media_replies", True)))
         sizer.Add(show_media_replies_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
 
         show_featured_check = wx.CheckBox(panel, label="Show Featured tab")
-        show_featured_check.SetValue(bool(profile.get("show_featured", True)))
         sizer.Add(show_featured_check, 0, wx.LEFT | wx.RIGHT | wx.TOP, 10)
         
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
         save_btn = wx.Button(panel, label="&Save")
+        save_btn.Disable()
         cancel_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Cancel")
         btn_sizer.Add(save_btn, 0, wx.ALL, 5)
         btn_sizer.Add(cancel_btn, 0, wx.ALL, 5)
         sizer.Add(btn_sizer, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
         panel.SetSizer(sizer)
+
+        def fetch():
+            profile_api_available = True
+            try:
+                profile = fetch_current_profile(self.mastodon)
+            except Exception:
+                profile_api_available = False
+                profile = self.me
+            accounts_config = {}
+            try:
+                accounts_config = (self.mastodon.instance_v2().get("configuration") or {}).get("accounts") or {}
+            except Exception:
+                pass
+            return profile, profile_api_available, accounts_config
+
+        def populate(result):
+            profile, profile_api_available, accounts_config = result
+            state["profile"] = profile
+            state["profile_api_available"] = profile_api_available
+            max_fields = accounts_config.get("max_profile_fields") or len((profile.get("fields") or self.me.get("fields") or [])) or 4
+            try:
+                max_fields = int(max_fields)
+            except (TypeError, ValueError):
+                max_fields = 4
+
+            name_input.SetValue(profile.get('display_name', self.me.get('display_name', '')))
+            source = profile.get('source', {})
+            bio_input.SetValue(profile.get('note', '') if profile_api_available else (source.get('note', '') or strip_html(self.me.get('note', ''))))
+            fields = profile.get('fields', []) or self.me.get('source', {}).get('fields', []) or self.me.get('fields', [])
+            for i in range(max_fields):
+                fsizer = wx.BoxSizer(wx.HORIZONTAL)
+                name_lbl = wx.StaticText(panel, label=f"Label {i+1}:")
+                name_ctrl = wx.TextCtrl(panel, size=(150, -1))
+                val_lbl = wx.StaticText(panel, label="Value:")
+                val_ctrl = wx.TextCtrl(panel, size=(250, -1))
+                if i < len(fields):
+                    name_ctrl.SetValue(fields[i].get('name', ''))
+                    val_ctrl.SetValue(strip_html(fields[i].get('value', '')))
+                fsizer.Add(name_lbl, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 3)
+                fsizer.Add(name_ctrl, 0, wx.RIGHT, 8)
+                fsizer.Add(val_lbl, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 3)
+                fsizer.Add(val_ctrl, 1)
+                fields_sizer.Add(fsizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+                field_inputs.append((name_ctrl, val_ctrl))
+                # Keep tab order matching the visual order even though the rows were created last.
+                name_ctrl.MoveAfterInTabOrder(bio_input if i == 0 else field_inputs[i - 1][1])
+                name_lbl.MoveBeforeInTabOrder(name_ctrl)
+                val_lbl.MoveAfterInTabOrder(name_ctrl)
+                val_ctrl.MoveAfterInTabOrder(val_lbl)
+                if dark_mode:
+                    for w in [name_lbl, name_ctrl, val_lbl, val_ctrl]:
+                        w.SetBackgroundColour(dc); w.SetForegroundColour(lt)
+
+            avatar_desc_input.SetValue(profile.get("avatar_description", ""))
+            header_desc_input.SetValue(profile.get("header_description", ""))
+            attribution_input.SetValue(", ".join(profile.get("attribution_domains", []) or []))
+            locked_check.SetValue(profile.get('locked', self.me.get('locked', False)))
+            bot_check.SetValue(profile.get('bot', self.me.get('bot', False)))
+            discoverable_check.SetValue(bool(profile.get("discoverable", False)))
+            indexable_check.SetValue(bool(profile.get("indexable", not profile.get("noindex", False))))
+            hide_collections_check.SetValue(bool(profile.get("hide_collections", False)))
+            show_media_check.SetValue(bool(profile.get("show_media", True)))
+            show_media_replies_check.SetValue(bool(profile.get("show_media_replies", True)))
+            show_featured_check.SetValue(bool(profile.get("show_featured", True)))
+            save_btn.Enable()
+            dlg.SetTitle("Edit My Profile")
+            panel.Layout()
         
         def on_save(e):
             try:
@@ -1547,7 +1850,7 @@ Description:
                     if n or v:
                         new_fields.append({"name": n, "value": v})
 
-                if profile_api_available:
+                if state["profile_api_available"]:
                     update_current_profile(
                         self.mastodon,
                         {
@@ -1583,62 +1886,88 @@ Description:
         
         save_btn.Bind(wx.EVT_BUTTON, on_save)
         
-        if is_windows_dark_mode():
-            dc = wx.Colour(40, 40, 40)
-            lt = wx.WHITE
+        dark_mode = is_windows_dark_mode()
+        dc = wx.Colour(40, 40, 40)
+        lt = wx.WHITE
+        if dark_mode:
             WxMswDarkMode().enable(dlg)
             dlg.SetBackgroundColour(dc); panel.SetBackgroundColour(dc)
             for w in panel.GetChildren():
                 w.SetBackgroundColour(dc)
                 w.SetForegroundColour(lt)
         
+        tasks = TaskGroup(wx.CallAfter)
+        tasks.run(fetch, populate)
         dlg.ShowModal()
+        tasks.cancel()
         dlg.Destroy()
 
     def on_find_in_timeline(self, event):
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         if not key or not self.timelines_data.get(key):
             wx.MessageBox("No timeline selected or timeline is empty.", "Find")
             return
-        dlg = wx.TextEntryDialog(self, "Search text:", "Find in Timeline")
+        dlg = wx.Dialog(self, title="Find in Timeline")
+        dlg_sizer = wx.BoxSizer(wx.VERTICAL)
+        dlg_sizer.Add(wx.StaticText(dlg, label='Search text (words match as prefixes; use "quotes" for phrases):'), 0, wx.ALL, 5)
+        query_input = wx.TextCtrl(dlg, size=(360, -1))
+        dlg_sizer.Add(query_input, 0, wx.ALL | wx.EXPAND, 5)
+        all_timelines = wx.CheckBox(dlg, label="Search &all open timelines")
+        dlg_sizer.Add(all_timelines, 0, wx.ALL, 5)
+        dlg_sizer.Add(dlg.CreateButtonSizer(wx.OK | wx.CANCEL), 0, wx.ALL | wx.ALIGN_RIGHT, 5)
+        dlg.SetSizerAndFit(dlg_sizer)
+        query_input.SetFocus()
         if dlg.ShowModal() != wx.ID_OK:
             dlg.Destroy()
             return
-        query = dlg.GetValue().strip().lower()
+        query = query_input.GetValue().strip()
+        search_all = all_timelines.GetValue()
         dlg.Destroy()
         if not query: return
         
-        items = self.timelines_data[key]
-        results = []
-        for i, item in enumerate(items):
-            status = item.get("status") if key == "notifications" else item
-            if not status: continue
-            source = status.get('reblog') or status
-            content = strip_html((source.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', ' ')).strip().lower()
-            author = (source.get('account', {}).get('display_name', '') or source.get('account', {}).get('username', '')).lower()
-            spoiler = (source.get('spoiler_text', '') or '').lower()
-            if query in content or query in author or query in spoiler:
-                results.append((i, status))
+        # The index is kept up to date as posts arrive; syncing here catches anything added or dropped by other paths.
+        loaded = list(self.timelines_data.items())
+        self.search_index.sync(item for _, items in loaded for item in items)
+        hits = self.search_index.search(query)
+        keys = [key] + ([k for k, _ in loaded if k != key] if search_all else [])
+        results, seen = [], set()
+        for timeline in keys:
+            for i, item in enumerate(self.timelines_data.get(timeline, [])):
+                status = item.get("status") if timeline == "notifications" else item
+                status_id = str(status.get('id')) if status else None
+                if status_id in hits and status_id not in seen:
+                    seen.add(status_id)
+                    results.append((timeline, i, status, hits[status_id]))
+        results.sort(key=lambda result: -result[3])
         
         if not results:
             wx.MessageBox(f"No posts found matching '{query}'.", "Find")
             return
         
-        if len(results) == 1:
-            self.posts_list.Select(results[0][0])
-            self.posts_list.EnsureVisible(results[0][0])
+        def go_to(timeline, idx):
+            if timeline != self.current_timeline_key():
+                if timeline not in self.timeline_nodes: return
+                self.timeline_tree.SelectItem(self.timeline_nodes[timeline])
+            if idx >= self.posts_list.GetItemCount(): return
+            self.posts_list.Select(idx)
+            self.posts_list.EnsureVisible(idx)
             self.posts_list.SetFocus()
+        
+        if len(results) == 1:
+            go_to(results[0][0], results[0][1])
             return
         
         result_dlg = wx.Dialog(self, title=f"Find Results ({len(results)} matches)", size=(600, 400))
         panel = wx.Panel(result_dlg)
         sizer = wx.BoxSizer(wx.VERTICAL)
         results_listbox = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 300))
-        for idx, status in results:
+        for timeline, idx, status, _ in results:
             source = status.get('reblog') or status
             author = source.get('account', {}).get('display_name') or source.get('account', {}).get('username', '')
-            content = strip_html((source.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', ' ')).strip()[:120]
-            results_listbox.Append(f"{author}: {content}")
+            content = status_snippet(source)[:120]
+            node = self.timeline_nodes.get(timeline)
+            where = f"{self.timeline_tree.GetItemText(node) if node else timeline}: " if search_all else ""
+            results_listbox.Append(f"{where}{author}: {content}")
         sizer.Add(results_listbox, 1, wx.EXPAND | wx.ALL, 10)
         
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -1652,11 +1981,8 @@ Description:
         def on_go(e):
             sel = results_listbox.GetSelection()
             if sel == wx.NOT_FOUND: return
-            idx = results[sel][0]
-            self.posts_list.Select(idx)
-            self.posts_list.EnsureVisible(idx)
-            self.posts_list.SetFocus()
             result_dlg.Close()
+            go_to(results[sel][0], results[sel][1])
         
         go_btn.Bind(wx.EVT_BUTTON, on_go)
         results_listbox.Bind(wx.EVT_LISTBOX_DCLICK, on_go)
@@ -1785,28 +2111,71 @@ Description:
         sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 5)
         panel.SetSizer(sizer)
         
-        trending_posts = []
-        trending_tags = []
-        trending_links = []
-        try:
-            trending_posts = self.mastodon.trending_statuses(limit=20)
-            for post in trending_posts:
-                author = post['account'].get('display_name') or post['account'].get('username', '')
-                content = strip_html((post.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', ' ')).strip()[:150]
-                posts_list.Append(f"{author}: {content}")
-        except Exception: pass
-        try:
-            trending_tags = self.mastodon.trending_tags(limit=20)
-            for tag in trending_tags:
-                history = tag.get('history', [{}])
-                uses = sum(int(h.get('uses', 0)) for h in history[:1])
-                tags_list.Append(f"#{tag['name']} ({uses} recent uses)")
-        except Exception: pass
-        try:
-            trending_links = self.mastodon.trending_links(limit=20)
-            for link in trending_links:
-                links_list.Append(f"{link.get('title', 'Untitled')} - {link.get('url', '')}")
-        except Exception: pass
+        def post_row(post):
+            author = post['account'].get('display_name') or post['account'].get('username', '')
+            return f"{author}: {status_snippet(post)[:150]}"
+
+        def tag_row(tag):
+            history = tag.get('history', [{}])
+            uses = sum(int(h.get('uses', 0)) for h in history[:1])
+            return f"#{tag['name']} ({uses} recent uses)"
+
+        def link_row(link):
+            return f"{link.get('title', 'Untitled')} - {link.get('url', '')}"
+
+        tasks = TaskGroup(wx.CallAfter)
+        instance = self.mastodon.api_base_url
+        feeds = {
+            "statuses": self.trends.feed(instance, "statuses", self.mastodon.trending_statuses),
+            "tags": self.trends.feed(instance, "tags", self.mastodon.trending_tags),
+            "links": self.trends.feed(instance, "links", self.mastodon.trending_links),
+        }
+        trending_posts, trending_tags, trending_links = (feeds[kind].items for kind in ("statuses", "tags", "links"))
+
+        def bind_feed(feed, listbox, format_row):
+            """Shows whatever is cached at once, refreshes it in the background once stale, and loads further pages near the end."""
+            def render():
+                selection = listbox.GetSelection()
+                listbox.Set([format_row(entry) for entry in feed.items])
+                if feed.items:
+                    listbox.SetSelection(min(max(selection, 0), len(feed.items) - 1))
+
+            def on_first(page):
+                feed.loading = False
+                feed.replace(page)
+                render()
+
+            def on_more(page):
+                feed.loading = False
+                added = feed.add_page(page)
+                while listbox.GetCount() > len(feed.items) - len(added):
+                    listbox.Delete(listbox.GetCount() - 1)
+                for entry in added:
+                    listbox.Append(format_row(entry))
+
+            def on_failed(ex):
+                feed.loading = False
+                if not feed.items: listbox.Clear()
+                elif listbox.GetCount() > len(feed.items): listbox.Delete(listbox.GetCount() - 1)
+
+            def on_select(e):
+                e.Skip()
+                if feed.loading or not feed.has_more or not near_end(listbox.GetSelection(), len(feed.items)): return
+                feed.loading = True
+                listbox.Append(LOADING_TEXT)
+                tasks.run(feed.fetch_more, on_more, on_failed)
+
+            if feed.items: render()
+            else: listbox.Set([LOADING_TEXT])
+            if feed.stale and not feed.loading:
+                feed.loading = True
+                tasks.run(feed.fetch_first, on_first, on_failed)
+            listbox.Bind(wx.EVT_LISTBOX, on_select)
+
+        # The three tabs load side by side, each rendered as soon as its own request answers.
+        bind_feed(feeds["statuses"], posts_list, post_row)
+        bind_feed(feeds["tags"], tags_list, tag_row)
+        bind_feed(feeds["links"], links_list, link_row)
         
         def on_open_trending_post(e):
             sel = posts_list.GetSelection()
@@ -1823,7 +2192,7 @@ Description:
                 self.timelines_data[timeline_key] = []
                 if timeline_key not in self.timeline_nodes:
                     node = self.timeline_tree.AppendItem(self.root, f"#{tag_name}")
-                    self.timeline_nodes[timeline_key] = node
+                    self.register_timeline_node(timeline_key, node)
                     if open_timelinesnd: open_timelinesnd.play()
                 dlg.Close()
                 self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
@@ -1851,6 +2220,9 @@ Description:
                 w.SetForegroundColour(lt)
         
         dlg.ShowModal()
+        tasks.cancel()
+        # Requests cut off by closing are simply made again on the next visit.
+        for feed in feeds.values(): feed.loading = False
         dlg.Destroy()
 
     def on_lists(self, event):
@@ -1861,12 +2233,12 @@ Description:
         lists_listbox = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 250))
         sizer.Add(lists_listbox, 1, wx.EXPAND | wx.ALL, 10)
         
+        lists_listbox.Append(LOADING_TEXT)
         user_lists = []
-        try:
-            user_lists = self.mastodon.lists()
-            for lst in user_lists:
-                lists_listbox.Append(lst.get('title', 'Untitled'))
-        except Exception: pass
+
+        def on_loaded(result):
+            user_lists[:] = result or []
+            lists_listbox.Set([lst.get('title', 'Untitled') for lst in user_lists])
         
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
         open_btn = wx.Button(panel, label="&Open Timeline")
@@ -1884,13 +2256,13 @@ Description:
         
         def on_open_list_timeline(e):
             sel = lists_listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(user_lists): return
             lst = user_lists[sel]
             timeline_key = f"list:{lst['id']}"
             self.timelines_data[timeline_key] = []
             if timeline_key not in self.timeline_nodes:
                 node = self.timeline_tree.AppendItem(self.root, f"List: {lst['title']}")
-                self.timeline_nodes[timeline_key] = node
+                self.register_timeline_node(timeline_key, node)
                 if open_timelinesnd: open_timelinesnd.play()
             dlg.Close()
             self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
@@ -1910,7 +2282,7 @@ Description:
         
         def on_delete_list(e):
             sel = lists_listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(user_lists): return
             lst = user_lists[sel]
             if wx.MessageBox(f"Delete list '{lst['title']}'?", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
                 try:
@@ -1921,7 +2293,7 @@ Description:
         
         def on_manage_members(e):
             sel = lists_listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(user_lists): return
             lst = user_lists[sel]
             self._manage_list_members(dlg, lst)
         
@@ -1939,23 +2311,22 @@ Description:
             for w in [lists_listbox, open_btn, create_btn, delete_btn, manage_btn, close_btn]:
                 w.SetBackgroundColour(dc); w.SetForegroundColour(lt)
         
+        tasks = TaskGroup(wx.CallAfter)
+        tasks.run(self.mastodon.lists, on_loaded, lambda ex: lists_listbox.Clear())
         dlg.ShowModal()
+        tasks.cancel()
         dlg.Destroy()
 
     def _manage_list_members(self, parent, lst):
         dlg = wx.Dialog(parent, title=f"Members of '{lst['title']}'", size=(500, 400))
         panel = wx.Panel(dlg)
         sizer = wx.BoxSizer(wx.VERTICAL)
-        members_listbox = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 250))
+        members_listbox = wx.ListBox(panel, choices=[LOADING_TEXT], style=wx.LB_SINGLE, size=(-1, 250))
         sizer.Add(members_listbox, 1, wx.EXPAND | wx.ALL, 10)
         
-        members = []
-        try:
-            members = self.mastodon.list_accounts(lst['id'], limit=80)
-            for acc in members:
-                display = acc.get('display_name') or acc.get('username', '')
-                members_listbox.Append(f"{display} (@{acc.get('acct', '')})")
-        except Exception: pass
+        pager = AccountPager(self.mastodon, lambda: self.mastodon.list_accounts(lst['id'], limit=ACCOUNT_PAGE_SIZE))
+        members = pager.items
+        tasks = TaskGroup(wx.CallAfter)
         
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
         add_btn = wx.Button(panel, label="&Add User")
@@ -1980,8 +2351,13 @@ Description:
                             if sel_dlg.ShowModal() == wx.ID_OK:
                                 acc = results[sel_dlg.GetSelection()]
                                 self.mastodon.list_accounts_add(lst['id'], [acc['id']])
-                                members.append(acc)
-                                members_listbox.Append(f"{acc.get('display_name', '')} (@{acc.get('acct', '')})")
+                                if pager.append(acc):
+                                    # Rows past the loaded members are placeholders; keep the new row ahead of them.
+                                    members_listbox.Insert(account_label(acc), len(members) - 1)
+                                    if not pager.loading:
+                                        while members_listbox.GetCount() > len(members):
+                                            members_listbox.Delete(members_listbox.GetCount() - 1)
+                                    refresh_title()
                             sel_dlg.Destroy()
                         else:
                             wx.MessageBox("No users found.", "Search")
@@ -1990,12 +2366,13 @@ Description:
         
         def on_remove_user(e):
             sel = members_listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(members): return
             acc = members[sel]
             try:
                 self.mastodon.list_accounts_delete(lst['id'], [acc['id']])
-                members.pop(sel)
+                pager.remove(sel)
                 members_listbox.Delete(sel)
+                refresh_title()
             except Exception as ex: wx.MessageBox(f"Error: {ex}", "Error")
         
         add_btn.Bind(wx.EVT_BUTTON, on_add_user)
@@ -2009,7 +2386,9 @@ Description:
             for w in [members_listbox, add_btn, remove_btn, close_btn]:
                 w.SetBackgroundColour(dc); w.SetForegroundColour(lt)
         
+        refresh_title = self._bind_account_pager(dlg, members_listbox, pager, tasks, f"Members of '{lst['title']}'", "This list has no members.")
         dlg.ShowModal()
+        tasks.cancel()
         dlg.Destroy()
 
     def _collection_label(self, collection, prefix=""):
@@ -2028,9 +2407,8 @@ Description:
 
     def _show_collection_accounts(self, collection, can_manage=False):
         try:
-            data = fetch_collection(self.mastodon, collection["id"])
-            accounts = data.get("accounts", []) if isinstance(data, dict) else []
-            full_collection = data.get("collection", collection) if isinstance(data, dict) else collection
+            full_collection, accounts = self.collection_cache.load(self.mastodon, collection, self.account_cache)
+            accounts = list(accounts)
         except Exception as e:
             wx.MessageBox(f"Error loading collection: {e}", "Collections", wx.OK | wx.ICON_ERROR)
             return
@@ -2077,10 +2455,10 @@ Description:
             if not account:
                 return
             try:
-                account = self.mastodon.account(account["id"])
+                account = self.fetch_account(account["id"])
             except Exception:
                 pass
-            profile_dlg = ViewProfileDialog(dlg, account, self.mastodon, self.me)
+            profile_dlg = ViewProfileDialog(dlg, account, self.mastodon, self.me, self.relationships)
             profile_dlg.ShowModal()
             profile_dlg.Destroy()
 
@@ -2096,6 +2474,7 @@ Description:
                 return
             try:
                 remove_collection_item(self.mastodon, full_collection["id"], item["id"])
+                self.collection_cache.invalidate(full_collection["id"])
                 index = accounts.index(account)
                 accounts.pop(index)
                 accounts_list.Delete(index)
@@ -2191,16 +2570,18 @@ Description:
         sizer.Add(collections_list, 1, wx.EXPAND | wx.ALL, 10)
 
         entries = []
+        tasks = TaskGroup(wx.CallAfter)
+        pending = {}
 
-        def refresh():
-            entries.clear()
+        def fetch_collections():
+            return run_concurrently(
+                lambda: fetch_account_collections(self.mastodon, self.me["id"]),
+                lambda: fetch_account_in_collections(self.mastodon, self.me["id"]),
+            )
+
+        def on_loaded(result):
+            owned, included = result
             collections_list.Clear()
-            try:
-                owned = fetch_account_collections(self.mastodon, self.me["id"])
-                included = fetch_account_in_collections(self.mastodon, self.me["id"])
-            except Exception as ex:
-                wx.MessageBox(f"Error loading collections: {ex}", "Collections", wx.OK | wx.ICON_ERROR)
-                return
             for collection in owned:
                 entries.append(("owned", collection))
                 collections_list.Append(self._collection_label(collection, "Mine: "))
@@ -2212,9 +2593,21 @@ Description:
             if entries:
                 collections_list.SetSelection(0)
 
+        def on_failed(ex):
+            collections_list.Clear()
+            wx.MessageBox(f"Error loading collections: {ex}", "Collections", wx.OK | wx.ICON_ERROR)
+
+        def refresh():
+            # A newer refresh supersedes one still in flight after a quick edit.
+            if pending.get("task"):
+                pending["task"].cancel()
+            entries.clear()
+            collections_list.Set([LOADING_TEXT])
+            pending["task"] = tasks.run(fetch_collections, on_loaded, on_failed)
+
         def selected_entry():
             sel = collections_list.GetSelection()
-            if sel == wx.NOT_FOUND:
+            if sel == wx.NOT_FOUND or sel >= len(entries):
                 return None, None
             return entries[sel]
 
@@ -2256,6 +2649,7 @@ Description:
                 return
             try:
                 update_collection(self.mastodon, collection["id"], data)
+                self.collection_cache.invalidate(collection["id"])
                 refresh()
             except Exception as ex:
                 wx.MessageBox(f"Error updating collection: {ex}", "Collections", wx.OK | wx.ICON_ERROR)
@@ -2269,6 +2663,7 @@ Description:
                 return
             try:
                 delete_collection(self.mastodon, collection["id"])
+                self.collection_cache.invalidate(collection["id"])
                 refresh()
             except Exception as ex:
                 wx.MessageBox(f"Error deleting collection: {ex}", "Collections", wx.OK | wx.ICON_ERROR)
@@ -2287,6 +2682,7 @@ Description:
                 return
             try:
                 add_collection_account(self.mastodon, collection["id"], account["id"])
+                self.collection_cache.invalidate(collection["id"])
                 wx.MessageBox("Author added to the collection.", "Collections")
                 refresh()
             except Exception as ex:
@@ -2305,6 +2701,7 @@ Description:
                 return
             try:
                 revoke_collection_item(self.mastodon, collection["id"], item["id"])
+                self.collection_cache.invalidate(collection["id"])
                 refresh()
             except Exception as ex:
                 wx.MessageBox(f"Error revoking inclusion: {ex}", "Collections", wx.OK | wx.ICON_ERROR)
@@ -2327,6 +2724,7 @@ Description:
 
         refresh()
         dlg.ShowModal()
+        tasks.cancel()
         dlg.Destroy()
 
     def on_view_user_collections(self, event):
@@ -2389,12 +2787,12 @@ Description:
         tags_listbox = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 250))
         sizer.Add(tags_listbox, 1, wx.EXPAND | wx.ALL, 10)
         
+        tags_listbox.Append(LOADING_TEXT)
         followed_tags = []
-        try:
-            followed_tags = self.mastodon.followed_tags()
-            for tag in followed_tags:
-                tags_listbox.Append(f"#{tag['name']}")
-        except Exception: pass
+
+        def on_loaded(result):
+            followed_tags[:] = result or []
+            tags_listbox.Set([f"#{tag['name']}" for tag in followed_tags])
         
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
         open_btn = wx.Button(panel, label="&Open Timeline")
@@ -2410,13 +2808,13 @@ Description:
         
         def on_open_tag(e):
             sel = tags_listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(followed_tags): return
             tag_name = followed_tags[sel]['name']
             timeline_key = f"hashtag:{tag_name}"
             self.timelines_data[timeline_key] = []
             if timeline_key not in self.timeline_nodes:
                 node = self.timeline_tree.AppendItem(self.root, f"#{tag_name}")
-                self.timeline_nodes[timeline_key] = node
+                self.register_timeline_node(timeline_key, node)
             dlg.Close()
             self.timeline_tree.SelectItem(self.timeline_nodes[timeline_key])
             threading.Thread(target=self.load_timeline, args=(timeline_key,), daemon=True).start()
@@ -2435,7 +2833,7 @@ Description:
         
         def on_unfollow(e):
             sel = tags_listbox.GetSelection()
-            if sel == wx.NOT_FOUND: return
+            if sel == wx.NOT_FOUND or sel >= len(followed_tags): return
             try:
                 self.mastodon.hashtag_unfollow(followed_tags[sel]['name'])
                 followed_tags.pop(sel)
@@ -2455,7 +2853,10 @@ Description:
             for w in [tags_listbox, open_btn, follow_btn, unfollow_btn, close_btn]:
                 w.SetBackgroundColour(dc); w.SetForegroundColour(lt)
         
+        tasks = TaskGroup(wx.CallAfter)
+        tasks.run(self.mastodon.followed_tags, on_loaded, lambda ex: tags_listbox.Clear())
         dlg.ShowModal()
+        tasks.cancel()
         dlg.Destroy()
 
     def on_view_media(self, event):
@@ -2537,79 +2938,72 @@ Description:
         status, _ = self.get_selected_status()
         if not status: return
         source = status.get('reblog') or status
-        try:
-            accounts = self.mastodon.status_reblogged_by(source['id'])
-            if not accounts:
-                wx.MessageBox("No one has boosted this post yet.", "Boosters")
-                return
-            self._show_account_list(f"Boosted by ({len(accounts)})", accounts)
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        self._show_account_list("Boosted by", lambda: fetch_reblogged_by(self.mastodon, source['id'], limit=ACCOUNT_PAGE_SIZE), "No one has boosted this post yet.")
 
     def on_view_favouriters(self, event):
         status, _ = self.get_selected_status()
         if not status: return
         source = status.get('reblog') or status
-        try:
-            accounts = self.mastodon.status_favourited_by(source['id'])
-            if not accounts:
-                wx.MessageBox("No one has favourited this post yet.", "Favouriters")
-                return
-            self._show_account_list(f"Favourited by ({len(accounts)})", accounts)
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+        self._show_account_list("Favourited by", lambda: fetch_favourited_by(self.mastodon, source['id'], limit=ACCOUNT_PAGE_SIZE), "No one has favourited this post yet.")
 
     def on_view_edit_history(self, event):
         status, _ = self.get_selected_status()
         if not status: return
         source = status.get('reblog') or status
-        try:
-            history = self.mastodon.status_history(source['id'])
-            if not history or len(history) < 2:
-                wx.MessageBox("This post has no edit history.", "Edit History")
+        history = []
+        dlg = wx.Dialog(self, title="Edit History", size=(600, 400))
+        panel = wx.Panel(dlg)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        versions_list = wx.ListBox(panel, choices=[LOADING_TEXT], style=wx.LB_SINGLE, size=(-1, 150))
+        sizer.Add(versions_list, 0, wx.EXPAND | wx.ALL, 10)
+        
+        content_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE | wx.TE_READONLY, size=(-1, 150))
+        sizer.Add(wx.StaticText(panel, label="Content:"), 0, wx.LEFT | wx.RIGHT, 10)
+        sizer.Add(content_text, 1, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+        
+        def on_version_sel(e):
+            sel = versions_list.GetSelection()
+            if sel != wx.NOT_FOUND and sel < len(history):
+                ver = history[sel]
+                text = html_to_plain_text(ver.get('content', ''))
+                if ver.get('spoiler_text'):
+                    text = f"CW: {ver['spoiler_text']}\n\n{text}"
+                content_text.SetValue(text)
+        versions_list.Bind(wx.EVT_LISTBOX, on_version_sel)
+
+        def on_loaded(result):
+            if not result or len(result) < 2:
+                versions_list.Set(["This post has no edit history."])
                 return
-            dlg = wx.Dialog(self, title=f"Edit History ({len(history)} versions)", size=(600, 400))
-            panel = wx.Panel(dlg)
-            sizer = wx.BoxSizer(wx.VERTICAL)
-            versions_list = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 150))
+            history.extend(result)
+            labels = []
             for i, ver in enumerate(history):
                 label = f"Version {len(history) - i}"
                 if ver.get('created_at'):
                     label += f" - {ver['created_at'].strftime('%Y-%m-%d %H:%M')}"
-                versions_list.Append(label)
-            sizer.Add(versions_list, 0, wx.EXPAND | wx.ALL, 10)
-            
-            content_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE | wx.TE_READONLY, size=(-1, 150))
-            sizer.Add(wx.StaticText(panel, label="Content:"), 0, wx.LEFT | wx.RIGHT, 10)
-            sizer.Add(content_text, 1, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
-            
-            def on_version_sel(e):
-                sel = versions_list.GetSelection()
-                if sel != wx.NOT_FOUND:
-                    ver = history[sel]
-                    text = strip_html((ver.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', '\n\n')).strip()
-                    if ver.get('spoiler_text'):
-                        text = f"CW: {ver['spoiler_text']}\n\n{text}"
-                    content_text.SetValue(text)
-            versions_list.Bind(wx.EVT_LISTBOX, on_version_sel)
-            
-            close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
-            sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
-            panel.SetSizer(sizer)
-            
-            if versions_list.GetCount() > 0:
-                versions_list.SetSelection(0)
-                on_version_sel(None)
-            
-            if is_windows_dark_mode():
-                dc = wx.Colour(40, 40, 40)
-                lt = wx.WHITE
-                WxMswDarkMode().enable(dlg)
-                dlg.SetBackgroundColour(dc); panel.SetBackgroundColour(dc)
-                for w in [versions_list, content_text, close_btn]:
-                    w.SetBackgroundColour(dc); w.SetForegroundColour(lt)
-            
-            dlg.ShowModal()
-            dlg.Destroy()
-        except Exception as e: wx.MessageBox(f"Error: {e}", "Error")
+                labels.append(label)
+            versions_list.Set(labels)
+            dlg.SetTitle(f"Edit History ({len(history)} versions)")
+            versions_list.SetSelection(0)
+            on_version_sel(None)
+        
+        close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
+        sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+        panel.SetSizer(sizer)
+        
+        if is_windows_dark_mode():
+            dc = wx.Colour(40, 40, 40)
+            lt = wx.WHITE
+            WxMswDarkMode().enable(dlg)
+            dlg.SetBackgroundColour(dc); panel.SetBackgroundColour(dc)
+            for w in [versions_list, content_text, close_btn]:
+                w.SetBackgroundColour(dc); w.SetForegroundColour(lt)
+        
+        tasks = TaskGroup(wx.CallAfter)
+        tasks.run(lambda: self.mastodon.status_history(source['id']), on_loaded, lambda ex: versions_list.Set([f"Error: {ex}"]))
+        dlg.ShowModal()
+        tasks.cancel()
+        dlg.Destroy()
 
     def on_mute_conversation(self, event):
         status, _ = self.get_selected_status()
@@ -2688,6 +3082,7 @@ Description:
         vbox = wx.BoxSizer(wx.VERTICAL)
         vbox.Add(wx.StaticText(panel, label=f"Send a direct &message to {display} (@{acct}):"), 0, wx.ALL, 10)
         dm_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE, size=(480, 100))
+        self.attach_completion(dm_text)
         dm_text.SetValue(f"@{acct} ")
         dm_text.SetInsertionPointEnd()
         vbox.Add(dm_text, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
@@ -2738,10 +3133,10 @@ Description:
         
         if account_to_view:
             try:
-                full_account = self.mastodon.account(account_to_view['id'])
+                full_account = self.fetch_account(account_to_view['id'])
             except Exception:
                 full_account = account_to_view
-            profile_dlg = ViewProfileDialog(self, full_account, self.mastodon, self.me)
+            profile_dlg = ViewProfileDialog(self, full_account, self.mastodon, self.me, self.relationships)
             profile_dlg.ShowModal()
             profile_dlg.Destroy()
 
@@ -2778,7 +3173,7 @@ Description:
             self.media_files[sel]["alt_text"] = self.alt_text_input.GetValue()
 
     def refresh_post_in_list(self, status, index):
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
+        key = self.current_timeline_key()
         if not key or index is None: return
         if key == "notifications": self.load_timeline(key)
         else:
@@ -2790,7 +3185,16 @@ Description:
 
     def open_settings(self, event):
         dlg = SettingsDialog(self, on_save_callback=self.load_sounds)
-        if dlg.ShowModal() == wx.ID_OK: load_sounds_globally()
+        if dlg.ShowModal() == wx.ID_OK:
+            load_sounds_globally()
+            self.load_row_templates()
+            self.posts_list.set_headers(self.status_row.headers)
+            grouped = bool(EasySettings("thrive.ini").get("grouped_notifications", True))
+            if grouped != self.grouped_notifications:
+                self.grouped_notifications = grouped
+                self.timelines.pop("notifications", None)
+                threading.Thread(target=self.load_timeline, args=("notifications",), daemon=True).start()
+            self.on_timeline_selected(None)
         dlg.Destroy()
 
     def on_notification_policy(self, event):
@@ -2857,6 +3261,98 @@ Description:
                 wx.MessageBox(f"Error saving notification filters: {ex}", "Notification Filters", wx.OK | wx.ICON_ERROR)
         dlg.Destroy()
 
+    def load_local_filter_rules(self):
+        try:
+            return json.loads(EasySettings("thrive.ini").get("local_filters", "[]"))
+        except (TypeError, ValueError):
+            return []
+
+    def refresh_server_filters(self):
+        """Fetches the account's v2 filters in the background and re-applies them to what is already loaded."""
+        if not self.mastodon: return
+        def done(server_filters):
+            self.filters.set_server_filters(server_filters)
+            self.reapply_filters()
+        BackgroundTask(self.mastodon.filters_v2, done, lambda e: None, wx.CallAfter).start()
+
+    def reapply_filters(self):
+        for key, items in list(self.timelines_data.items()):
+            self.timelines_data[key] = self.filters.apply(items, timeline_context(key))
+        if len(self.timelines_data.get(self.current_timeline_key(), [])) != self.posts_list.GetItemCount():
+            self.on_timeline_selected(None)
+
+    def on_local_filters(self, event):
+        rules = self.load_local_filter_rules()
+        kinds = dict(zip(LOCAL_FILTER_KINDS, ["Keyword", "Regular expression", "Account (user@instance)", "Boosts by account (* for all)"]))
+        dlg = wx.Dialog(self, title="Local Filters", size=(520, 430))
+        panel = wx.Panel(dlg)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        rules_listbox = wx.ListBox(panel, choices=[describe_rule(rule) for rule in rules], style=wx.LB_SINGLE, size=(-1, 200))
+        sizer.Add(rules_listbox, 1, wx.EXPAND | wx.ALL, 10)
+        kind_choice = wx.Choice(panel, choices=list(kinds.values()))
+        kind_choice.SetSelection(0)
+        value_input = wx.TextCtrl(panel, style=wx.TE_PROCESS_ENTER)
+        whole_word = wx.CheckBox(panel, label="&Whole word only")
+        grid = wx.FlexGridSizer(rows=0, cols=2, vgap=8, hgap=8)
+        grid.AddGrowableCol(1, 1)
+        grid.Add(wx.StaticText(panel, label="&Type: "), 0, wx.ALIGN_CENTER_VERTICAL)
+        grid.Add(kind_choice, 1, wx.EXPAND)
+        grid.Add(wx.StaticText(panel, label="&Value: "), 0, wx.ALIGN_CENTER_VERTICAL)
+        grid.Add(value_input, 1, wx.EXPAND)
+        sizer.Add(grid, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+        sizer.Add(whole_word, 0, wx.ALL, 10)
+
+        btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        add_btn = wx.Button(panel, label="&Add")
+        remove_btn = wx.Button(panel, label="&Remove")
+        close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
+        for btn in (add_btn, remove_btn, close_btn):
+            btn_sizer.Add(btn, 0, wx.ALL, 5)
+        sizer.Add(btn_sizer, 0, wx.ALIGN_RIGHT | wx.ALL, 5)
+        panel.SetSizer(sizer)
+
+        def save():
+            EasySettings("thrive.ini").setsave("local_filters", json.dumps(rules))
+            self.filters.set_local_rules(rules)
+            self.reapply_filters()
+
+        def on_add(e):
+            kind = LOCAL_FILTER_KINDS[kind_choice.GetSelection()]
+            value = value_input.GetValue().strip()
+            if kind in ("account", "boosts"): value = value.lstrip("@").lower()
+            if not value: return
+            if kind == "regex" and not valid_pattern(value):
+                wx.MessageBox(f"'{value}' is not a valid regular expression.", "Local Filters", wx.OK | wx.ICON_ERROR)
+                return
+            rule = {"kind": kind, "value": value}
+            if kind == "keyword": rule["whole_word"] = whole_word.GetValue()
+            rules.append(rule)
+            rules_listbox.Append(describe_rule(rule))
+            value_input.Clear()
+            save()
+
+        def on_remove(e):
+            sel = rules_listbox.GetSelection()
+            if sel == wx.NOT_FOUND: return
+            rules.pop(sel)
+            rules_listbox.Delete(sel)
+            save()
+
+        add_btn.Bind(wx.EVT_BUTTON, on_add)
+        remove_btn.Bind(wx.EVT_BUTTON, on_remove)
+        value_input.Bind(wx.EVT_TEXT_ENTER, on_add)
+
+        if is_windows_dark_mode():
+            dc = wx.Colour(40, 40, 40)
+            lt = wx.WHITE
+            WxMswDarkMode().enable(dlg)
+            dlg.SetBackgroundColour(dc); panel.SetBackgroundColour(dc)
+            for child in panel.GetChildren():
+                child.SetBackgroundColour(dc); child.SetForegroundColour(lt)
+
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def on_toggle_cw(self, event):
         show = self.cw_toggle.IsChecked()
         self.cw_input.Show(show)
@@ -3048,35 +3544,25 @@ Description:
         event.Skip()
 
     def load_older_posts(self):
-        key = next((k for k, v in self.timeline_nodes.items() if v == self.timeline_tree.GetSelection()), None)
-        if not key or not self.timelines_data.get(key): return
-        last_items = self.timelines_data[key]
-        if not last_items: return
-        
-        last_id = None
-        if key == "notifications":
-            last_id = last_items[-1].get('id')
-        else:
-            last_id = last_items[-1].get('id')
-        
-        if not last_id: return
+        key = self.current_timeline_key()
+        # Mentions can page back even when none of the loaded notifications were mentions.
+        if not key or not (self.timelines_data.get(key) or key == "mentions"): return
+        source = self.timeline_for(key)
+        if not source or not source.has_more: return
         
+        if key == "mentions": self.mentions_backfilled = True
         def _load():
             try:
-                if key == "home": data = self.mastodon.timeline_home(max_id=last_id, limit=40)
-                elif key == "local": data = self.mastodon.timeline_local(max_id=last_id, limit=40)
-                elif key == "federated": data = self.mastodon.timeline_public(max_id=last_id, limit=40)
-                elif key == "sent": data = [s for s in self.mastodon.account_statuses(self.me["id"], max_id=last_id, limit=40) if not s.get("reblog")]
-                elif key == "favourites": data = self.mastodon.favourites(max_id=last_id, limit=40)
-                elif key == "bookmarks": data = self.mastodon.bookmarks(max_id=last_id, limit=40)
-                elif key == "notifications": data = fetch_notifications(self.mastodon, max_id=last_id, limit=40)
-                elif key == "mentions": data = [n["status"] for n in fetch_notifications(self.mastodon, types=["mention"], max_id=last_id, limit=40) if n.get("status")]
-                elif key.startswith("user:"): data = fetch_account_statuses(self.mastodon, key.split(":", 1)[1], exclude_direct=True, max_id=last_id, limit=40)
-                elif key.startswith("hashtag:"): data = self.mastodon.timeline_hashtag(key.split(":", 1)[1], max_id=last_id, limit=40)
-                elif key.startswith("list:"): data = self.mastodon.timeline_list(key.split(":", 1)[1], max_id=last_id, limit=40)
-                else: data = []
-                
-                self.timelines_data[key].extend(data)
+                # A notification group can span pages; its older part joins the row already listed.
+                merge = merge_older_groups if key == "notifications" and self.grouped_notifications else merge_older
+                data = merge(self.timelines_data[key], self.filters.apply(source.load_older(), timeline_context(key)))
+                if key == "notifications" and not self.mentions_backfilled:
+                    # Older notifications carry older mentions too; the mentions timeline picks up below them.
+                    merge_older(self.timelines_data["mentions"], mention_statuses(data))
+                    self.timeline_for("mentions").start_after(source.next_max_id)
+                self.hydrator.mark_fresh(data)
+                self.index_items(data)
+                self.prefetch_relationships(data)
                 if self.timeline_tree.GetSelection() == self.timeline_nodes.get(key):
                     for item in data:
                         row, avatar_url = (self.row_from_notification(item) if key == "notifications" else self.row_from_status(item))
@@ -3100,10 +3586,87 @@ Description:
 
     def start_streaming(self):
         if not self.mastodon: return
-        threading.Thread(target=self.mastodon.stream_user, args=(CustomStreamListener(self),), daemon=True).start()
+        def run():
+            try:
+                self.mastodon.stream_user(CustomStreamListener(self))
+            except Exception:
+                pass
+            # The stream only returns when it is closed or could not be opened (blocked, proxied, server down).
+            wx.CallAfter(self.on_stream_lost)
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_stream_lost(self):
+        """Polls the streamed timelines until a new stream connection sends its first heartbeat."""
+        retry_in = self.refresh.stream_lost()
+        if not self.poll_timer.IsRunning():
+            self.poll_timer.Start(POLL_TICK)
+            self.poll_due_timelines()
+        wx.CallLater(retry_in * 1000, self.start_streaming)
+
+    def on_stream_alive(self):
+        if not self.refresh.stream_alive(): return
+        self.poll_timer.Stop()
+        # One last poll covers whatever arrived between the previous one and the stream connecting.
+        for key in POLLED_TIMELINES: self.poll_timeline(key)
+
+    def poll_due_timelines(self, event=None):
+        for key in self.refresh.due(): self.poll_timeline(key)
+
+    def poll_timeline(self, key):
+        """Fetches what is newer than the top of a streamed timeline and adds it as the stream would have."""
+        loaded = self.timelines_data.get(key)
+        since_id = loaded[0].get("id") if loaded else None
+        if key == "home":
+            fetch, add = (lambda: self.mastodon.timeline_home(since_id=since_id, limit=TIMELINE_PAGE_SIZE)), self.add_new_post
+        elif key == "direct_messages":
+            # Conversations page by their last status, so this returns only the ones with new messages.
+            fetch, add = (lambda: self.mastodon.conversations(since_id=since_id, limit=TIMELINE_PAGE_SIZE)), self.update_conversation
+        else:
+            fetch, add = (lambda: fetch_notifications(self.mastodon, since_id=since_id, limit=TIMELINE_PAGE_SIZE)), self.add_notification
+        def done(page):
+            known = {str(item.get("id")) for item in self.timelines_data.get(key, [])}
+            new_items = [item for item in reversed(list(page or [])) if str(item.get("id")) not in known]
+            for item in new_items: add(item)
+            self.refresh.polled(key, len(new_items), *rate_limit_state(self.mastodon))
+        def failed(ex):
+            self.refresh.polled(key, 0, *rate_limit_state(self.mastodon))
+        BackgroundTask(fetch, done, failed, wx.CallAfter).start()
+
+    def poll_unread(self):
+        """Asks only how many notifications and mentions are unread; the notifications themselves are fetched when that number grows."""
+        if not self.mastodon: return
+        def fetch():
+            return [fetch_unread_count(self.mastodon), fetch_unread_count(self.mastodon, types=["mention"])]
+        def done(counts):
+            grew = False
+            for key, count in zip(self.unread, counts):
+                grew = self.unread[key].update(count) > 0 or grew
+                self.timeline_tree.SetItemText(self.timeline_nodes[key], unread_label(UNREAD_NODE_LABELS[key], count))
+            if grew: self.fetch_new_notifications()
+            self.unread_call = wx.CallLater(min(counter.interval for counter in self.unread.values()) * 1000, self.poll_unread)
+        def failed(ex):
+            # Servers before 4.3 have no unread count; the stream is all there is there.
+            if isinstance(ex, MastodonNotFoundError): return
+            self.unread_call = wx.CallLater(UNREAD_MAX_INTERVAL * 1000, self.poll_unread)
+        BackgroundTask(fetch, done, failed, wx.CallAfter).start()
+
+    def fetch_new_notifications(self):
+        """Pulls only the notifications newer than the newest one loaded and adds them as if they had come over the stream."""
+        loaded = self.timelines_data.get("notifications")
+        if not loaded: return
+        newest = loaded[0].get("id")
+        def done(page):
+            known = {str(item.get("id")) for item in self.timelines_data.get("notifications", [])}
+            for notification in reversed(list(page or [])):
+                if str(notification.get("id")) not in known: self.add_notification(notification)
+        BackgroundTask(lambda: fetch_notifications(self.mastodon, since_id=newest, limit=TIMELINE_PAGE_SIZE), done, lambda ex: None, wx.CallAfter).start()
 
     def add_new_post(self, status):
         is_own = self.me and status.get("account", {}).get("id") == self.me.get("id")
+        # Filtered posts are dropped before they are indexed, listed or make a sound.
+        if self.filters.hides(status, "home"): return
+        self.hydrator.mark_fresh([status])
+        self.index_items([status])
         if is_own:
             if usersnd: usersnd.play()
             # Add to sent timeline
@@ -3121,6 +3684,7 @@ Description:
 
         # Add to home timeline (stream_user delivers home timeline posts)
         self.timelines_data["home"].insert(0, status)
+        self.show_unread("home")
         if self.timeline_tree.GetSelection() == self.timeline_nodes["home"]:
             row, avatar_url = self.row_from_status(status)
             if row:
@@ -3141,14 +3705,24 @@ Description:
 
     def add_notification(self, notification):
         ntype = notification.get("type")
+        if self.filters.hides(notification, "notifications"): return
+        self.hydrator.mark_fresh([notification])
+        self.index_items([notification])
+        if ntype in ("follow", "follow_request") and notification.get("account"):
+            self.relationships.invalidate(notification["account"]["id"])
         if ntype in ["favourite", "reblog", "follow", "follow_request", "status", "added_to_collection", "collection_update"]:
             notificationsnd and notificationsnd.play()
         elif ntype == "mention":
             mentionsnd and mentionsnd.play()
 
-        self.timelines_data["notifications"].insert(0, notification)
+        notifications = self.timelines_data["notifications"]
+        # Grouped rows take the new notification into their group and move back to the top.
+        joined, item = merge_notification(notifications, notification) if self.grouped_notifications else (None, notification)
+        if joined is not None: notifications.pop(joined)
+        notifications.insert(0, item)
         if self.timeline_tree.GetSelection() == self.timeline_nodes["notifications"]:
-            row, avatar_url = self.row_from_notification(notification)
+            if joined is not None and joined < self.posts_list.GetItemCount(): self.posts_list.Delete(joined)
+            row, avatar_url = self.row_from_notification(item)
             if row:
                 self.posts_list.Insert(row, 0, avatar_url)
                 self.queue_avatar_download(avatar_url)
@@ -3164,6 +3738,9 @@ Description:
                     self.queue_avatar_download(avatar_url)
 
     def handle_status_update(self, status):
+        derived_text.invalidate(status.get("id"))
+        self.hydrator.mark_fresh([status])
+        self.index_items([status])
         for timeline in ["home", "local", "federated", "sent", "mentions", "direct_messages", "favourites", "bookmarks"]:
             for i, s in enumerate(self.timelines_data.get(timeline, [])):
                 if s.get("id") == status.get("id"):
@@ -3174,7 +3751,38 @@ Description:
                         self.queue_avatar_download(avatar_url)
                     break
 
+    def update_conversation(self, conversation):
+        """Moves a conversation with a new message (or a changed read state) to the top in place of its old row."""
+        items = self.timelines_data.setdefault("direct_messages", [])
+        index, status = self.conversations.update(items, conversation)
+        if not status: return
+        if index is not None:
+            items.pop(index)
+            if self.timeline_tree.GetSelection() == self.timeline_nodes["direct_messages"] and index < self.posts_list.GetItemCount():
+                self.posts_list.Delete(index)
+        if self.filters.hides(status, timeline_context("direct_messages")):
+            self.show_unread("direct_messages")
+            return
+        self.hydrator.mark_fresh([status])
+        self.index_items([status])
+        items.insert(0, status)
+        if self.timeline_tree.GetSelection() == self.timeline_nodes["direct_messages"]:
+            row, avatar_url = self.row_from_status(status)
+            if row:
+                self.posts_list.Insert(row, 0, avatar_url)
+                self.queue_avatar_download(avatar_url)
+        self.show_unread("direct_messages")
+
+    def mark_conversation_read(self, status):
+        conversation_id = self.conversations.mark_read(status)
+        if conversation_id is None: return
+        self.show_unread("direct_messages")
+        BackgroundTask(lambda: self.mastodon.conversations_read(conversation_id), lambda result: None, lambda ex: None, wx.CallAfter).start()
+
     def handle_post_deletion(self, status_id):
+        self.reply_index.remove(status_id)
+        self.search_index.remove(status_id)
+        if self.local_search: self.local_search.remove_later(status_id)
         for timeline in ["home", "local", "federated", "sent", "mentions", "direct_messages", "favourites", "bookmarks"]:
             for i, s in enumerate(self.timelines_data.get(timeline, [])):
                 if s.get("id") == status_id:
@@ -3183,63 +3791,274 @@ Description:
                         self.posts_list.Delete(i)
                     break
 
-    def load_timeline(self, timeline):
+    def prefetch_relationships(self, items):
+        # One bulk lookup per page, so follow/block/mute on any visible author needs no extra round trip.
+        my_id = str((self.me or {}).get("id"))
+        ids = [account_id for account_id in self.relationships.missing(author_ids(items)) if account_id != my_id]
+        if not ids or not self.mastodon: return
+        def _fetch():
+            try: self.relationships.fetch(self.mastodon, ids)
+            except Exception: pass
+        threading.Thread(target=_fetch, daemon=True).start()
+
+    def attach_completion(self, text_ctrl):
+        return ComposeCompleter(text_ctrl, self.completions, self.lookup_completions)
+
+    def lookup_completions(self, token):
+        """Asks the server about an @account or #hashtag prefix the local index has never seen; runs off the GUI thread."""
+        if not self.mastodon: return
+        if token.startswith("@"):
+            self.completions.add_accounts(self.mastodon.account_search(token[1:], limit=COMPLETION_LIMIT))
+        else:
+            self.completions.add_tags((search_v2(self.mastodon, token[1:], type="hashtags", limit=COMPLETION_LIMIT) or {}).get("hashtags"))
+
+    def schedule_hydrate(self):
+        # Scrolling restarts the wait, so only the rows the reader settles on are requested.
+        if self.hydrate_call and self.hydrate_call.IsRunning(): self.hydrate_call.Restart(HYDRATE_SCROLL_DELAY)
+        else: self.hydrate_call = wx.CallLater(HYDRATE_SCROLL_DELAY, self.hydrate_visible)
+
+    def hydrate_visible(self, event=None):
+        """Refreshes stale counts and fills in shallow quotes for the rows on screen, then the rows after them, 20 statuses per request."""
+        key = self.current_timeline_key()
+        items = self.timelines_data.get(key) if key else None
+        if not items or self.hydrating or not self.mastodon or not self.hydrator.supported: return
+        top = max(self.posts_list.GetTopItem(), 0)
+        ids = self.hydrator.stale_ids(items[top:], limit=self.hydrator.batch_size * HYDRATE_MAX_BATCHES)
+        if not ids: return
+        self.hydrating = True
+        def done(fresh):
+            self.hydrating = False
+            self.apply_hydrated(fresh)
+        def failed(ex):
+            self.hydrating = False
+        BackgroundTask(lambda: self.hydrator.fetch(self.mastodon, ids), done, failed, wx.CallAfter).start()
+
+    def apply_hydrated(self, fresh):
+        """Swaps refreshed statuses into every loaded timeline, redrawing only the rows that changed."""
+        if not fresh: return
+        current = self.current_timeline_key()
+        changed = []
+        for key, items in self.timelines_data.items():
+            for index, item in enumerate(items):
+                new_item = hydrated_item(item, fresh)
+                if new_item is item: continue
+                items[index] = new_item
+                changed.append(new_item)
+                if key == current and index < self.posts_list.GetItemCount():
+                    row, avatar_url = (self.row_from_notification(new_item) if key == "notifications" else self.row_from_status(new_item))
+                    if row: self.posts_list.SetString(index, row, avatar_url)
+        for item in changed:
+            derived_text.invalidate((item.get("status") or item).get("id"))
+        self.index_items(changed)
+
+    def index_items(self, items):
+        """Feeds freshly loaded statuses or notifications to the reply, Find and local search indexes."""
+        self.reply_index.add_many(items)
+        self.search_index.add_many(items)
+        self.completions.add_items(items)
+        if self.local_search: self.local_search.add_later(items)
+
+    def load_search(self, key):
+        """Shows matches from the local index straight away, then appends what the server adds when it answers."""
+        query = key.split(":", 1)[1]
+        _, filters = parse_search_query(query)
+        local = self.local_search.search(query) if self.local_search else []
+        wx.CallAfter(self.show_search_results, key, local, False)
+        try:
+            server = self.timeline_for(key).load()
+        except Exception as e:
+            if not local: wx.CallAfter(wx.MessageBox, f"Failed to load timeline: {e}", "Error")
+            return
+        self.hydrator.mark_fresh(server)
+        wx.CallAfter(self.show_search_results, key, merge_search_results(local, server, filters), True)
+
+    def show_search_results(self, key, data, append):
+        old_count = len(self.timelines_data.get(key, []))
+        self.timelines_data[key] = data
+        self.index_items(data)
+        self.prefetch_relationships(data)
+        # Play search_updated sound when a search timeline refreshes with new results
+        if len(data) > old_count and search_updatedsnd: search_updatedsnd.play()
+        if self.current_timeline_key() != key: return
+        # Server results are appended after the local ones, so rows already on screen keep their places.
+        if not append: self.posts_list.Clear()
+        for item in data[self.posts_list.GetItemCount():]:
+            row, avatar_url = self.row_from_status(item)
+            if row:
+                self.posts_list.Append(row, avatar_url)
+                self.queue_avatar_download(avatar_url)
+
+    def load_timeline(self, timeline, last_read_id=None):
+        if timeline.startswith("search:"):
+            return self.load_search(timeline)
+        if timeline == "mentions":
+            return self.load_timeline("notifications")
         wx.CallAfter(self.posts_list.Clear)
         try:
-            if timeline == "home": data = self.mastodon.timeline_home(limit=40)
-            elif timeline == "local": data = self.mastodon.timeline_local(limit=40)
-            elif timeline == "federated": data = self.mastodon.timeline_public(limit=40)
-            elif timeline == "sent": data = [s for s in self.mastodon.account_statuses(self.me["id"], limit=40) if not s.get("reblog")]
-            elif timeline == "direct_messages":
-                convos = self.mastodon.conversations(limit=40)
-                data = [c.get("last_status") for c in convos if c.get("last_status")]
-            elif timeline == "favourites": data = self.mastodon.favourites(limit=40)
-            elif timeline == "bookmarks": data = self.mastodon.bookmarks(limit=40)
-            elif timeline == "notifications": data = fetch_notifications(self.mastodon, limit=40)
-            elif timeline == "mentions": data = [n["status"] for n in fetch_notifications(self.mastodon, types=["mention"], limit=40) if n.get("status")]
-            elif timeline.startswith("user:"): data = fetch_account_statuses(self.mastodon, timeline.split(":", 1)[1], exclude_direct=True, limit=40)
-            elif timeline.startswith("search:"): data = search_v2(self.mastodon, timeline.split(":", 1)[1], type="statuses").get("statuses", [])
-            elif timeline.startswith("hashtag:"): data = self.mastodon.timeline_hashtag(timeline.split(":", 1)[1], limit=40)
-            elif timeline.startswith("list:"): data = self.mastodon.timeline_list(timeline.split(":", 1)[1], limit=40)
-            else: data = []
+            source = self.timeline_for(timeline)
+            loaded = (source.load_since(last_read_id) if last_read_id else source.load()) if source else []
+            data = self.filters.apply(loaded, timeline_context(timeline))
             
-            old_count = len(self.timelines_data.get(timeline, []))
             self.timelines_data[timeline] = data
-            
-            # Play search_updated sound when a search timeline refreshes with new results
-            if timeline.startswith("search:") and len(data) > old_count:
-                if search_updatedsnd: wx.CallAfter(lambda: search_updatedsnd.play())
+            self.hydrator.mark_fresh(data)
+            self.index_items(data)
+            self.prefetch_relationships(data)
+            wx.CallAfter(self.schedule_hydrate)
+            if timeline == "notifications": self.derive_mentions(data, source)
 
             if self.timeline_tree.GetSelection() == self.timeline_nodes.get(timeline):
+                if timeline.startswith("thread:"):
+                    wx.CallAfter(self.render_thread_rows, timeline)
+                    return
                 for item in data:
                     row, avatar_url = (self.row_from_notification(item) if timeline == "notifications" else self.row_from_status(item))
                     if row: 
                         wx.CallAfter(self.posts_list.Append, row, avatar_url)
                         self.queue_avatar_download(avatar_url)
+                if last_read_id: wx.CallAfter(self.select_first_unread, timeline)
+            if timeline in ("home", "direct_messages"): wx.CallAfter(self.show_unread, timeline)
 
         except Exception as e: 
             wx.MessageBox(f"Failed to load timeline: {e}", "Error")
 
+    def derive_mentions(self, notifications, source):
+        """Rebuilds mentions from freshly loaded notifications; only mentions older than those are fetched on their own."""
+        self.timelines_data["mentions"] = mention_statuses(notifications)
+        self.mentions_backfilled = False
+        self.timeline_for("mentions").start_after(source.next_max_id if source else None)
+        if self.timeline_tree.GetSelection() == self.timeline_nodes["mentions"]: wx.CallAfter(self.on_timeline_selected, None)
+
+    def load_marked_timelines(self):
+        """Loads home and notifications from where reading stopped, taking the newer of the saved and the server's markers."""
+        if self.mastodon:
+            try:
+                self.read_positions.merge(fetch_markers(self.mastodon, MARKER_TIMELINES) or {})
+            except Exception:
+                pass
+        for key in MARKER_TIMELINES:
+            threading.Thread(target=lambda k=key: self.load_timeline(k, self.read_positions.get(k)), daemon=True).start()
+
+    def select_first_unread(self, timeline):
+        """Puts the cursor on the oldest unread row so reading picks up where it stopped."""
+        if self.current_timeline_key() != timeline: return
+        index = unread_count(self.timelines_data.get(timeline), self.read_positions.get(timeline)) - 1
+        if 0 <= index < self.posts_list.GetItemCount():
+            self.posts_list.Select(index)
+            self.posts_list.Focus(index)
+
+    def show_unread(self, timeline):
+        """Relabels home (posts past the read marker) or direct messages (unread conversations) with its unread count."""
+        # Notifications and mentions get their counts from the server's poller instead.
+        items = self.timelines_data.get(timeline)
+        if timeline == "direct_messages":
+            count = self.conversations.unread_total(items)
+        else:
+            count = unread_count(items, self.read_positions.get(timeline))
+        self.timeline_tree.SetItemText(self.timeline_nodes[timeline], unread_label(UNREAD_NODE_LABELS[timeline], count))
+
+    def mark_read(self, timeline, item):
+        """Moves the read marker up to item; it is saved locally once reading pauses briefly and sent to the server after a few seconds."""
+        if not self.read_positions.advance(timeline, item.get("id")): return
+        if timeline == "home": self.show_unread("home")
+        if self.marker_local_save_call and self.marker_local_save_call.IsRunning(): self.marker_local_save_call.Stop()
+        self.marker_local_save_call = wx.CallLater(MARKER_LOCAL_SAVE_DELAY, self.save_local_read_positions)
+        if self.marker_save_call and self.marker_save_call.IsRunning(): self.marker_save_call.Stop()
+        self.marker_save_call = wx.CallLater(MARKER_SAVE_DELAY, self.save_read_positions)
+
+    def load_read_positions(self):
+        try:
+            return json.loads(EasySettings("thrive.ini").get("read_markers", "{}"))
+        except (TypeError, ValueError):
+            return {}
+
+    def save_local_read_positions(self):
+        EasySettings("thrive.ini").setsave("read_markers", json.dumps(self.read_positions.positions))
+
+    def save_read_positions(self):
+        """Sends the read markers that moved to the server."""
+        pending = self.read_positions.take_pending()
+        if not pending or not self.mastodon: return
+        BackgroundTask(lambda: save_markers(self.mastodon, pending), lambda result: None, lambda ex: self.read_positions.mark_unsaved(pending), wx.CallAfter).start()
+
+    def on_close(self, event):
+        """Saves read markers still waiting on their delays, giving the server a few seconds before the window goes."""
+        if self.marker_local_save_call and self.marker_local_save_call.IsRunning():
+            self.marker_local_save_call.Stop()
+            self.save_local_read_positions()
+        if self.marker_save_call and self.marker_save_call.IsRunning(): self.marker_save_call.Stop()
+        pending = self.read_positions.take_pending()
+        if pending and self.mastodon:
+            def send():
+                try:
+                    save_markers(self.mastodon, pending)
+                except Exception:
+                    pass
+            sender = threading.Thread(target=send, daemon=True)
+            sender.start()
+            sender.join(MARKER_CLOSE_TIMEOUT)
+        event.Skip()
+
     def on_timeline_selected(self, event):
-        for key, node in self.timeline_nodes.items():
-            if event.GetItem() == node:
-                self.posts_list.Clear()
-                for item in self.timelines_data.get(key, []):
-                    row, avatar_url = (self.row_from_notification(item) if key == "notifications" else self.row_from_status(item))
-                    if row: 
-                        self.posts_list.Append(row, avatar_url)
-                        self.queue_avatar_download(avatar_url)
-                break
+        key = self.current_timeline_key(event.GetItem() if event else None)
+        if not key: return
+        if key.startswith("thread:"):
+            self.render_thread_rows(key)
+            return
+        self.posts_list.Clear()
+        for item in self.timelines_data.get(key, []):
+            row, avatar_url = (self.row_from_notification(item) if key == "notifications" else self.row_from_status(item))
+            if row: 
+                self.posts_list.Append(row, avatar_url)
+                self.queue_avatar_download(avatar_url)
+        self.schedule_hydrate()
 
     def on_refresh(self, event):
-        for key, node in self.timeline_nodes.items():
-            if self.timeline_tree.GetSelection() == node:
-                threading.Thread(target=self.load_timeline, args=(key,), daemon=True).start()
-                break
+        key = self.current_timeline_key()
+        if key:
+            threading.Thread(target=self.load_timeline, args=(key,), daemon=True).start()
+
+    def fetch_account(self, account_id):
+        account = self.account_cache.get(account_id)
+        if account is None:
+            account = self.account_cache.set(account_id, self.mastodon.account(account_id))
+        return account
+
+    def fetch_context(self, status_id):
+        context = self.context_cache.get(status_id)
+        if context is None:
+            context = self.context_cache.set(status_id, self.mastodon.status_context(status_id))
+        self.reply_index.add_context(context)
+        return context
+
+    def known_thread(self, source):
+        self.reply_index.add(source)
+        ancestors, descendants = self.reply_index.thread(source['id'])
+        return ancestors + [self.reply_index.get(source['id']) or source] + descendants
+
+    def prefetch_for_status(self, status):
+        source = status.get('reblog') or status
+        account_ids = [account['id'] for account in (source.get('account'), status.get('account')) if account]
+        account_ids = list(dict.fromkeys(account_ids))
+        jobs = []
+        if source.get('id') is not None and self.context_cache.get(source['id']) is None:
+            jobs.append(lambda: self.fetch_context(source['id']))
+        if any(self.account_cache.get(account_id) is None for account_id in account_ids):
+            jobs.append(lambda: self.account_cache.fetch(self.mastodon, account_ids))
+        if self.relationships.missing(account_ids):
+            jobs.append(lambda: self.relationships.fetch(self.mastodon, account_ids))
+        self.prefetcher.schedule(jobs)
 
     def on_post_selected(self, event):
+        key = self.current_timeline_key()
+        selection = self.posts_list.GetSelection()
+        items = self.timelines_data.get(key, [])
+        if 0 <= selection < len(items):
+            if key in MARKER_TIMELINES: self.mark_read(key, items[selection])
+            elif key == "direct_messages": self.mark_conversation_read(items[selection])
         status, _ = self.get_selected_status()
-        if not status: event.Skip(); return
+        if not status: self.prefetcher.cancel(); event.Skip(); return
+        self.prefetch_for_status(status)
+        self.schedule_hydrate()
         source_status = status.get('reblog') or status
         if pollsnd and source_status.get('poll'): pollsnd.stop(); pollsnd.play()
         elif select_mentionsnd and self.me and any(m.get('id') == self.me.get('id') for m in source_status.get('mentions', [])): select_mentionsnd.stop(); select_mentionsnd.play()
@@ -3252,18 +4071,18 @@ Description:
     def load_sounds(self): load_sounds_globally()
 
     def format_notification_for_display(self, notification):
-        ntype, account = notification.get("type"), notification.get("account", {})
+        ntype = notification.get("type")
         fallback = notification.get("fallback") or {}
         if fallback:
             title = strip_html(fallback.get("title", "") or "").strip()
             summary = strip_html(fallback.get("summary", "") or "").strip()
             details = strip_html(fallback.get("details", "") or "").strip()
             return ": ".join(part for part in [title, summary, details] if part) or f"Unsupported notification: {ntype}"
-        user = account.get("display_name") or account.get("username", "Unknown")
+        user = group_actor_label(notification)
         status = notification.get("status")
         content = ""
         if status:
-            content = strip_html((status.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', '\n\n')).strip()
+            content = status_text(status)
         
         if ntype == "favourite" and status: return f"{user} favourited your post: {content}"
         if ntype == "favourite": return f"{user} favourited a post that is no longer available."
@@ -3283,14 +4102,66 @@ Description:
         if ntype == "collection_update": return f"{user} updated a collection you are featured in."
         return f"{user}: {ntype}"
 
+    def load_row_templates(self):
+        """Compiles the configured post and notification row templates, falling back to the default layout."""
+        conf = EasySettings("thrive.ini")
+        source = lambda s: s.get('reblog') or s
+        status_fields = {
+            "author": lambda s: s['account'].get('display_name') or s['account'].get('username'),
+            "handle": lambda s: s['account'].get('acct'),
+            "content": lambda s: derived_text.get(s, "row_content", self.status_content_cell),
+            "text": lambda s: status_text(source(s)),
+            "cw": lambda s: source(s).get('spoiler_text'),
+            "media": lambda s: self.media_summary(source(s)),
+            "poll": lambda s: "Poll" if source(s).get('poll') else "",
+            "time": lambda s: self.format_time(source(s).get('created_at')),
+            "client": lambda s: self.get_app_name(source(s)),
+            "replies": lambda s: source(s).get('replies_count'),
+            "boosts": lambda s: source(s).get('reblogs_count'),
+            "favourites": lambda s: source(s).get('favourites_count'),
+            "visibility": lambda s: source(s).get('visibility'),
+        }
+        # Notification rows split the display sentence once; fields read from (notification, author part, content part).
+        notification_fields = {
+            "author": lambda n: n[1],
+            "content": lambda n: n[2],
+            "type": lambda n: n[0].get('type'),
+            "time": lambda n: self.format_time(n[0].get('created_at')),
+            "client": lambda n: self.get_app_name(n[0].get('status') or {}),
+        }
+        templates = {}
+        for name, fields, prepare in (("status_row_template", status_fields, None), ("notification_row_template", notification_fields, self.notification_parts)):
+            try:
+                templates[name] = RowTemplate(conf.get(name, DEFAULT_ROW_TEMPLATE), fields, prepare)
+            except RowTemplateError:
+                templates[name] = RowTemplate(DEFAULT_ROW_TEMPLATE, fields, prepare)
+        self.status_row = templates["status_row_template"]
+        self.notification_row = templates["notification_row_template"]
+
+    def media_summary(self, status):
+        counts = {}
+        for att in status.get('media_attachments') or []:
+            kind = {"gifv": "GIF", "unknown": "attachment"}.get(att.get('type'), att.get('type') or "attachment")
+            counts[kind] = counts.get(kind, 0) + 1
+        return ", ".join(f"{count} {kind}{'' if count == 1 else 's'}" for kind, count in counts.items())
+
+    def notification_parts(self, notification):
+        author_part, _, content_part = self.format_notification_for_display(notification).partition(':')
+        return notification, author_part, content_part.strip()
+
     def row_from_status(self, status):
         if not status: return None, None
-        is_boost = bool(status.get('reblog'))
-        source_obj = status['reblog'] if is_boost else status
         account = status['account']
         avatar_url = account.get('avatar_static') if self.show_avatars else None
-        author_cell = account.get('display_name') or account.get('username')
-        content = strip_html((source_obj.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', '\n\n')).strip()
+        return self.status_row(status), avatar_url
+
+    def status_content_cell(self, status):
+        is_boost = bool(status.get('reblog'))
+        source_obj = status['reblog'] if is_boost else status
+        author_cell = status['account'].get('display_name') or status['account'].get('username')
+        # Quote detection and the RE:/QT: URL stripping are worked out once per status in post_rendering.
+        quote = status_quote(source_obj)
+        content = quote["text"]
         
         if is_boost:
             original_author = source_obj['account']
@@ -3301,41 +4172,21 @@ Description:
         else:
             content_cell = f"CW: {status['spoiler_text']}" if status.get('spoiler_text') else content
 
-        # Detect quote posts
-        quote_obj = source_obj.get('quote')
-        if quote_obj:
-            quoted_status = quote_obj.get('quoted_status') if isinstance(quote_obj, dict) else getattr(quote_obj, 'quoted_status', None)
-            if quoted_status:
-                quoted_author = quoted_status.get('account', {})
-                quoted_display = quoted_author.get('display_name') or quoted_author.get('username') or ''
-                quoted_handle = quoted_author.get('acct', '')
-                quoted_content = strip_html((quoted_status.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', '\n\n')).strip()
-                # Strip server-prepended RE: <url> or QT: <url> from content
-                quoted_url = quoted_status.get('url') or quoted_status.get('uri') or ''
-                if quoted_url:
-                    content_cell = re.sub(r'^(?:RE|QT):\s*' + re.escape(quoted_url) + r'\s*', '', content_cell).strip()
-                    content_cell = content_cell.rstrip().removesuffix(quoted_url).rstrip()
-                content_cell = f"quoting {quoted_display} (@{quoted_handle}): \"{quoted_content}\". {author_cell} added \"{content_cell}\""
+        quoted_status = quote["quoted_status"]
+        if quoted_status:
+            quoted_author = quoted_status.get('account', {})
+            quoted_display = quoted_author.get('display_name') or quoted_author.get('username') or ''
+            quoted_handle = quoted_author.get('acct', '')
+            quoted_content = status_text(quoted_status)
+            content_cell = f"quoting {quoted_display} (@{quoted_handle}): \"{quoted_content}\". {author_cell} added \"{content_cell}\""
 
         if source_obj.get('poll'): content_cell += " [Poll]"
-        time_cell = self.format_time(source_obj.get('created_at')) or ''
-        client_cell = self.get_app_name(source_obj) or ''
-        
-        return [author_cell or '', content_cell or '', time_cell, client_cell], avatar_url
+        return content_cell
 
     def row_from_notification(self, notification):
         account = notification.get('account', {})
         avatar_url = account.get('avatar_static') if self.show_avatars else None
-        display_text = self.format_notification_for_display(notification)
-        status = notification.get('status') or {}
-        time_cell = self.format_time(notification.get('created_at'))
-        client_cell = self.get_app_name(status)
-        
-        parts = display_text.split(':', 1)
-        author_part = parts[0]
-        content_part = parts[1].strip() if len(parts) > 1 else ''
-
-        return [author_part, content_part, time_cell, client_cell], avatar_url
+        return self.notification_row(notification), avatar_url
 
     def show_post_details(self):
         status, _ = self.get_selected_status()
@@ -3354,4 +4205,19 @@ Description:
 
     def format_time(self, created_at):
         if not created_at: return ''
-        return singularize_time(get_time_ago(created_at))
+        return relative_label(created_at)
+
+    def refresh_visible_times(self, event=None):
+        """Rewrites the Time cell of on-screen rows whose relative-time bucket has moved on."""
+        key = self.current_timeline_key()
+        items = self.timelines_data.get(key) if key else None
+        if not items: return
+        count = min(self.posts_list.GetItemCount(), len(items))
+        top = max(self.posts_list.GetTopItem(), 0)
+        template = self.notification_row if key == "notifications" else self.status_row
+        columns = template.columns_with("time")
+        if not columns: return
+        for row in range(top, min(top + self.posts_list.GetCountPerPage() + 1, count)):
+            for column, text in template.render_columns(items[row], columns).items():
+                if text != self.posts_list.GetItemText(row, column):
+                    self.posts_list.SetItem(row, column, text)
@@ -0,0 +1,85 @@
+import threading
+
+# Timelines the markers API keeps a read position for.
+MARKER_TIMELINES = ("home", "notifications")
+# Milliseconds of reading without moving the position before it is sent to the server.
+MARKER_SAVE_DELAY = 5000
+# Milliseconds of the same before the position is written to thrive.ini, so a held arrow key writes once.
+MARKER_LOCAL_SAVE_DELAY = 500
+# Seconds closing the window waits for the last markers to reach the server.
+MARKER_CLOSE_TIMEOUT = 3
+
+
+def id_newer(a, b):
+	"""True if id a sorts after id b. Mastodon ids are numeric strings of growing length."""
+	a, b = str(a), str(b)
+	if a.isdigit() and b.isdigit():
+		return (len(a), a) > (len(b), b)
+	return a > b
+
+
+def unread_count(items, last_read_id):
+	"""Loaded items newer than the read position; items are newest first, so counting stops at the first read one."""
+	if last_read_id is None:
+		return 0
+	count = 0
+	for item in items or []:
+		if item.get("id") is None or not id_newer(item["id"], last_read_id):
+			break
+		count += 1
+	return count
+
+
+class ReadPositions:
+	"""The last read id per marker timeline, merged from this client, its saved copy and the server.
+
+	Positions only move forward, so a marker saved by another client that read further wins.
+	"""
+
+	def __init__(self, positions=None):
+		self._lock = threading.Lock()
+		self.positions = {}
+		self._dirty = set()
+		self.merge(positions or {})
+
+	def get(self, timeline):
+		with self._lock:
+			return self.positions.get(timeline)
+
+	def merge(self, positions):
+		"""Takes in positions from elsewhere (a saved file or GET /api/v1/markers); ones not ahead of ours are ignored."""
+		with self._lock:
+			for timeline, last_read_id in positions.items():
+				if isinstance(last_read_id, dict):
+					last_read_id = last_read_id.get("last_read_id")
+				if timeline not in MARKER_TIMELINES or last_read_id is None:
+					continue
+				current = self.positions.get(timeline)
+				if current is None or id_newer(last_read_id, current):
+					self.positions[timeline] = str(last_read_id)
+				elif id_newer(current, last_read_id):
+					# Ours is further along than the server's copy, so it still needs sending.
+					self._dirty.add(timeline)
+
+	def advance(self, timeline, item_id):
+		"""Moves a position forward to item_id; returns False if it was already there or further."""
+		if timeline not in MARKER_TIMELINES or item_id is None:
+			return False
+		with self._lock:
+			current = self.positions.get(timeline)
+			if current is not None and not id_newer(item_id, current):
+				return False
+			self.positions[timeline] = str(item_id)
+			self._dirty.add(timeline)
+			return True
+
+	def take_pending(self):
+		"""Positions changed since the last call, to send to the server; put them back with mark_unsaved() if that fails."""
+		with self._lock:
+			pending = {timeline: self.positions[timeline] for timeline in self._dirty}
+			self._dirty.clear()
+			return pending
+
+	def mark_unsaved(self, timelines):
+		with self._lock:
+			self._dirty.update(timelines)
@@ -11,6 +11,9 @@ SUPPORTED_NOTIFICATION_TYPES = [
 	"collection_update",
 ]
 
+# Notification types the server folds into one group per post (or, for follows, per time window).
+GROUPED_NOTIFICATION_TYPES = ["favourite", "reblog", "follow"]
+
 
 def api_request(mastodon, method, endpoint, params=None, use_json=False):
 	params = {key: value for key, value in (params or {}).items() if value is not None}
@@ -34,6 +37,33 @@ def fetch_notifications(mastodon, **params):
 	return api_request(mastodon, "GET", "/api/v1/notifications", params)
 
 
+def fetch_grouped_notifications(mastodon, **params):
+	params["grouped_types[]"] = GROUPED_NOTIFICATION_TYPES
+	return api_request(mastodon, "GET", "/api/v2/notifications", params)
+
+
+def fetch_notification_group_accounts(mastodon, group_key, **params):
+	return api_request(mastodon, "GET", f"/api/v2/notifications/{group_key}/accounts", params)
+
+
+def dismiss_notification_group(mastodon, group_key):
+	return api_request(mastodon, "POST", f"/api/v2/notifications/{group_key}/dismiss")
+
+
+def fetch_unread_count(mastodon, types=None):
+	params = {"types[]": list(types)} if types else {}
+	return (api_request(mastodon, "GET", "/api/v1/notifications/unread_count", params) or {}).get("count", 0)
+
+
+def fetch_markers(mastodon, timelines):
+	return api_request(mastodon, "GET", "/api/v1/markers", {"timeline[]": list(timelines)})
+
+
+def save_markers(mastodon, positions):
+	"""positions maps "home"/"notifications" to the id of the last item read there."""
+	return api_request(mastodon, "POST", "/api/v1/markers", {timeline: {"last_read_id": last_read_id} for timeline, last_read_id in positions.items()}, use_json=True)
+
+
 def fetch_notification_policy(mastodon):
 	return api_request(mastodon, "GET", "/api/v2/notifications/policy")
 
@@ -47,11 +77,27 @@ def search_v2(mastodon, query, **params):
 	return api_request(mastodon, "GET", "/api/v2/search", params)
 
 
+def fetch_statuses(mastodon, status_ids):
+	return api_request(mastodon, "GET", "/api/v1/statuses", {"id[]": list(status_ids)})
+
+
+def fetch_accounts(mastodon, account_ids):
+	return api_request(mastodon, "GET", "/api/v1/accounts", {"id[]": list(account_ids)})
+
+
 def fetch_account_statuses(mastodon, account_id, exclude_direct=False, **params):
 	params["exclude_direct"] = exclude_direct
 	return api_request(mastodon, "GET", f"/api/v1/accounts/{account_id}/statuses", params)
 
 
+def fetch_reblogged_by(mastodon, status_id, **params):
+	return api_request(mastodon, "GET", f"/api/v1/statuses/{status_id}/reblogged_by", params)
+
+
+def fetch_favourited_by(mastodon, status_id, **params):
+	return api_request(mastodon, "GET", f"/api/v1/statuses/{status_id}/favourited_by", params)
+
+
 def fetch_current_profile(mastodon):
 	return api_request(mastodon, "GET", "/api/v1/profile")
 
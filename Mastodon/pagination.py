@@ -0,0 +1,67 @@
+ACCOUNT_PAGE_SIZE = 80
+# Start fetching the next page once the selection is this close to the last loaded row.
+LOAD_MORE_MARGIN = 10
+
+
+def near_end(index, count, margin=LOAD_MORE_MARGIN):
+	return index is not None and index >= 0 and index >= count - margin
+
+
+class AccountPager:
+	"""Accounts from a Link-header paginated endpoint, loaded one page at a time.
+
+	fetch() is safe to call from a worker thread; add_page(), remove() and append()
+	belong to the thread that owns the list control.
+	"""
+
+	def __init__(self, mastodon, fetch_first):
+		self.mastodon = mastodon
+		self.fetch_first = fetch_first
+		self.items = []
+		self.pages = 0
+		self.loading = False
+		self._ids = set()
+		self._last_page = None
+
+	@property
+	def started(self):
+		return self.pages > 0
+
+	@property
+	def has_more(self):
+		if not self.started:
+			return True
+		return getattr(self._last_page, "_pagination_next", None) is not None
+
+	def fetch(self):
+		if not self.started:
+			return self.fetch_first()
+		if not self.has_more:
+			return None
+		return self.mastodon.fetch_next(self._last_page)
+
+	def add_page(self, page):
+		"""Store a fetched page and return the accounts it added."""
+		self.pages += 1
+		self._last_page = page if page else None
+		added = []
+		for account in page or []:
+			account_id = account.get("id")
+			if account_id in self._ids:
+				continue
+			self._ids.add(account_id)
+			added.append(account)
+		self.items.extend(added)
+		return added
+
+	def remove(self, index):
+		account = self.items.pop(index)
+		self._ids.discard(account.get("id"))
+		return account
+
+	def append(self, account):
+		if account.get("id") in self._ids:
+			return False
+		self._ids.add(account.get("id"))
+		self.items.append(account)
+		return True
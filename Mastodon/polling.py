@@ -0,0 +1,91 @@
+import time
+
+# Seconds between polls of a timeline while the stream is down: back to the minimum when a poll
+# brings something new, stretching by half while the timeline stays quiet.
+POLL_MIN_INTERVAL = 20
+POLL_MAX_INTERVAL = 300
+# Milliseconds between checks for timelines that are due a poll.
+POLL_TICK = 5000
+# Seconds before trying the stream again after it drops, doubling on each failure.
+STREAM_RETRY_MIN = 30
+STREAM_RETRY_MAX = 600
+# Polling never spends more than this share of the requests left in the rate-limit window.
+RATE_LIMIT_SHARE = 0.25
+
+
+def rate_limited_interval(remaining, reset_in, timelines, share=RATE_LIMIT_SHARE):
+	"""The shortest interval that keeps polling timelines within share of the remaining requests until the window resets."""
+	if remaining is None or reset_in is None or reset_in <= 0 or timelines <= 0:
+		return 0
+	budget = max(remaining * share, 1)
+	return reset_in * timelines / budget
+
+
+def rate_limit_state(mastodon):
+	"""(requests left, seconds until the window resets) from the headers of the last response, if any."""
+	remaining = getattr(mastodon, "ratelimit_remaining", None)
+	reset = getattr(mastodon, "ratelimit_reset", None)
+	return remaining, (reset - time.time()) if reset is not None else None
+
+
+class PollSchedule:
+	"""When one timeline is next due, stretched while it is quiet and reset when it moves."""
+
+	def __init__(self, min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL):
+		self.min_interval = min_interval
+		self.max_interval = max_interval
+		self.interval = min_interval
+		self.next_at = 0
+
+	def polled(self, new_items, now, floor=0):
+		if new_items:
+			self.interval = self.min_interval
+		else:
+			self.interval = min(self.interval * 1.5, self.max_interval)
+		self.next_at = now + max(self.interval, floor)
+
+
+class RefreshScheduler:
+	"""Decides which timelines to poll while the stream is unavailable and when to try the stream again.
+
+	Polling starts with stream_lost() and stops with stream_alive(); while it runs, due() lists
+	the timelines whose interval has passed. Intervals adapt to each timeline's activity and are
+	never shorter than the rate limit allows for everything being polled.
+	"""
+
+	def __init__(self, timelines, clock=time.monotonic):
+		self.clock = clock
+		self.schedules = {key: PollSchedule() for key in timelines}
+		self.polling = False
+		self.retry_delay = STREAM_RETRY_MIN
+
+	def stream_lost(self):
+		"""Switches to polling with every timeline due now; returns seconds to wait before reconnecting."""
+		delay = self.retry_delay if self.polling else STREAM_RETRY_MIN
+		self.retry_delay = min(delay * 2, STREAM_RETRY_MAX)
+		if not self.polling:
+			self.polling = True
+			for schedule in self.schedules.values():
+				schedule.interval = schedule.min_interval
+				schedule.next_at = 0
+		return delay
+
+	def stream_alive(self):
+		"""Returns True if this ends a spell of polling."""
+		was_polling, self.polling = self.polling, False
+		self.retry_delay = STREAM_RETRY_MIN
+		return was_polling
+
+	def due(self):
+		"""Timelines to poll now; each stays off the list until polled() reports back on it."""
+		if not self.polling:
+			return []
+		now = self.clock()
+		keys = [key for key, schedule in self.schedules.items() if schedule.next_at <= now]
+		for key in keys:
+			self.schedules[key].next_at = float("inf")
+		return keys
+
+	def polled(self, key, new_items, remaining=None, reset_in=None):
+		floor = rate_limited_interval(remaining, reset_in, len(self.schedules))
+		self.schedules[key].polled(new_items, self.clock(), floor)
@@ -1,10 +1,10 @@
 import wx
 import os
-import re
 import webbrowser
-from utils import strip_html
-from post_rendering import build_status_body_html, status_plain_text
+from post_rendering import build_status_body_html, status_body_html, status_links, status_plain_text, status_snippet
 from profile_dialog import ViewProfileDialog
+from tasks import TaskGroup
+from threads import chunk_bounds
 from sound_lib import stream
 from sound_lib import output as o
 from sound_lib.main import BassError
@@ -172,6 +172,9 @@ class PostDetailsDialog(wx.Dialog):
 		acct = account.get("acct", "")
 		super().__init__(parent, title=f"View Post from {display_name} ({acct}) dialog", size=(600, 500))
 		self.mastodon = mastodon
+		self.fetch_context = getattr(parent, "fetch_context", None) or mastodon.status_context
+		self.known_thread = getattr(parent, "known_thread", None)
+		self.attach_completion = getattr(parent, "attach_completion", None)
 		self.status = status["reblog"] if status.get("reblog") else status
 		self.me = me_account
 		self.account = account
@@ -179,27 +182,7 @@ class PostDetailsDialog(wx.Dialog):
 		self.privacy_options = ["Public", "Unlisted", "Followers-only", "Direct"]
 		self.privacy_values = ["public", "unlisted", "private", "direct"]
 		
-		# --- Robust Link Extraction ---
-		HREF_REGEX = re.compile(r'<a\s[^>]*?href="([^"]*)"', re.IGNORECASE)
-		URL_REGEX = re.compile(r'(?:https?://|www\.)[^\s<>"]+')
-
-		# 1. Extract from href attributes first, as they are definitive
-		href_links = HREF_REGEX.findall(self.status.get("content", ""))
-		
-		# 2. Then find bare links in the text
-		content_text = strip_html(self.status.get("content", ""))
-		bare_links = URL_REGEX.findall(content_text)
-
-		# 3. Combine, deduplicate, and clean
-		raw_links = list(dict.fromkeys(href_links + bare_links))
-		cleaned_links = []
-		for link in raw_links:
-			# Remove common trailing punctuation
-			cleaned_link = link.rstrip('.,;:!?')
-			# Simple validation: must have a dot and not end with one after cleaning
-			if '.' in cleaned_link and not cleaned_link.endswith('.'):
-				cleaned_links.append(cleaned_link)
-		self.links = cleaned_links
+		self.links = status_links(self.status)
 		
 		self.panel = wx.Panel(self)
 		
@@ -230,7 +213,7 @@ class PostDetailsDialog(wx.Dialog):
 			escape_to_close=True,
 			on_close=self.close_from_webview,
 			open_links_externally=True,
-			initial_html=build_status_body_html(self.status),
+			initial_html=status_body_html(self.status),
 			styles=POST_WEBVIEW_STYLES,
 		)
 
@@ -323,7 +306,7 @@ Language: {language}"""
 		self.thread_button.Bind(wx.EVT_BUTTON, self.on_view_thread)
 		self.links_button.Bind(wx.EVT_BUTTON, self.on_view_links)
 		self.take_down_button.Bind(wx.EVT_BUTTON, self.on_take_down)
-		self.profile_button.Bind(wx.EVT_BUTTON, lambda e: ViewProfileDialog(self, self.account, self.mastodon, self.me).ShowModal())
+		self.profile_button.Bind(wx.EVT_BUTTON, lambda e: ViewProfileDialog(self, self.account, self.mastodon, self.me, getattr(parent, 'relationships', None)).ShowModal())
 
 
 		btns = wx.BoxSizer(wx.HORIZONTAL)
@@ -485,6 +468,7 @@ Language: {language}"""
 		vbox = wx.BoxSizer(wx.VERTICAL)
 		label = wx.StaticText(panel, label="&Reply")
 		self.reply_text = wx.TextCtrl(panel, style=wx.TE_MULTILINE, size=(480, 100))
+		if self.attach_completion: self.attach_completion(self.reply_text)
 		self.reply_text.SetValue(self.reply_users.strip() + " " if self.reply_users.strip() else "")
 		self.reply_text.SetInsertionPoint(len(self.reply_text.GetValue()))
 		privacy_label = wx.StaticText(panel, label="P&rivacy:")
@@ -612,30 +596,64 @@ Language: {language}"""
 		else:
 			wx.MessageBox("No URL available.", "Error")
 
+	def _thread_label(self, post):
+		author = post['account'].get('display_name') or post['account'].get('username', '')
+		content = status_snippet(post)[:200]
+		prefix = ">>> " if post['id'] == self.status['id'] else ""
+		return f"{prefix}{author}: {content}"
+
 	def on_view_thread(self, event):
-		try:
-			context = self.mastodon.status_context(self.status['id'])
-			ancestors = context.get('ancestors', [])
-			descendants = context.get('descendants', [])
-			thread = ancestors + [self.status] + descendants
-			# Display thread in a simple dialog
-			dlg = wx.Dialog(self, title="Thread View", size=(600, 500))
-			panel = wx.Panel(dlg)
-			sizer = wx.BoxSizer(wx.VERTICAL)
-			thread_list = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 350))
-			for i, post in enumerate(thread):
-				author = post['account'].get('display_name') or post['account'].get('username', '')
-				content = strip_html((post.get('content', '') or '').replace('<br />', '\n').replace('<br>', '\n').replace('</p>', ' ')).strip()[:200]
-				prefix = ">>> " if post['id'] == self.status['id'] else ""
-				thread_list.Append(f"{prefix}{author}: {content}")
-			sizer.Add(thread_list, 1, wx.EXPAND | wx.ALL, 10)
-			close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
-			sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
-			panel.SetSizer(sizer)
-			dlg.ShowModal()
-			dlg.Destroy()
-		except Exception as e:
-			wx.MessageBox(f"Error loading thread: {e}", "Thread Error")
+		# Display thread in a simple dialog
+		dlg = wx.Dialog(self, title="Thread View", size=(600, 500))
+		panel = wx.Panel(dlg)
+		sizer = wx.BoxSizer(wx.VERTICAL)
+		thread_list = wx.ListBox(panel, style=wx.LB_SINGLE, size=(-1, 350))
+		sizer.Add(thread_list, 1, wx.EXPAND | wx.ALL, 10)
+		close_btn = wx.Button(panel, id=wx.ID_CANCEL, label="&Close")
+		sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+		panel.SetSizer(sizer)
+		shown = []
+		state = {"generation": 0, "closed": False}
+
+		def append_rest(bounds, generation):
+			# Long threads are added a chunk per event-loop turn so the dialog stays responsive.
+			if state["closed"] or generation != state["generation"]: return
+			start, end = bounds[0]
+			thread_list.Append([self._thread_label(post) for post in shown[start:end]])
+			if len(bounds) > 1:
+				wx.CallAfter(append_rest, bounds[1:], generation)
+
+		def show(thread):
+			selected = thread_list.GetSelection()
+			selected_id = shown[selected]['id'] if selected != wx.NOT_FOUND and selected < len(shown) else self.status['id']
+			shown[:] = thread
+			ids = [post['id'] for post in thread]
+			focus = ids.index(selected_id) if selected_id in ids else 0
+			bounds = chunk_bounds(len(thread), focus + 1)
+			state["generation"] += 1
+			first_end = bounds[0][1] if bounds else 0
+			thread_list.Set([self._thread_label(post) for post in thread[:first_end]])
+			if selected_id in ids:
+				thread_list.SetSelection(focus)
+			if len(bounds) > 1:
+				wx.CallAfter(append_rest, bounds[1:], state["generation"])
+
+		def on_context(context):
+			if self.known_thread:
+				show(self.known_thread(self.status))
+			else:
+				show(context.get('ancestors', []) + [self.status] + context.get('descendants', []))
+
+		def on_failed(ex):
+			wx.MessageBox(f"Error loading thread: {ex}", "Thread Error")
+
+		show(self.known_thread(self.status) if self.known_thread else [self.status])
+		tasks = TaskGroup(wx.CallAfter)
+		tasks.run(lambda: self.fetch_context(self.status['id']), on_context, on_failed)
+		dlg.ShowModal()
+		tasks.cancel()
+		state["closed"] = True
+		dlg.Destroy()
 
 	def on_edit(self, event):
 		content = status_plain_text(self.status)
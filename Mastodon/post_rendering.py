@@ -1,15 +1,66 @@
 import html
 import re
-
-from utils import strip_html
+import threading
+from collections import OrderedDict
 
 
 HREF_QUOTE = r'["\']'
+QUOTE_PREFIX_REGEX = re.compile(r"(?:RE|QT):\s*")
+HTML_QUOTE_PREFIX_REGEX = re.compile(r"^\s*(<p\b[^>]*>\s*)?(?:RE|QT):\s*", re.IGNORECASE)
+LINK_REGEX = re.compile(r"<a\b[^>]*\bhref=" + HREF_QUOTE + r"([^\"']*)" + HREF_QUOTE + r"[^>]*>.*?</a>", re.IGNORECASE | re.DOTALL)
+EMPTY_PARAGRAPH_REGEX = re.compile(r"<p\b[^>]*>\s*</p>", re.IGNORECASE)
+SPACE_BEFORE_PARAGRAPH_END_REGEX = re.compile(r"\s+</p>")
+HREF_REGEX = re.compile(r'<a\s[^>]*?href="([^"]*)"', re.IGNORECASE)
+URL_REGEX = re.compile(r'(?:https?://|www\.)[^\s<>"]+')
+DERIVED_TEXT_LIMIT = 5000
+
+
+# Group 1 is the tag name with its leading "/" for closing tags; attributes are matched but discarded.
+# Attributes must start with a character the name cannot contain, so an unclosed "<" followed by a
+# long word fails in one pass instead of retrying every split between name and attributes.
+_TAG_RE = re.compile(r"<(/?[A-Za-z0-9]*)(?:[^<>A-Za-z0-9][^<>]*)?>")
+
+
+class _TagText(dict):
+	"""Text each tag turns into, memoised per tag name."""
+
+	def __init__(self, paragraph_break):
+		super().__init__()
+		self.paragraph_break = paragraph_break
 
+	def __missing__(self, name):
+		lowered = name.lower()
+		if lowered in ("br", "/br"):
+			text = "\n"
+		elif lowered == "/p":
+			text = self.paragraph_break
+		else:
+			text = ""
+		self[name] = text
+		return text
 
-def html_to_plain_text(content_html):
-	processed_html = (content_html or "").replace("<br />", "\n").replace("<br>", "\n").replace("</p>", "\n\n")
-	return strip_html(processed_html).strip()
+
+_TAG_TEXT = {}
+
+
+def html_to_plain_text(content_html, paragraph_break="\n\n"):
+	"""Convert post HTML to text in a single tokenising pass.
+
+	Line breaks become newlines and closing paragraphs become paragraph_break. Every
+	other tag is dropped but its text is kept, so mentions read "@user" and links
+	show their full URL. Entities are decoded once at the end.
+	"""
+	text = content_html or ""
+	if "<" in text:
+		table = _TAG_TEXT.get(paragraph_break)
+		if table is None:
+			table = _TAG_TEXT.setdefault(paragraph_break, _TagText(paragraph_break))
+		parts = _TAG_RE.split(text)
+		parts[1::2] = map(table.__getitem__, parts[1::2])
+		text = "".join(parts)
+	if "&" in text:
+		text = html.unescape(text)
+	return text.strip()
 
 
 def get_quoted_status(status):
@@ -30,39 +81,57 @@ def quote_url_for_status(quoted_status):
 def strip_quote_url_from_text(content, quoted_url):
 	if not quoted_url:
 		return content.strip()
-	content = re.sub(r"^(?:RE|QT):\s*" + re.escape(quoted_url) + r"\s*", "", content).strip()
-	return content.rstrip().removesuffix(quoted_url).rstrip()
+	prefix = QUOTE_PREFIX_REGEX.match(content)
+	if prefix and content.startswith(quoted_url, prefix.end()):
+		content = content[prefix.end() + len(quoted_url):]
+	return content.strip().removesuffix(quoted_url).rstrip()
 
 
 def strip_quote_url_from_html(content_html, quoted_url):
+	content_html = content_html or ""
 	if not quoted_url:
-		return content_html or ""
+		return content_html
+	escaped_url = html.escape(quoted_url)
+	# Most quote posts never repeat the URL, and a substring test settles that without parsing.
+	if quoted_url not in content_html and escaped_url not in content_html:
+		return content_html
 
 	plain = html_to_plain_text(content_html)
 	cleaned_plain = strip_quote_url_from_text(plain, quoted_url)
 	if cleaned_plain == plain:
-		return content_html or ""
-
-	cleaned_html = content_html or ""
-	cleaned_html = re.sub(r"^\s*(<p\b[^>]*>\s*)?(?:RE|QT):\s*", lambda m: m.group(1) or "", cleaned_html, count=1, flags=re.IGNORECASE)
+		return content_html
 
-	link_pattern = (
-		r"<a\b[^>]*\bhref="
-		+ HREF_QUOTE
-		+ re.escape(quoted_url)
-		+ HREF_QUOTE
-		+ r"[^>]*>.*?</a>"
-	)
-	cleaned_html = re.sub(link_pattern, "", cleaned_html, count=1, flags=re.IGNORECASE | re.DOTALL)
+	cleaned_html = HTML_QUOTE_PREFIX_REGEX.sub(lambda m: m.group(1) or "", content_html, count=1)
+	for link in LINK_REGEX.finditer(cleaned_html):
+		if html.unescape(link.group(1)) == quoted_url:
+			cleaned_html = cleaned_html[:link.start()] + cleaned_html[link.end():]
+			break
 
-	for url_text in (quoted_url, html.escape(quoted_url), html.escape(quoted_url, quote=True)):
+	for url_text in dict.fromkeys((quoted_url, escaped_url)):
 		cleaned_html = cleaned_html.replace(url_text, "", 1)
 
-	cleaned_html = re.sub(r"<p\b[^>]*>\s*</p>", "", cleaned_html, flags=re.IGNORECASE)
-	cleaned_html = re.sub(r"\s+</p>", "</p>", cleaned_html)
+	cleaned_html = EMPTY_PARAGRAPH_REGEX.sub("", cleaned_html)
+	cleaned_html = SPACE_BEFORE_PARAGRAPH_END_REGEX.sub("</p>", cleaned_html)
 	return cleaned_html.strip()
 
 
+def _quote_parts(status):
+	quoted_status = get_quoted_status(status)
+	quoted_url = quote_url_for_status(quoted_status)
+	content_html = status.get("content", "") or ""
+	return {
+		"quoted_status": quoted_status,
+		"quoted_url": quoted_url,
+		"html": strip_quote_url_from_html(content_html, quoted_url),
+		"text": strip_quote_url_from_text(status_text(status), quoted_url),
+	}
+
+
+def status_quote(status):
+	"""The quoted status of a post plus its content with the quote URL removed, worked out once per status."""
+	return derived_text.get(status or {}, "quote", _quote_parts)
+
+
 def account_label(account):
 	account = account or {}
 	display_name = account.get("display_name") or account.get("username") or "Unknown"
@@ -74,10 +143,9 @@ def account_label(account):
 
 def build_status_body_html(status):
 	status = status or {}
-	content_html = status.get("content", "") or ""
-	quoted_status = get_quoted_status(status)
-	quoted_url = quote_url_for_status(quoted_status)
-	content_html = strip_quote_url_from_html(content_html, quoted_url)
+	quote = status_quote(status)
+	quoted_status = quote["quoted_status"]
+	content_html = quote["html"]
 
 	parts = [
 		'<article class="post-content" aria-labelledby="post-content-heading">',
@@ -106,8 +174,89 @@ def build_status_body_html(status):
 
 
 def status_plain_text(status):
-	status = status or {}
-	content = html_to_plain_text(status.get("content", ""))
-	quoted_status = get_quoted_status(status)
-	quoted_url = quote_url_for_status(quoted_status)
-	return strip_quote_url_from_text(content, quoted_url)
+	return status_quote(status)["text"]
+
+
+def extract_links(content_html):
+	# Links from href attributes come first, as they are definitive; bare URLs in the text follow.
+	href_links = HREF_REGEX.findall(content_html or "")
+	bare_links = URL_REGEX.findall(html_to_plain_text(content_html))
+	links = []
+	for link in dict.fromkeys(href_links + bare_links):
+		# Remove common trailing punctuation
+		link = link.rstrip('.,;:!?')
+		# Simple validation: must have a dot and not end with one after cleaning
+		if '.' in link and not link.endswith('.'):
+			links.append(link)
+	return links
+
+
+class DerivedTextCache:
+	"""Bounded LRU of values derived from a status's HTML.
+
+	Entries are keyed by (status id, edited_at), so an edit never serves stale
+	text; invalidate() drops the old versions when an edit arrives.
+	"""
+
+	def __init__(self, limit=DERIVED_TEXT_LIMIT):
+		self.limit = limit
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def key(status):
+		if not status or status.get("id") is None:
+			return None
+		source = status.get("reblog") or status
+		return (str(status["id"]), source.get("edited_at"))
+
+	def get(self, status, name, compute):
+		key = self.key(status)
+		if key is None:
+			return compute(status)
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None and name in entry:
+				self._entries.move_to_end(key)
+				return entry[name]
+		value = compute(status)
+		with self._lock:
+			self._entries.setdefault(key, {})[name] = value
+			self._entries.move_to_end(key)
+			while len(self._entries) > self.limit:
+				self._entries.popitem(last=False)
+		return value
+
+	def invalidate(self, status_id):
+		status_id = str(status_id)
+		with self._lock:
+			for key in [key for key in self._entries if key[0] == status_id]:
+				del self._entries[key]
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+
+	def __len__(self):
+		return len(self._entries)
+
+
+derived_text = DerivedTextCache()
+
+
+def status_text(status):
+	"""Plain text of a status's own content, paragraphs separated by blank lines."""
+	return derived_text.get(status, "text", lambda status: html_to_plain_text(status.get("content", "")))
+
+
+def status_snippet(status):
+	"""Single-paragraph text of a status for one-line listings and searching."""
+	return derived_text.get(status, "snippet", lambda status: html_to_plain_text(status.get("content", ""), paragraph_break=" "))
+
+
+def status_links(status):
+	return derived_text.get(status, "links", lambda status: extract_links(status.get("content", "")))
+
+
+def status_body_html(status):
+	return derived_text.get(status, "body_html", build_status_body_html)
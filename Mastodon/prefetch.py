@@ -0,0 +1,73 @@
+import threading
+import time
+
+
+# How long the selection must stay on a post before anything is fetched for it.
+PREFETCH_DELAY = 0.4
+PREFETCH_REQUESTS_PER_MINUTE = 30
+PREFETCH_MAX_JOBS = 4
+
+
+class RateBudget:
+	"""Token bucket: at most `capacity` requests, refilled evenly over `period` seconds."""
+
+	def __init__(self, capacity, period=60.0, clock=time.monotonic):
+		self.capacity = capacity
+		self.period = period
+		self.clock = clock
+		self.tokens = float(capacity)
+		self.updated = clock()
+		self._lock = threading.Lock()
+
+	def take(self):
+		with self._lock:
+			now = self.clock()
+			self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.period)
+			self.updated = now
+			if self.tokens < 1:
+				return False
+			self.tokens -= 1
+			return True
+
+
+class Prefetcher:
+	"""Runs cache-warming jobs for the current selection after it has settled.
+
+	Every schedule() supersedes the previous one, so moving the selection cancels
+	the jobs queued for the old row, including any that have not started yet.
+	"""
+
+	def __init__(self, delay=PREFETCH_DELAY, budget=None, max_jobs=PREFETCH_MAX_JOBS, timer_factory=threading.Timer):
+		self.delay = delay
+		self.budget = budget or RateBudget(PREFETCH_REQUESTS_PER_MINUTE)
+		self.max_jobs = max_jobs
+		self.timer_factory = timer_factory
+		self.generation = 0
+		self._timer = None
+		self._lock = threading.Lock()
+
+	def schedule(self, jobs):
+		with self._lock:
+			self.generation += 1
+			if self._timer:
+				self._timer.cancel()
+				self._timer = None
+			jobs = list(jobs)[:self.max_jobs]
+			if not jobs:
+				return
+			self._timer = self.timer_factory(self.delay, self._run, args=(self.generation, jobs))
+			self._timer.daemon = True
+			self._timer.start()
+
+	def cancel(self):
+		self.schedule([])
+
+	def _run(self, generation, jobs):
+		for job in jobs:
+			if generation != self.generation or not self.budget.take():
+				return
+			try:
+				job()
+			except Exception:
+				# Prefetching is best effort; the handler will fetch again and report errors itself.
+				pass
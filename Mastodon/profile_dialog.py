@@ -1,6 +1,8 @@
 import wx
 import webbrowser
 from utils import strip_html
+from tasks import TaskGroup
+from cache import RelationshipCache
 
 # --- Dark Mode for MSW ---
 try:
@@ -81,7 +83,7 @@ except (ImportError, ModuleNotFoundError):
 # --- End of Dark Mode Logic ---
 
 class ViewProfileDialog(wx.Dialog):
-	def __init__(self, parent, account, mastodon=None, me=None):
+	def __init__(self, parent, account, mastodon=None, me=None, relationships=None):
 		display_name = account.get("display_name", "")
 		acct = account.get("acct", "")
 		title = f"Profile for {display_name} ({acct})"
@@ -91,6 +93,8 @@ class ViewProfileDialog(wx.Dialog):
 		self.mastodon = mastodon
 		self.me = me
 		self.relationship = None
+		self.relationships = relationships if relationships is not None else RelationshipCache()
+		self.tasks = TaskGroup(wx.CallAfter)
 
 		username = account.get("username", "")
 		bio = strip_html(account.get("note", ""))
@@ -139,23 +143,7 @@ Website: {website}"""
 		if feature_approval_text:
 			info += f"\nCollection approval: {feature_approval_text}"
 
-		# Get relationship info
-		if self.mastodon and self.me and account.get('id') != self.me.get('id'):
-			try:
-				rels = self.mastodon.account_relationships(account['id'])
-				self.relationship = rels[0] if rels else None
-				if self.relationship:
-					rel_info = []
-					if self.relationship.get('following'): rel_info.append("You follow this user")
-					if self.relationship.get('followed_by'): rel_info.append("This user follows you")
-					if self.relationship.get('blocking'): rel_info.append("You have blocked this user")
-					if self.relationship.get('muting'): rel_info.append("You have muted this user")
-					if self.relationship.get('requested'): rel_info.append("Follow request pending")
-					if rel_info:
-						info += "\n\nRelationship:\n" + "\n".join(rel_info)
-			except Exception:
-				pass
-
+		self.info = info
 		self.panel = wx.Panel(self)
 		sizer = wx.BoxSizer(wx.VERTICAL)
 
@@ -165,22 +153,31 @@ Website: {website}"""
 		# Action buttons
 		btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
 		
+		self.relationship_buttons = []
 		if self.mastodon and self.me and account.get('id') != self.me.get('id'):
-			follow_label = "Un&follow" if (self.relationship and self.relationship.get('following')) else "&Follow"
-			self.follow_button = wx.Button(self.panel, label=follow_label)
+			self.follow_button = wx.Button(self.panel, label="&Follow")
 			self.follow_button.Bind(wx.EVT_BUTTON, self.on_follow)
 			btn_sizer.Add(self.follow_button, 0, wx.ALL, 5)
 
-			mute_label = "Un&mute" if (self.relationship and self.relationship.get('muting')) else "&Mute"
-			self.mute_button = wx.Button(self.panel, label=mute_label)
+			self.mute_button = wx.Button(self.panel, label="&Mute")
 			self.mute_button.Bind(wx.EVT_BUTTON, self.on_mute)
 			btn_sizer.Add(self.mute_button, 0, wx.ALL, 5)
 
-			block_label = "Un&block" if (self.relationship and self.relationship.get('blocking')) else "&Block"
-			self.block_button = wx.Button(self.panel, label=block_label)
+			self.block_button = wx.Button(self.panel, label="&Block")
 			self.block_button.Bind(wx.EVT_BUTTON, self.on_block)
 			btn_sizer.Add(self.block_button, 0, wx.ALL, 5)
 
+			# Disabled until the relationship arrives so a toggle never acts on a guess.
+			self.relationship_buttons = [self.follow_button, self.mute_button, self.block_button]
+			if self.relationships.get(account['id']) is None:
+				for button in self.relationship_buttons:
+					button.Disable()
+				self.tasks.run(
+					lambda: [self.relationships.lookup(self.mastodon, account['id'])],
+					self.on_relationship_loaded,
+					lambda ex: self.on_relationship_loaded([]),
+				)
+
 		self.open_url_button = wx.Button(self.panel, label="Open in &Browser")
 		self.open_url_button.Bind(wx.EVT_BUTTON, self.on_open_url)
 		btn_sizer.Add(self.open_url_button, 0, wx.ALL, 5)
@@ -209,33 +206,64 @@ Website: {website}"""
 					child.SetBackgroundColour(dark_color)
 					child.SetForegroundColour(light_text_color)
 
+		cached = self.relationships.get(account['id']) if self.relationship_buttons else None
+		if cached is not None:
+			self.on_relationship_loaded([cached])
+
+		self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
 		self.text.SetFocus()
 
+	def on_destroy(self, event):
+		if event.GetEventObject() is self:
+			self.tasks.cancel()
+		event.Skip()
+
+	def on_relationship_loaded(self, relationships):
+		self.relationship = relationships[0] if relationships else None
+		for button in self.relationship_buttons:
+			button.Enable()
+		if not self.relationship:
+			return
+		self.update_relationship_labels()
+		rel_info = []
+		if self.relationship.get('following'): rel_info.append("You follow this user")
+		if self.relationship.get('followed_by'): rel_info.append("This user follows you")
+		if self.relationship.get('blocking'): rel_info.append("You have blocked this user")
+		if self.relationship.get('muting'): rel_info.append("You have muted this user")
+		if self.relationship.get('requested'): rel_info.append("Follow request pending")
+		if rel_info:
+			position = self.text.GetInsertionPoint()
+			self.text.SetValue(self.info + "\n\nRelationship:\n" + "\n".join(rel_info))
+			self.text.SetInsertionPoint(position)
+
+	def update_relationship_labels(self):
+		relationship = self.relationship or {}
+		self.follow_button.SetLabel("Un&follow" if relationship.get('following') else "&Follow")
+		self.mute_button.SetLabel("Un&mute" if relationship.get('muting') else "&Mute")
+		self.block_button.SetLabel("Un&block" if relationship.get('blocking') else "&Block")
+
+	def apply_relationship(self, relationship):
+		# Follow, mute and block all answer with the updated relationship, so no refetch is needed.
+		self.relationship = self.relationships.store(relationship) or self.relationship
+		self.update_relationship_labels()
+
 	def on_follow(self, event):
 		if not self.mastodon: return
 		try:
 			if self.relationship and self.relationship.get('following'):
 				if wx.MessageBox(f"Unfollow {self.account.get('display_name', '')}?", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-					self.mastodon.account_unfollow(self.account['id'])
-					self.relationship['following'] = False
-					self.follow_button.SetLabel("&Follow")
+					self.apply_relationship(self.mastodon.account_unfollow(self.account['id']))
 			else:
-				self.mastodon.account_follow(self.account['id'])
-				if self.relationship: self.relationship['following'] = True
-				self.follow_button.SetLabel("Un&follow")
+				self.apply_relationship(self.mastodon.account_follow(self.account['id']))
 		except Exception as e: wx.MessageBox(f"Error: {e}", "Follow Error")
 
 	def on_mute(self, event):
 		if not self.mastodon: return
 		try:
 			if self.relationship and self.relationship.get('muting'):
-				self.mastodon.account_unmute(self.account['id'])
-				self.relationship['muting'] = False
-				self.mute_button.SetLabel("&Mute")
+				self.apply_relationship(self.mastodon.account_unmute(self.account['id']))
 			else:
-				self.mastodon.account_mute(self.account['id'])
-				if self.relationship: self.relationship['muting'] = True
-				self.mute_button.SetLabel("Un&mute")
+				self.apply_relationship(self.mastodon.account_mute(self.account['id']))
 		except Exception as e: wx.MessageBox(f"Error: {e}", "Mute Error")
 
 	def on_block(self, event):
@@ -244,14 +272,10 @@ Website: {website}"""
 			display = self.account.get('display_name', '')
 			if self.relationship and self.relationship.get('blocking'):
 				if wx.MessageBox(f"Unblock {display}?", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-					self.mastodon.account_unblock(self.account['id'])
-					self.relationship['blocking'] = False
-					self.block_button.SetLabel("&Block")
+					self.apply_relationship(self.mastodon.account_unblock(self.account['id']))
 			else:
 				if wx.MessageBox(f"Block {display}?", "Confirm", wx.YES_NO | wx.ICON_QUESTION) == wx.YES:
-					self.mastodon.account_block(self.account['id'])
-					if self.relationship: self.relationship['blocking'] = True
-					self.block_button.SetLabel("Un&block")
+					self.apply_relationship(self.mastodon.account_block(self.account['id']))
 		except Exception as e: wx.MessageBox(f"Error: {e}", "Block Error")
 
 	def on_open_url(self, event):
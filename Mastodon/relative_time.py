@@ -0,0 +1,69 @@
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from dateutil import parser
+
+# How often the visible Time cells are re-checked, in milliseconds.
+TIME_REFRESH_INTERVAL = 10000
+
+# (unit length in seconds, unit name, bucket width in units). Seconds are shown in steps of ten so
+# a freshly loaded page does not rewrite its Time column on every tick.
+_UNITS = (
+	(86400, "day", 1),
+	(3600, "hour", 1),
+	(60, "minute", 1),
+	(1, "second", 10),
+)
+
+
+def parse_timestamp(value):
+	"""Parses a Mastodon timestamp into an aware datetime, or returns None."""
+	if isinstance(value, datetime):
+		return value
+	if not value or not isinstance(value, str):
+		return None
+	# Mastodon always sends "2024-05-01T12:34:56.000Z"; fromisoformat handles that once the Z is spelled out.
+	text = value[:-1] + "+00:00" if value.endswith("Z") else value
+	try:
+		parsed = datetime.fromisoformat(text)
+	except ValueError:
+		try:
+			parsed = parser.parse(value)
+		except (parser.ParserError, TypeError, ValueError, OverflowError):
+			return None
+	if parsed.tzinfo is None:
+		parsed = parsed.replace(tzinfo=timezone.utc)
+	return parsed
+
+
+@lru_cache(maxsize=8192)
+def epoch_seconds(created_at):
+	"""Epoch seconds for a status or notification timestamp, parsed once per distinct value."""
+	parsed = parse_timestamp(created_at)
+	return parsed.timestamp() if parsed else None
+
+
+@lru_cache(maxsize=512)
+def _label(count, unit):
+	if unit == "second" and count == 0:
+		return "just now"
+	return f"{count} {unit}{'' if count == 1 else 's'} ago"
+
+
+def time_bucket(age):
+	"""Returns (count, unit) for an age in seconds; every age in the same bucket shares one label."""
+	age = max(0, int(age))
+	for length, unit, width in _UNITS:
+		if age >= length or unit == "second":
+			count = age // length
+			return count - count % width, unit
+
+
+def relative_label(created_at, now=None):
+	epoch = created_at if isinstance(created_at, (int, float)) else epoch_seconds(created_at)
+	if epoch is None:
+		return ""
+	if now is None:
+		now = time.time()
+	return _label(*time_bucket(now - epoch))
@@ -0,0 +1,87 @@
+from string import Formatter
+
+ROW_COLUMNS = 4
+COLUMN_SEPARATOR = "|"
+DEFAULT_ROW_TEMPLATE = "{author} | {content} | {time} | {client}"
+
+STATUS_FIELDS = (
+	"author", "handle", "content", "text", "cw", "media", "poll",
+	"time", "client", "replies", "boosts", "favourites", "visibility",
+)
+NOTIFICATION_FIELDS = ("author", "content", "type", "time", "client")
+
+
+class RowTemplateError(ValueError):
+	pass
+
+
+def _compile_column(text, field_names):
+	"""Rewrites one column into a str.format pattern; {field:N} becomes {field:.N} so format() does the truncating."""
+	parts, used = [], []
+	try:
+		parsed = list(Formatter().parse(text))
+	except ValueError as e:
+		raise RowTemplateError(f"Invalid template column '{text}': {e}") from None
+	for literal, name, spec, conversion in parsed:
+		parts.append(literal.replace("{", "{{").replace("}", "}}"))
+		if name is None:
+			continue
+		if name not in field_names:
+			raise RowTemplateError(f"Unknown field '{name}'. Available fields: {', '.join(field_names)}")
+		if conversion or (spec and not spec.isdigit()):
+			raise RowTemplateError(f"'{{{name}:{spec}}}' is not valid; use {{{name}}} or {{{name}:N}} to keep N characters.")
+		parts.append(f"{{{name}:.{int(spec)}}}" if spec else f"{{{name}}}")
+		if name not in used:
+			used.append(name)
+	return "".join(parts), used
+
+
+class RowTemplate:
+	"""A list-row template parsed once into per-column format patterns.
+
+	Columns are separated by "|" and fields are written {name} or {name:N}. Only the fields the
+	template mentions are computed for each row.
+	"""
+
+	def __init__(self, template, fields, prepare=None, columns=ROW_COLUMNS):
+		self.template = (template or "").strip() or DEFAULT_ROW_TEMPLATE
+		pieces = [piece.strip() for piece in self.template.split(COLUMN_SEPARATOR)]
+		if len(pieces) > columns:
+			raise RowTemplateError(f"A row has at most {columns} columns; this template has {len(pieces)}.")
+		pieces += [""] * (columns - len(pieces))
+		compiled = [_compile_column(piece, tuple(fields)) for piece in pieces]
+		self.patterns = [pattern for pattern, _ in compiled]
+		self.column_fields = [used for _, used in compiled]
+		used = {name for names in self.column_fields for name in names}
+		self.getters = [(name, fields[name]) for name in fields if name in used]
+		self.prepare = prepare
+
+	@property
+	def headers(self):
+		return [names[0].capitalize() if names else "" for names in self.column_fields]
+
+	def columns_with(self, field):
+		return [i for i, names in enumerate(self.column_fields) if field in names]
+
+	def _values(self, item, getters):
+		source = self.prepare(item) if self.prepare else item
+		values = {}
+		for name, getter in getters:
+			value = getter(source)
+			values[name] = "" if value is None else str(value)
+		return values
+
+	def __call__(self, item):
+		values = self._values(item, self.getters)
+		return [pattern.format_map(values) for pattern in self.patterns]
+
+	def render_columns(self, item, indexes):
+		"""Renders just the given columns, e.g. to refresh the Time cell without rebuilding the content."""
+		needed = {name for i in indexes for name in self.column_fields[i]}
+		values = self._values(item, [(name, getter) for name, getter in self.getters if name in needed])
+		return {i: self.patterns[i].format_map(values) for i in indexes}
+
+
+def validate_row_template(template, field_names):
+	"""Raises RowTemplateError if the template does not compile against the given field names."""
+	RowTemplate(template, dict.fromkeys(field_names, str))
@@ -0,0 +1,167 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+
+from post_rendering import status_text
+
+TOKEN_RE = re.compile(r"\w+")
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Matches in the author or a hashtag say more about a post than a passing word in its body.
+FIELD_WEIGHTS = (("author", 3.0), ("tags", 3.0), ("cw", 2.0), ("content", 1.0))
+PREFIX_MATCH_FACTOR = 0.5
+PHRASE_BONUS = 2.0
+
+
+def tokenize(text):
+	return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def status_fields(status):
+	"""The searchable text of a status (or the post it boosts), by field."""
+	source = status.get("reblog") or status
+	account = source.get("account") or {}
+	return {
+		"author": f"{account.get('display_name') or ''} {account.get('username') or ''} {account.get('acct') or ''}",
+		"tags": " ".join(tag.get("name") or "" for tag in source.get("tags") or []),
+		"cw": source.get("spoiler_text") or "",
+		"content": status_text(source),
+	}
+
+
+def _status_of(item):
+	# Notifications are searched by the post they are about; follows and the like have none.
+	if item and "type" in item and "content" not in item:
+		return item.get("status")
+	return item
+
+
+def parse_query(query):
+	"""Splits a query into prefix terms and quoted phrases (each a list of tokens)."""
+	terms, phrases = [], []
+	for phrase, word in QUERY_RE.findall(query or ""):
+		tokens = tokenize(phrase if phrase else word)
+		if phrase and len(tokens) > 1:
+			phrases.append(tokens)
+		terms.extend(tokens)
+	return terms, phrases
+
+
+class SearchIndex:
+	"""An incremental inverted index over loaded statuses, keyed by status id.
+
+	Documents are re-tokenized only when a status is new or has been edited since it was indexed.
+	"""
+
+	def __init__(self):
+		self.postings = {}
+		self.docs = {}
+		self._vocabulary = None
+		self._lock = threading.Lock()
+
+	def __len__(self):
+		return len(self.docs)
+
+	def __contains__(self, status_id):
+		return str(status_id) in self.docs
+
+	@staticmethod
+	def _version(status):
+		return (status.get("reblog") or status).get("edited_at")
+
+	def _add(self, doc_id, status):
+		self._remove(doc_id)
+		fields = status_fields(status)
+		weights, texts = {}, []
+		for field, weight in FIELD_WEIGHTS:
+			tokens = tokenize(fields[field])
+			for token in tokens:
+				weights[token] = weights.get(token, 0.0) + weight
+			texts.append(" ".join(tokens))
+		for token, weight in weights.items():
+			if token not in self.postings:
+				self.postings[token] = {}
+				self._vocabulary = None
+			self.postings[token][doc_id] = weight
+		# Fields are joined with a separator no token contains, so phrases never match across them.
+		self.docs[doc_id] = (self._version(status), tuple(weights), " " + " | ".join(texts) + " ")
+
+	def _remove(self, doc_id):
+		doc = self.docs.pop(doc_id, None)
+		if not doc:
+			return
+		for token in doc[1]:
+			posting = self.postings.get(token)
+			if posting is None:
+				continue
+			posting.pop(doc_id, None)
+			if not posting:
+				del self.postings[token]
+				self._vocabulary = None
+
+	def add(self, status):
+		if not status or status.get("id") is None:
+			return
+		doc_id = str(status["id"])
+		with self._lock:
+			doc = self.docs.get(doc_id)
+			if doc is None or doc[0] != self._version(status):
+				self._add(doc_id, status)
+
+	def add_many(self, items):
+		for item in items or []:
+			self.add(_status_of(item))
+
+	def remove(self, status_id):
+		with self._lock:
+			self._remove(str(status_id))
+
+	def sync(self, items):
+		"""Indexes new or edited statuses and drops documents for statuses no longer loaded anywhere."""
+		live = set()
+		for item in items:
+			status = _status_of(item)
+			if status and status.get("id") is not None:
+				live.add(str(status["id"]))
+				self.add(status)
+		with self._lock:
+			for doc_id in [doc_id for doc_id in self.docs if doc_id not in live]:
+				self._remove(doc_id)
+
+	def _expand(self, term):
+		if self._vocabulary is None:
+			self._vocabulary = sorted(self.postings)
+		vocabulary = self._vocabulary
+		i = bisect_left(vocabulary, term)
+		while i < len(vocabulary) and vocabulary[i].startswith(term):
+			yield vocabulary[i]
+			i += 1
+
+	def search(self, query):
+		"""Returns {status id: score} for documents matching every term (as a word prefix) and every quoted phrase."""
+		terms, phrases = parse_query(query)
+		if not terms:
+			return {}
+		with self._lock:
+			total = len(self.docs) or 1
+			scores = None
+			for term in dict.fromkeys(terms):
+				term_scores = {}
+				for token in self._expand(term):
+					posting = self.postings[token]
+					idf = math.log(1 + total / len(posting))
+					factor = idf if token == term else idf * PREFIX_MATCH_FACTOR
+					for doc_id, weight in posting.items():
+						if scores is None or doc_id in scores:
+							term_scores[doc_id] = max(term_scores.get(doc_id, 0.0), weight * factor)
+				if scores is None:
+					scores = term_scores
+				else:
+					scores = {doc_id: scores[doc_id] + score for doc_id, score in term_scores.items()}
+				if not scores:
+					return {}
+			for phrase in phrases:
+				needle = " " + " ".join(phrase) + " "
+				scores = {doc_id: score + PHRASE_BONUS for doc_id, score in scores.items() if needle in self.docs[doc_id][2]}
+			return scores
@@ -1,6 +1,7 @@
 import wx
 import os
 from easysettings import EasySettings
+from row_templates import DEFAULT_ROW_TEMPLATE, NOTIFICATION_FIELDS, STATUS_FIELDS, RowTemplateError, validate_row_template
 import main_frame
 
 # --- Dark Mode for MSW ---
@@ -82,7 +83,7 @@ except (ImportError, ModuleNotFoundError):
 
 class SettingsDialog(wx.Dialog):
     def __init__(self, parent, on_save_callback=None):
-        super().__init__(parent, title="Settings", size=(400, 200))
+        super().__init__(parent, title="Settings", size=(500, 370))
         self.conf = EasySettings("thrive.ini")
         self.on_save_callback = on_save_callback
         
@@ -91,6 +92,13 @@ class SettingsDialog(wx.Dialog):
 
         soundpack_label = wx.StaticText(panel, label="Select Sound Pack:")
         self.soundpack_choice = wx.Choice(panel)
+        status_template_label = wx.StaticText(panel, label=f"&Post row template (fields: {', '.join(STATUS_FIELDS)}):")
+        self.status_template_input = wx.TextCtrl(panel, value=self.conf.get("status_row_template", DEFAULT_ROW_TEMPLATE))
+        notification_template_label = wx.StaticText(panel, label=f"&Notification row template (fields: {', '.join(NOTIFICATION_FIELDS)}):")
+        self.notification_template_input = wx.TextCtrl(panel, value=self.conf.get("notification_row_template", DEFAULT_ROW_TEMPLATE))
+        template_hint = wx.StaticText(panel, label="Separate columns with |. Write {content:80} to keep only the first 80 characters.")
+        self.grouped_notifications_check = wx.CheckBox(panel, label="&Group favourites, boosts and follows into one notification row per post")
+        self.grouped_notifications_check.SetValue(bool(self.conf.get("grouped_notifications", True)))
         save_button = wx.Button(panel, label="&Save")
         cancel_button = wx.Button(panel, label="&Cancel", id=wx.ID_CANCEL)
 
@@ -106,8 +114,11 @@ class SettingsDialog(wx.Dialog):
             panel.SetBackgroundColour(dark_color)
             
             soundpack_label.SetForegroundColour(light_text_color)
-            self.soundpack_choice.SetBackgroundColour(dark_color)
-            self.soundpack_choice.SetForegroundColour(light_text_color)
+            for widget in (status_template_label, notification_template_label, template_hint):
+                widget.SetForegroundColour(light_text_color)
+            for widget in (self.soundpack_choice, self.status_template_input, self.notification_template_input, self.grouped_notifications_check):
+                widget.SetBackgroundColour(dark_color)
+                widget.SetForegroundColour(light_text_color)
             save_button.SetBackgroundColour(dark_color)
             save_button.SetForegroundColour(light_text_color)
             cancel_button.SetBackgroundColour(dark_color)
@@ -117,6 +128,8 @@ class SettingsDialog(wx.Dialog):
 
         self.load_soundpacks()
         vbox.Add(self.soundpack_choice, 0, wx.ALL | wx.EXPAND, 5)
+        for widget in (status_template_label, self.status_template_input, notification_template_label, self.notification_template_input, template_hint, self.grouped_notifications_check):
+            vbox.Add(widget, 0, wx.ALL | wx.EXPAND, 5)
 
         hbox = wx.BoxSizer(wx.HORIZONTAL)
         hbox.Add(save_button, 0, wx.ALL, 5)
@@ -151,8 +164,22 @@ class SettingsDialog(wx.Dialog):
             self.soundpack_choice.SetSelection(0)
 
     def on_save(self, event):
+        templates = {
+            "status_row_template": (self.status_template_input, STATUS_FIELDS),
+            "notification_row_template": (self.notification_template_input, NOTIFICATION_FIELDS),
+        }
+        for name, (control, fields) in templates.items():
+            try:
+                validate_row_template(control.GetValue(), fields)
+            except RowTemplateError as e:
+                wx.MessageBox(str(e), "Invalid Row Template", wx.OK | wx.ICON_ERROR)
+                control.SetFocus()
+                return
         selected = self.soundpack_choice.GetStringSelection()
         self.conf.setsave("soundpack", selected)
+        for name, (control, _) in templates.items():
+            self.conf.setsave(name, control.GetValue().strip() or DEFAULT_ROW_TEMPLATE)
+        self.conf.setsave("grouped_notifications", self.grouped_notifications_check.IsChecked())
         if self.on_save_callback:
             self.on_save_callback()
         wx.MessageBox("Settings saved. Sound changes will take effect on next restart or action.", "Settings Saved")
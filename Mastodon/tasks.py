@@ -0,0 +1,97 @@
+import threading
+
+
+def _call_now(func, *args):
+	func(*args)
+
+
+def run_concurrently(*fetches):
+	"""Runs blocking fetches side by side on worker threads and returns their results in order.
+
+	The first exception raised by any fetch is re-raised once they have all finished.
+	"""
+	results = [None] * len(fetches)
+	errors = [None] * len(fetches)
+
+	def run(index, fetch):
+		try:
+			results[index] = fetch()
+		except Exception as e:
+			errors[index] = e
+
+	threads = [threading.Thread(target=run, args=(index, fetch), daemon=True) for index, fetch in enumerate(fetches[1:], 1)]
+	for thread in threads:
+		thread.start()
+	# The first fetch runs on the calling thread, which would otherwise sit idle.
+	if fetches:
+		run(0, fetches[0])
+	for thread in threads:
+		thread.join()
+	for error in errors:
+		if error is not None:
+			raise error
+	return results
+
+
+class BackgroundTask:
+	"""Runs a blocking fetch on a worker thread and hands the result back to the GUI thread."""
+
+	def __init__(self, fetch, on_done, on_error=None, call_after=None):
+		self.fetch = fetch
+		self.on_done = on_done
+		self.on_error = on_error
+		self.call_after = call_after or _call_now
+		self.thread = None
+		self._cancelled = threading.Event()
+
+	@property
+	def cancelled(self):
+		return self._cancelled.is_set()
+
+	def cancel(self):
+		self._cancelled.set()
+
+	def start(self):
+		self.thread = threading.Thread(target=self.run, daemon=True)
+		self.thread.start()
+		return self
+
+	def run(self):
+		if self.cancelled:
+			return
+		try:
+			result = self.fetch()
+		except Exception as e:
+			if not self.cancelled and self.on_error:
+				self.call_after(self._deliver, self.on_error, e)
+			return
+		if not self.cancelled:
+			self.call_after(self._deliver, self.on_done, result)
+
+	def _deliver(self, callback, value):
+		# Checked again on the GUI thread: the dialog may have closed while the result was queued.
+		if not self.cancelled:
+			callback(value)
+
+
+class TaskGroup:
+	"""Tracks the background fetches that belong to one dialog so they can be cancelled together."""
+
+	def __init__(self, call_after=None):
+		self.call_after = call_after
+		self.tasks = []
+		self.closed = False
+
+	def run(self, fetch, on_done, on_error=None):
+		task = BackgroundTask(fetch, on_done, on_error, self.call_after)
+		if self.closed:
+			task.cancel()
+			return task
+		self.tasks.append(task)
+		return task.start()
+
+	def cancel(self):
+		self.closed = True
+		for task in self.tasks:
+			task.cancel()
+		self.tasks.clear()
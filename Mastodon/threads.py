@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+
+# Statuses kept for assembling threads; the least recently seen are dropped past this.
+REPLY_INDEX_LIMIT = 5000
+
+
+def _sort_key(status):
+	status_id = str(status.get("id", ""))
+	# Snowflake ids sort numerically; comparing length first keeps string ids in the same order.
+	return (str(status.get("created_at", "")), len(status_id), status_id)
+
+
+class ReplyIndex:
+	"""The statuses we have seen most recently, indexed by id and by the id they reply to.
+
+	Lets a thread be assembled from memory before status_context answers. At most limit
+	statuses are kept, so a long streaming session does not grow it without bound.
+	"""
+
+	def __init__(self, limit=REPLY_INDEX_LIMIT):
+		self.limit = limit
+		self.statuses = OrderedDict()
+		self.replies = {}
+		self._lock = threading.Lock()
+
+	def add(self, status):
+		if not status or status.get("id") is None:
+			return
+		if status.get("reblog"):
+			status = status["reblog"]
+		status_id = str(status["id"])
+		with self._lock:
+			previous = self.statuses.get(status_id)
+			self.statuses[status_id] = status
+			self.statuses.move_to_end(status_id)
+			if previous is not None:
+				self._unlink(previous)
+			parent_id = status.get("in_reply_to_id")
+			if parent_id is not None:
+				self.replies.setdefault(str(parent_id), set()).add(status_id)
+			while len(self.statuses) > self.limit:
+				_, oldest = self.statuses.popitem(last=False)
+				self._unlink(oldest)
+
+	def add_many(self, items):
+		for item in items or []:
+			if not item:
+				continue
+			# Notifications carry their status under "status"; statuses are added as they are.
+			self.add(item.get("status") if "type" in item and "content" not in item else item)
+
+	def add_context(self, context):
+		self.add_many((context or {}).get("ancestors", []))
+		self.add_many((context or {}).get("descendants", []))
+
+	def remove(self, status_id):
+		with self._lock:
+			status = self.statuses.pop(str(status_id), None)
+			if status is not None:
+				self._unlink(status)
+
+	def _unlink(self, status):
+		parent_id = status.get("in_reply_to_id")
+		if parent_id is not None:
+			siblings = self.replies.get(str(parent_id))
+			if siblings:
+				siblings.discard(str(status["id"]))
+				if not siblings:
+					del self.replies[str(parent_id)]
+
+	def get(self, status_id):
+		return self.statuses.get(str(status_id))
+
+	def thread(self, status_id):
+		"""Return (ancestors, descendants) of status_id as far as they are known locally."""
+		with self._lock:
+			ancestors = []
+			seen = {str(status_id)}
+			current = self.statuses.get(str(status_id))
+			while current and current.get("in_reply_to_id") is not None:
+				parent_id = str(current["in_reply_to_id"])
+				if parent_id in seen:
+					break
+				seen.add(parent_id)
+				current = self.statuses.get(parent_id)
+				if current:
+					ancestors.append(current)
+			ancestors.reverse()
+
+			descendants = []
+			stack = [str(status_id)]
+			while stack:
+				current_id = stack.pop()
+				if current_id != str(status_id):
+					descendants.append(self.statuses[current_id])
+				children = [self.statuses[child_id] for child_id in self.replies.get(current_id, ()) if child_id in self.statuses and child_id not in seen]
+				# Newest pushed first, so the oldest reply is visited next: depth first, in posting order.
+				for child in sorted(children, key=_sort_key, reverse=True):
+					seen.add(str(child["id"]))
+					stack.append(str(child["id"]))
+			return ancestors, descendants
+
+
+def splice_positions(old_ids, new_ids):
+	"""Where to insert rows so a list showing old_ids ends up showing new_ids.
+
+	Returns [(index, id), ...] to apply in order, or None when old_ids is not an
+	in-order subset of new_ids and the list has to be rebuilt instead.
+	"""
+	old_ids = [str(status_id) for status_id in old_ids]
+	new_ids = [str(status_id) for status_id in new_ids]
+	inserts = []
+	position = 0
+	for index, status_id in enumerate(new_ids):
+		if position < len(old_ids) and old_ids[position] == status_id:
+			position += 1
+		else:
+			inserts.append((index, status_id))
+	return inserts if position == len(old_ids) else None
+
+
+# Rows added per event-loop turn when a thread is too long to render in one go.
+THREAD_CHUNK_SIZE = 100
+
+
+def chunk_bounds(total, first_end=0, size=THREAD_CHUNK_SIZE):
+	"""Split range(total) into (start, end) slices; the first one always reaches first_end."""
+	bounds = []
+	start = 0
+	end = min(total, max(first_end, size))
+	while start < total:
+		bounds.append((start, end))
+		start = end
+		end = min(total, start + size)
+	return bounds
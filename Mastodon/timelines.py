@@ -0,0 +1,244 @@
+from mastodon import MastodonNotFoundError
+
+from mastodon_api import fetch_account_statuses, fetch_grouped_notifications, fetch_notifications, search_v2
+from grouped_notifications import grouped_page_cursor, groups_from_page
+from local_search import server_query
+from markers import id_newer
+
+
+TIMELINE_PAGE_SIZE = 40
+# Catching up from a read marker stops after this many requests; further behind than that, only the newest page is shown.
+CATCH_UP_PAGES = 10
+
+
+def _identity(page):
+	return list(page or [])
+
+
+def _without_boosts(page):
+	return [status for status in page or [] if not status.get("reblog")]
+
+
+def _last_statuses(page):
+	return [conversation.get("last_status") for conversation in page or [] if conversation.get("last_status")]
+
+
+def _notification_statuses(page):
+	return [notification["status"] for notification in page or [] if notification.get("status")]
+
+
+def mention_statuses(notifications):
+	"""The posts behind the mention notifications in a loaded notifications list, which is all the mentions timeline shows until it needs older ones."""
+	return [item["status"] for item in notifications or [] if item.get("type") == "mention" and item.get("status")]
+
+
+def _search_statuses(page):
+	return (page or {}).get("statuses", [])
+
+
+def _thread_statuses(page):
+	context = page.get("context") or {}
+	return context.get("ancestors", []) + [page["status"]] + context.get("descendants", [])
+
+
+class Timeline:
+	"""One timeline: where its pages come from and how to ask for the next one.
+
+	fetch(**params) returns a raw API page and items() turns that page into the
+	statuses or notifications shown in the list. Older pages follow the Link header
+	of the previous page. Without one, cursor(page) supplies the next max_id if
+	given; otherwise the last raw entry's id is used, but only when id_paged says
+	the endpoint pages by those ids.
+	"""
+
+	def __init__(self, key, fetch, items=_identity, notifications=False, id_paged=True, paged=True, page_size=TIMELINE_PAGE_SIZE, cursor=None):
+		self.key = key
+		self.fetch = fetch
+		self.items = items
+		self.notifications = notifications
+		self.id_paged = id_paged
+		self.paged = paged
+		self.page_size = page_size
+		self.cursor = cursor
+		self._next_params = None
+
+	@property
+	def has_more(self):
+		return self._next_params is not None
+
+	@property
+	def next_max_id(self):
+		return (self._next_params or {}).get("max_id")
+
+	def start_after(self, max_id):
+		"""Makes load_older() continue below max_id, for a timeline whose newer items came from elsewhere."""
+		self._next_params = {"max_id": max_id} if self.paged and max_id is not None else None
+
+	def _remember_cursor(self, page):
+		self._next_params = None
+		if not self.paged or not page:
+			return
+		# Only the cursor is taken from the Link header; fetch() supplies every other parameter itself.
+		link_params = getattr(page, "_pagination_next", None)
+		if link_params and link_params.get("max_id") is not None:
+			self._next_params = {"max_id": link_params["max_id"]}
+		elif self.cursor is not None:
+			max_id = self.cursor(page)
+			self._next_params = {"max_id": max_id} if max_id is not None else None
+		elif self.id_paged and isinstance(page, list) and page[-1].get("id") is not None:
+			self._next_params = {"max_id": page[-1]["id"]}
+
+	def load(self):
+		page = self.fetch(limit=self.page_size)
+		self._remember_cursor(page)
+		return self.items(page)
+
+	def load_since(self, last_read_id, max_pages=CATCH_UP_PAGES):
+		"""Loads the newest page and, when it does not reach back to last_read_id, the gap in between.
+
+		The gap is walked forward from last_read_id with min_id until it meets the newest page, so
+		every unread item is loaded and older pages then continue from just below the marker.
+		When catching up would take more than max_pages, only the newest page is kept.
+		"""
+		page = self.fetch(limit=self.page_size)
+		self._remember_cursor(page)
+		newest = self.items(page)
+		if last_read_id is None or not newest or not id_newer(newest[-1].get("id"), last_read_id):
+			return newest
+		seen = {str(item.get("id")) for item in newest}
+		gap, cursor, first_page = [], last_read_id, None
+		for _ in range(max_pages - 1):
+			page = self.fetch(limit=self.page_size, min_id=cursor)
+			chunk = self.items(page)
+			if not chunk:
+				break
+			if first_page is None:
+				first_page = page
+			unseen = [item for item in chunk if str(item.get("id")) not in seen]
+			gap = unseen + gap
+			if len(unseen) < len(chunk):
+				break
+			cursor = chunk[0].get("id")
+		else:
+			return newest
+		if gap:
+			self._remember_cursor(first_page)
+		return newest + gap
+
+	def load_older(self):
+		if not self.has_more:
+			return []
+		page = self.fetch(limit=self.page_size, **self._next_params)
+		self._remember_cursor(page)
+		return self.items(page)
+
+
+def merge_older(existing, older):
+	"""Append an older page, dropping anything already present (pages can overlap after live inserts)."""
+	seen = {item.get("id") for item in existing}
+	added = [item for item in older if item.get("id") not in seen]
+	existing.extend(added)
+	return added
+
+
+def _home(mastodon, me, key, arg):
+	return Timeline(key, mastodon.timeline_home)
+
+
+def _local(mastodon, me, key, arg):
+	return Timeline(key, mastodon.timeline_local)
+
+
+def _federated(mastodon, me, key, arg):
+	return Timeline(key, mastodon.timeline_public)
+
+
+def _sent(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: mastodon.account_statuses(me["id"], **params), _without_boosts)
+
+
+def _direct_messages(mastodon, me, key, arg):
+	return Timeline(key, mastodon.conversations, _last_statuses, id_paged=False)
+
+
+def _favourites(mastodon, me, key, arg):
+	return Timeline(key, mastodon.favourites, id_paged=False)
+
+
+def _bookmarks(mastodon, me, key, arg):
+	return Timeline(key, mastodon.bookmarks, id_paged=False)
+
+
+def _notifications(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: fetch_notifications(mastodon, **params), notifications=True)
+
+
+def _grouped_notifications(mastodon, me, key, arg):
+	grouped = [True]
+
+	def fetch(**params):
+		# Servers before 4.3 have no grouped endpoint; their v1 pages become one group per notification.
+		if grouped[0]:
+			try:
+				return fetch_grouped_notifications(mastodon, **params)
+			except MastodonNotFoundError:
+				grouped[0] = False
+		return fetch_notifications(mastodon, **params)
+
+	return Timeline(key, fetch, groups_from_page, notifications=True, cursor=grouped_page_cursor)
+
+
+def _mentions(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: fetch_notifications(mastodon, types=["mention"], **params), _notification_statuses)
+
+
+def _user(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: fetch_account_statuses(mastodon, arg, exclude_direct=True, **params))
+
+
+def _search(mastodon, me, key, arg):
+	# Local-only filters such as visibility: are left out of what the server is asked.
+	return Timeline(key, lambda **params: search_v2(mastodon, server_query(arg), type="statuses"), _search_statuses, paged=False)
+
+
+def _hashtag(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: mastodon.timeline_hashtag(arg, **params))
+
+
+def _list(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: mastodon.timeline_list(arg, **params))
+
+
+def _thread(mastodon, me, key, arg):
+	return Timeline(key, lambda **params: {"status": mastodon.status(arg), "context": mastodon.status_context(arg)}, _thread_statuses, paged=False)
+
+
+TIMELINE_KINDS = {
+	"home": _home,
+	"local": _local,
+	"federated": _federated,
+	"sent": _sent,
+	"direct_messages": _direct_messages,
+	"favourites": _favourites,
+	"bookmarks": _bookmarks,
+	"notifications": _notifications,
+	"mentions": _mentions,
+	"user": _user,
+	"search": _search,
+	"hashtag": _hashtag,
+	"list": _list,
+	"thread": _thread,
+}
+
+
+def build_timeline(mastodon, me, key, grouped_notifications=False, conversations=None):
+	"""Return the Timeline for a key such as "home" or "hashtag:python", or None for unknown kinds.
+
+	grouped_notifications switches the notifications timeline to the grouped v2 endpoint.
+	conversations, a ConversationStore, records the conversation behind each direct message.
+	"""
+	kind, _, arg = key.partition(":")
+	if kind == "direct_messages" and conversations is not None:
+		return Timeline(key, mastodon.conversations, conversations.add_page, id_paged=False)
+	factory = _grouped_notifications if kind == "notifications" and grouped_notifications else TIMELINE_KINDS.get(kind)
+	return factory(mastodon, me, key, arg) if factory else None
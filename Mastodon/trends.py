@@ -0,0 +1,92 @@
+import threading
+import time
+
+TREND_KINDS = ("statuses", "tags", "links")
+# The trends endpoints return 20 entries by default, and tags and links cap a page there.
+TREND_PAGE_SIZE = 20
+# Trends move slowly: within this many seconds a cached list is shown without asking the server again.
+TRENDS_TTL = 300
+
+
+def trend_key(kind, entry):
+	if kind == "tags":
+		return (entry.get("name") or "").lower()
+	if kind == "links":
+		return entry.get("url")
+	return str(entry.get("id"))
+
+
+class TrendFeed:
+	"""One kind of trend on one instance, loaded a page at a time by offset.
+
+	fetch_first() and fetch_more() are safe to call from a worker thread; replace() and
+	add_page() belong to the thread that owns the list control.
+	"""
+
+	def __init__(self, kind, fetch_page, page_size=TREND_PAGE_SIZE, ttl=TRENDS_TTL, clock=time.monotonic):
+		self.kind = kind
+		self.fetch_page = fetch_page
+		self.page_size = page_size
+		self.ttl = ttl
+		self.clock = clock
+		self.items = []
+		# Entries fetched so far, duplicates included: the server's offset counts them even though items does not.
+		self.fetched = 0
+		self.fetched_at = None
+		self.has_more = True
+		self.loading = False
+		self._keys = set()
+
+	@property
+	def loaded(self):
+		return self.fetched_at is not None
+
+	@property
+	def stale(self):
+		return not self.loaded or self.clock() - self.fetched_at > self.ttl
+
+	def fetch_first(self):
+		return self.fetch_page(limit=self.page_size, offset=0)
+
+	def fetch_more(self):
+		return self.fetch_page(limit=self.page_size, offset=self.fetched)
+
+	def replace(self, page):
+		"""Starts over from a freshly fetched first page; the items list is emptied in place so views holding it stay current."""
+		self.items.clear()
+		self._keys = set()
+		self.fetched = 0
+		self.fetched_at = self.clock()
+		return self.add_page(page)
+
+	def add_page(self, page):
+		"""Stores a fetched page and returns the entries it added."""
+		page = list(page or [])
+		self.has_more = len(page) >= self.page_size
+		self.fetched += len(page)
+		added = []
+		for entry in page:
+			key = trend_key(self.kind, entry)
+			if key in self._keys:
+				continue
+			self._keys.add(key)
+			added.append(entry)
+		self.items.extend(added)
+		return added
+
+
+class TrendsCache:
+	"""TrendFeeds keyed by instance and kind, kept across Explore visits."""
+
+	def __init__(self, ttl=TRENDS_TTL, clock=time.monotonic):
+		self.ttl = ttl
+		self.clock = clock
+		self._feeds = {}
+		self._lock = threading.Lock()
+
+	def feed(self, instance, kind, fetch_page):
+		with self._lock:
+			feed = self._feeds.get((instance, kind))
+			if feed is None:
+				feed = self._feeds[(instance, kind)] = TrendFeed(kind, fetch_page, ttl=self.ttl, clock=self.clock)
+			return feed
@@ -0,0 +1,27 @@
+# Seconds between unread-count polls: back to the minimum whenever the count moves, doubling while it stays put.
+UNREAD_MIN_INTERVAL = 30
+UNREAD_MAX_INTERVAL = 300
+
+
+def unread_label(base, count):
+	return f"{base} ({count})" if count else base
+
+
+class UnreadCounter:
+	"""The last unread count the server reported and how long to wait before asking again."""
+
+	def __init__(self, min_interval=UNREAD_MIN_INTERVAL, max_interval=UNREAD_MAX_INTERVAL):
+		self.min_interval = min_interval
+		self.max_interval = max_interval
+		self.interval = min_interval
+		self.count = None
+
+	def update(self, count):
+		"""Records a fresh count; returns how much it grew since the last poll (0 on the first one)."""
+		previous, self.count = self.count, count
+		if previous is not None and count != previous:
+			self.interval = self.min_interval
+			return max(count - previous, 0)
+		if previous is not None:
+			self.interval = min(self.interval * 2, self.max_interval)
+		return 0
@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from autocomplete import COMPLETION_SCAN_LIMIT, CompletionIndex, PrefixIndex, completion_token
+
+
+def account(acct, display_name="", account_id=None):
+	return {"id": account_id or acct, "acct": acct, "username": acct.split("@")[0], "display_name": display_name}
+
+
+def status(status_id, author, mentions=(), tags=()):
+	return {
+		"id": status_id,
+		"content": "<p>hello</p>",
+		"account": author,
+		"mentions": [{"id": m["id"], "acct": m["acct"], "username": m["username"]} for m in mentions],
+		"tags": [{"name": tag} for tag in tags],
+	}
+
+
+class CountingKeys(dict):
+	def __init__(self, keys):
+		super().__init__(keys)
+		self.reads = 0
+
+	def __getitem__(self, key):
+		self.reads += 1
+		return super().__getitem__(key)
+
+
+class CompletionTokenTests(unittest.TestCase):
+	def test_finds_the_token_at_the_caret(self):
+		self.assertEqual(completion_token("hi @ale"), "@ale")
+		self.assertEqual(completion_token("line one\n#pyth"), "#pyth")
+
+	def test_ignores_bare_markers_and_plain_words(self):
+		self.assertIsNone(completion_token("hi @"))
+		self.assertIsNone(completion_token("hello"))
+		self.assertIsNone(completion_token("mail me at me@host"))
+		self.assertIsNone(completion_token("hi @ale "))
+
+
+class PrefixIndexTests(unittest.TestCase):
+	def test_matches_keys_added_after_earlier_lookups(self):
+		index = PrefixIndex()
+		index.add("Alex", 1)
+		self.assertEqual(index.matches("al"), {1})
+		index.add("alan", 2)
+		index.add("bob", 3)
+		self.assertEqual(index.matches("AL"), {1, 2})
+		self.assertEqual(index.matches("z"), set())
+
+
+class CompletionIndexTests(unittest.TestCase):
+	def test_learns_authors_mentions_and_tags_from_statuses(self):
+		index = CompletionIndex()
+		alex = account("alex@example.social", "Alex Smith")
+		sam = account("sam")
+		index.add_items([status(1, alex, mentions=[sam], tags=["Python"])])
+		self.assertEqual(index.complete("@ale"), [{"text": "@alex@example.social", "label": "Alex Smith (@alex@example.social)"}])
+		self.assertEqual(index.complete("@smi")[0]["text"], "@alex@example.social")
+		self.assertEqual(index.complete("@sa"), [{"text": "@sam", "label": "@sam"}])
+		self.assertEqual(index.complete("#py"), [{"text": "#Python", "label": "#Python"}])
+
+	def test_notifications_feed_their_account_and_post(self):
+		index = CompletionIndex()
+		notification = {"id": "n1", "type": "mention", "account": account("jo"), "status": status(2, account("kim"), tags=["wx"])}
+		index.add_items([notification, {"id": "n2", "type": "follow", "account": account("lee")}])
+		self.assertEqual([m["text"] for m in index.complete("@jo")], ["@jo"])
+		self.assertEqual([m["text"] for m in index.complete("@le")], ["@lee"])
+		self.assertEqual([m["text"] for m in index.complete("#w")], ["#wx"])
+
+	def test_exact_handles_rank_first_then_most_seen(self):
+		index = CompletionIndex()
+		frequent = account("samantha")
+		index.add_items([status(i, frequent) for i in range(5)])
+		index.add_accounts([account("sammy"), account("sam")])
+		self.assertEqual([m["text"] for m in index.complete("@sam")], ["@sam", "@samantha", "@sammy"])
+
+	def test_later_display_name_fills_in_a_mention(self):
+		index = CompletionIndex()
+		index.add_items([status(1, account("a"), mentions=[account("river")])])
+		index.add_accounts([account("river", "River Song")])
+		self.assertEqual(index.complete("@riv")[0]["label"], "River Song (@river)")
+
+	def test_lookup_examines_a_bounded_number_of_keys_over_a_large_index(self):
+		index = CompletionIndex()
+		index.add_accounts(account(f"user{i}@instance{i % 50}.example", f"Person {i}") for i in range(50000))
+		examined = CountingKeys(index.account_keys.keys)
+		index.account_keys.keys = examined
+		results = index.complete("@u")
+		self.assertEqual(len(results), 8)
+		self.assertEqual(examined.reads, COMPLETION_SCAN_LIMIT)
+
+
+if __name__ == "__main__":
+	unittest.main()
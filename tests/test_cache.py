@@ -0,0 +1,158 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from mastodon import MastodonNotFoundError
+
+from cache import ACCOUNT_BATCH_SIZE, RELATIONSHIP_BATCH_SIZE, AccountCache, CollectionCache, RelationshipCache, TTLCache, author_ids
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+class FakeMastodon:
+	def __init__(self):
+		self.calls = []
+
+	def account_relationships(self, ids):
+		self.calls.append(list(ids))
+		return [{"id": account_id, "following": account_id == "1"} for account_id in ids]
+
+
+class FakeAccountsApi:
+	def __init__(self, collection=None, batched=True):
+		self.collection = collection
+		self.batched = batched
+		self.calls = []
+
+	def _Mastodon__api_request(self, method, endpoint, params={}, use_json=False):
+		self.calls.append((endpoint, params.get("id[]")))
+		if endpoint == "/api/v1/accounts":
+			if not self.batched:
+				raise MastodonNotFoundError("Not found")
+			return [{"id": account_id, "acct": f"user{account_id}"} for account_id in params["id[]"]]
+		return self.collection
+
+	def account(self, account_id):
+		self.calls.append(("single", account_id))
+		return {"id": account_id, "acct": f"user{account_id}"}
+
+
+class TTLCacheTests(unittest.TestCase):
+	def test_entries_expire_after_ttl(self):
+		clock = FakeClock()
+		cache = TTLCache(10, clock)
+		cache.set("a", 1)
+		clock.now = 10
+		self.assertEqual(cache.get("a"), 1)
+		clock.now = 10.5
+		self.assertIsNone(cache.get("a"))
+
+
+class RelationshipCacheTests(unittest.TestCase):
+	def test_fetch_only_requests_missing_ids(self):
+		mastodon = FakeMastodon()
+		cache = RelationshipCache()
+		cache.store({"id": "1", "following": False})
+		result = cache.fetch(mastodon, [1, "2", "2", "3"])
+		self.assertEqual(mastodon.calls, [["2", "3"]])
+		self.assertFalse(result["1"]["following"])
+		self.assertEqual(sorted(result), ["1", "2", "3"])
+
+	def test_fetch_splits_large_pages_into_batches(self):
+		mastodon = FakeMastodon()
+		cache = RelationshipCache()
+		cache.fetch(mastodon, [str(i) for i in range(RELATIONSHIP_BATCH_SIZE + 5)])
+		self.assertEqual([len(batch) for batch in mastodon.calls], [RELATIONSHIP_BATCH_SIZE, 5])
+
+	def test_action_response_replaces_cached_relationship(self):
+		mastodon = FakeMastodon()
+		cache = RelationshipCache()
+		self.assertFalse(cache.lookup(mastodon, "5")["following"])
+		cache.store({"id": "5", "following": True})
+		self.assertTrue(cache.lookup(mastodon, "5")["following"])
+		self.assertEqual(len(mastodon.calls), 1)
+
+	def test_invalidate_forces_refetch(self):
+		mastodon = FakeMastodon()
+		cache = RelationshipCache()
+		cache.lookup(mastodon, "1")
+		cache.invalidate(1)
+		cache.lookup(mastodon, "1")
+		self.assertEqual(mastodon.calls, [["1"], ["1"]])
+
+
+class AccountCacheTests(unittest.TestCase):
+	def test_fetch_batches_only_the_missing_accounts(self):
+		api = FakeAccountsApi()
+		cache = AccountCache()
+		cache.store([{"id": "0", "acct": "known"}])
+		result = cache.fetch(api, [0] + [str(i) for i in range(1, ACCOUNT_BATCH_SIZE + 3)])
+		self.assertEqual([len(ids) for _, ids in api.calls], [ACCOUNT_BATCH_SIZE, 2])
+		self.assertEqual(result["0"]["acct"], "known")
+		self.assertEqual(len(result), ACCOUNT_BATCH_SIZE + 3)
+
+	def test_servers_without_the_multi_id_endpoint_get_single_lookups(self):
+		api = FakeAccountsApi(batched=False)
+		cache = AccountCache()
+		cache.fetch(api, ["1", "2"])
+		cache.fetch(api, ["3"])
+		self.assertEqual(api.calls, [("/api/v1/accounts", ["1", "2"]), ("single", "1"), ("single", "2"), ("single", "3")])
+
+
+class CollectionCacheTests(unittest.TestCase):
+	def collection(self, member_count, embedded_count):
+		items = [{"id": f"i{n}", "account_id": str(n)} for n in range(member_count)]
+		return {
+			"collection": {"id": "c1", "name": "Friends", "items": items},
+			"accounts": [{"id": str(n), "acct": f"embedded{n}"} for n in range(embedded_count)],
+		}
+
+	def test_members_the_response_embeds_cost_no_extra_requests(self):
+		api = FakeAccountsApi(self.collection(100, 100))
+		collection, accounts = CollectionCache().load(api, {"id": "c1"}, AccountCache())
+		self.assertEqual(collection["name"], "Friends")
+		self.assertEqual(len(accounts), 100)
+		self.assertEqual(api.calls, [("/api/v1/collections/c1", None)])
+
+	def test_missing_members_are_hydrated_in_one_batch_and_kept_in_item_order(self):
+		api = FakeAccountsApi(self.collection(30, 10))
+		_, accounts = CollectionCache().load(api, {"id": "c1"}, AccountCache())
+		self.assertEqual([account["id"] for account in accounts], [str(n) for n in range(30)])
+		self.assertEqual(len(api.calls), 2)
+		self.assertEqual(len(api.calls[1][1]), 20)
+
+	def test_detail_is_reused_until_invalidated(self):
+		api = FakeAccountsApi(self.collection(3, 3))
+		cache = CollectionCache()
+		accounts = AccountCache()
+		cache.load(api, {"id": "c1"}, accounts)
+		cache.load(api, {"id": "c1"}, accounts)
+		self.assertEqual(len(api.calls), 1)
+		cache.invalidate("c1")
+		cache.load(api, {"id": "c1"}, accounts)
+		self.assertEqual(len(api.calls), 2)
+
+
+class AuthorIdsTests(unittest.TestCase):
+	def test_collects_authors_boosters_and_notification_accounts(self):
+		items = [
+			{"id": "s1", "account": {"id": "1"}, "reblog": {"account": {"id": "2"}}},
+			{"id": "n1", "type": "mention", "account": {"id": "3"}, "status": {"account": {"id": "3"}}},
+			{"id": "s2", "account": {"id": "1"}},
+		]
+		self.assertEqual(author_ids(items), ["1", "2", "3"])
+
+
+if __name__ == "__main__":
+	unittest.main()
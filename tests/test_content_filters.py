@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from content_filters import AhoCorasick, FilterEngine, server_filter_rules, timeline_context, valid_pattern
+from post_rendering import derived_text
+
+
+def status(status_id, content, acct="alex", reblog=None, **extra):
+	return dict({"id": status_id, "content": f"<p>{content}</p>", "spoiler_text": "", "account": {"acct": acct}, "reblog": reblog}, **extra)
+
+
+class AhoCorasickTests(unittest.TestCase):
+	def test_finds_overlapping_keywords_in_one_pass(self):
+		automaton = AhoCorasick(["he", "she", "his", "hers"])
+		found = {(start, end, automaton.keywords[index]) for start, end, index in automaton.finditer("ushers")}
+		self.assertEqual(found, {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")})
+
+	def test_empty_automaton_matches_nothing(self):
+		self.assertFalse(AhoCorasick([]))
+		self.assertEqual(list(AhoCorasick([]).finditer("anything")), [])
+
+
+class FilterEngineTests(unittest.TestCase):
+	def setUp(self):
+		derived_text.clear()
+
+	def tearDown(self):
+		derived_text.clear()
+
+	def test_keywords_whole_words_and_patterns(self):
+		engine = FilterEngine([
+			{"kind": "keyword", "value": "Spoiler"},
+			{"kind": "keyword", "value": "cat", "whole_word": True},
+			{"kind": "regex", "value": r"\bep(isode)?\s*\d+"},
+		])
+		self.assertTrue(engine.hides(status(1, "Big SPOILERS ahead"), "home"))
+		self.assertTrue(engine.hides(status(2, "my cat!"), "home"))
+		self.assertFalse(engine.hides(status(3, "concatenate"), "home"))
+		self.assertTrue(engine.hides(status(4, "Watching Episode 12"), "public"))
+		self.assertFalse(engine.hides(status(5, "nothing to see"), "home"))
+
+	def test_patterns_that_cannot_share_the_combined_regex_still_apply(self):
+		self.assertFalse(valid_pattern("(unclosed"))
+		engine = FilterEngine([
+			{"kind": "regex", "value": "(?i)spoiler"},
+			{"kind": "regex", "value": "(?P<w>a)x"},
+			{"kind": "regex", "value": "(?P<w>b)y"},
+			{"kind": "regex", "value": "leak"},
+			{"kind": "regex", "value": "(unclosed"},
+		])
+		kept = [item["id"] for item in engine.apply([status(1, "SPOILER"), status(2, "ax"), status(3, "by"), status(4, "a leak"), status(5, "fine")], "home")]
+		self.assertEqual(kept, [5])
+
+	def test_numbered_backreferences_keep_pointing_at_their_own_group(self):
+		engine = FilterEngine([{"kind": "regex", "value": r"(a)\1"}, {"kind": "regex", "value": r"(b)\1"}])
+		self.assertTrue(engine.hides(status(1, "bb"), "home"))
+		self.assertTrue(engine.hides(status(2, "aa"), "home"))
+		self.assertFalse(engine.hides(status(3, "ab"), "home"))
+
+	def test_own_posts_are_never_hidden(self):
+		engine = FilterEngine([{"kind": "keyword", "value": "spoiler"}], own_account_id=7)
+		mine = status(1, "spoiler", account={"acct": "me", "id": "7"})
+		theirs = status(2, "spoiler")
+		self.assertFalse(engine.hides(mine, "home"))
+		self.assertEqual(engine.apply([mine, theirs], "home"), [mine])
+
+	def test_matches_cw_poll_options_and_media_descriptions(self):
+		engine = FilterEngine([{"kind": "keyword", "value": "politics"}])
+		self.assertTrue(engine.hides(status(1, "x", spoiler_text="Politics"), "home"))
+		self.assertTrue(engine.hides(status(2, "x", poll={"options": [{"title": "politics"}]}), "home"))
+		self.assertTrue(engine.hides(status(3, "x", media_attachments=[{"description": "politics meme"}]), "home"))
+
+	def test_account_and_boost_rules(self):
+		engine = FilterEngine([{"kind": "account", "value": "@Troll@example.com"}, {"kind": "boosts", "value": "sam"}])
+		original = status(1, "hi", acct="troll@example.com")
+		self.assertTrue(engine.hides(original, "home"))
+		self.assertTrue(engine.hides(status(2, "", acct="kim", reblog=original), "home"))
+		self.assertTrue(engine.hides(status(3, "", acct="sam", reblog=status(4, "fine")), "home"))
+		self.assertFalse(engine.hides(status(5, "fine", acct="sam"), "home"))
+		self.assertTrue(engine.hides({"id": "n", "type": "follow", "account": {"acct": "troll@example.com"}}, "notifications"))
+		engine.set_local_rules([{"kind": "boosts", "value": "*"}])
+		self.assertTrue(engine.hides(status(6, "", acct="kim", reblog=status(7, "fine")), "home"))
+
+	def test_server_filters_respect_action_context_and_expiry(self):
+		now = datetime(2024, 5, 1, tzinfo=timezone.utc)
+		server = [
+			{"title": "Hide", "filter_action": "hide", "context": ["home"], "keywords": [{"keyword": "crypto", "whole_word": True}], "statuses": [{"status_id": "99"}]},
+			{"title": "Warn", "filter_action": "warn", "context": ["home"], "keywords": [{"keyword": "sports"}]},
+			{"title": "Old", "filter_action": "hide", "context": ["home"], "expires_at": now - timedelta(days=1), "keywords": [{"keyword": "weather"}]},
+		]
+		self.assertEqual([rule["value"] for rule in server_filter_rules(server, now)], ["crypto", "99"])
+		engine = FilterEngine(server_filters=server)
+		self.assertTrue(engine.hides(status(1, "crypto news"), "home"))
+		self.assertTrue(engine.hides(status(99, "anything"), "home"))
+		self.assertFalse(engine.hides(status(1, "crypto news"), "public"))
+		self.assertFalse(engine.hides(status(2, "sports"), "home"))
+
+	def test_apply_and_contexts(self):
+		engine = FilterEngine([{"kind": "keyword", "value": "nope"}])
+		items = [status(1, "yes"), status(2, "nope"), {"id": "n", "type": "mention", "status": status(3, "nope")}]
+		self.assertEqual([item["id"] for item in engine.apply(items, "home")], [1])
+		self.assertEqual(len(engine.apply(items, None)), 3)
+		self.assertEqual(timeline_context("hashtag:python"), "public")
+		self.assertEqual(timeline_context("user:1"), "account")
+		self.assertIsNone(timeline_context("bookmarks"))
+
+	def test_heavy_keyword_lists_do_not_slow_ingest(self):
+		page = [status(i, "A perfectly ordinary post about gardens and coffee and the weather today " * 4) for i in range(200)]
+
+		def best_time(engine):
+			engine.apply(page, "home")
+			return min(self._time(lambda: engine.apply(page, "home")) for _ in range(5))
+
+		light = best_time(FilterEngine([{"kind": "keyword", "value": "zebra"}]))
+		heavy = best_time(FilterEngine([{"kind": "keyword", "value": f"keyword{i}"} for i in range(3000)]))
+		self.assertLess(heavy, light * 3 + 0.005)
+
+	@staticmethod
+	def _time(func):
+		start = time.perf_counter()
+		func()
+		return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+	unittest.main()
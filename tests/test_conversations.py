@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from conversations import ConversationStore
+
+
+def conversation(conversation_id, status_id, unread=False):
+	return {"id": conversation_id, "unread": unread, "accounts": [{"id": "a1"}], "last_status": {"id": status_id}}
+
+
+class ConversationStoreTests(unittest.TestCase):
+	def test_pages_become_last_statuses_and_keep_their_conversation(self):
+		store = ConversationStore()
+		statuses = store.add_page([conversation("c1", "10", unread=True), {"id": "c2", "last_status": None}, conversation("c3", "8")])
+		self.assertEqual(statuses, [{"id": "10"}, {"id": "8"}])
+		self.assertEqual(store.conversation_for({"id": "10"})["id"], "c1")
+		self.assertEqual(store.unread_total(statuses), 1)
+
+	def test_a_new_message_replaces_the_conversations_old_row(self):
+		store = ConversationStore()
+		items = store.add_page([conversation("c1", "10"), conversation("c2", "9")])
+		index, status = store.update(items, conversation("c2", "12", unread=True))
+		self.assertEqual((index, status), (1, {"id": "12"}))
+		self.assertIsNone(store.conversation_for({"id": "9"}))
+		self.assertTrue(store.is_unread({"id": "12"}))
+
+	def test_conversations_not_loaded_yet_start_a_new_row(self):
+		store = ConversationStore()
+		self.assertEqual(store.update([], conversation("c5", "20")), (None, {"id": "20"}))
+
+	def test_marking_read_reports_the_conversation_once(self):
+		store = ConversationStore()
+		items = store.add_page([conversation("c1", "10", unread=True)])
+		self.assertEqual(store.mark_read(items[0]), "c1")
+		self.assertIsNone(store.mark_read(items[0]))
+		self.assertEqual(store.unread_total(items), 0)
+
+
+if __name__ == "__main__":
+	unittest.main()
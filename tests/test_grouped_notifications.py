@@ -0,0 +1,123 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from grouped_notifications import GROUP_SAMPLE_SIZE, group_actor_label, grouped_page_cursor, groups_from_page, is_expandable, merge_notification, merge_older_groups
+
+
+def account(account_id, name):
+	return {"id": account_id, "display_name": name, "username": name.lower(), "acct": name.lower()}
+
+
+def viral_page(favourites=120):
+	accounts = [account(str(n), f"Fan{n}") for n in range(GROUP_SAMPLE_SIZE)] + [account("me", "Me")]
+	post = {"id": "s1", "content": "<p>big news</p>", "account": accounts[-1]}
+	return {
+		"accounts": accounts,
+		"statuses": [post],
+		"notification_groups": [
+			{
+				"group_key": "favourite-s1-1",
+				"notifications_count": favourites,
+				"type": "favourite",
+				"most_recent_notification_id": "500",
+				"page_min_id": "381",
+				"page_max_id": "500",
+				"latest_page_notification_at": "2026-10-19T10:00:00.000Z",
+				"sample_account_ids": [a["id"] for a in accounts[:GROUP_SAMPLE_SIZE]],
+				"status_id": "s1",
+			},
+			{
+				"group_key": "reblog-s1-1",
+				"notifications_count": 1,
+				"type": "reblog",
+				"most_recent_notification_id": "380",
+				"page_min_id": "380",
+				"page_max_id": "380",
+				"latest_page_notification_at": "2026-10-19T09:00:00.000Z",
+				"sample_account_ids": ["0"],
+				"status_id": "s1",
+			},
+		],
+	}
+
+
+class GroupsFromPageTests(unittest.TestCase):
+	def test_one_row_per_group_sharing_accounts_and_statuses(self):
+		groups = groups_from_page(viral_page())
+		self.assertEqual(len(groups), 2)
+		favourites, boost = groups
+		self.assertEqual(favourites["id"], "500")
+		self.assertEqual(favourites["type"], "favourite")
+		self.assertEqual(favourites["notifications_count"], 120)
+		self.assertEqual(favourites["account"]["display_name"], "Fan0")
+		self.assertEqual(len(favourites["accounts"]), GROUP_SAMPLE_SIZE)
+		self.assertIs(favourites["status"], boost["status"])
+		self.assertIs(favourites["accounts"][0], boost["account"])
+
+	def test_v1_pages_become_single_notification_groups(self):
+		groups = groups_from_page([{"id": "9", "type": "mention", "account": account("1", "Sam"), "status": None}])
+		self.assertEqual(groups[0]["notifications_count"], 1)
+		self.assertEqual(groups[0]["accounts"], [account("1", "Sam")])
+		self.assertFalse(is_expandable(groups[0]))
+
+	def test_next_page_starts_below_the_oldest_notification_covered(self):
+		self.assertEqual(grouped_page_cursor(viral_page()), "380")
+		self.assertEqual(grouped_page_cursor({"notification_groups": []}), None)
+		self.assertEqual(grouped_page_cursor([{"id": "7"}, {"id": "6"}]), "6")
+
+	def test_a_group_reaching_further_back_than_the_last_one_sets_the_cursor(self):
+		page = viral_page()
+		page["notification_groups"][0]["page_min_id"] = "99"
+		self.assertEqual(grouped_page_cursor(page), "99")
+
+	def test_older_pages_fold_groups_already_listed_into_their_row(self):
+		loaded = groups_from_page(viral_page())
+		older_page = viral_page()
+		older_page["notification_groups"][0].update(most_recent_notification_id="300", sample_account_ids=["me"])
+		older_page["notification_groups"][1].update(group_key="reblog-s1-2", most_recent_notification_id="290")
+		added = merge_older_groups(loaded, groups_from_page(older_page))
+		self.assertEqual([group["id"] for group in added], ["290"])
+		self.assertEqual([group["id"] for group in loaded], ["500", "380", "290"])
+		self.assertEqual(loaded[0]["notifications_count"], 120)
+		self.assertEqual(len(loaded[0]["accounts"]), GROUP_SAMPLE_SIZE)
+
+
+class GroupLabelTests(unittest.TestCase):
+	def test_labels_name_the_latest_account_and_count_the_rest(self):
+		favourites, boost = groups_from_page(viral_page())
+		self.assertEqual(group_actor_label(favourites), "Fan0 and 119 others")
+		self.assertEqual(group_actor_label(boost), "Fan0")
+		pair = dict(favourites, notifications_count=2)
+		self.assertEqual(group_actor_label(pair), "Fan0 and Fan1")
+		self.assertEqual(group_actor_label(dict(boost, notifications_count=2)), "Fan0 and 1 other")
+		self.assertTrue(is_expandable(favourites))
+
+
+class MergeNotificationTests(unittest.TestCase):
+	def test_streamed_notification_joins_its_group(self):
+		groups = groups_from_page(viral_page())
+		newcomer = account("new", "Newcomer")
+		index, merged = merge_notification(groups, {"id": "501", "type": "favourite", "group_key": "favourite-s1-1", "account": newcomer, "status": None, "created_at": "2026-10-19T11:00:00.000Z"})
+		self.assertEqual(index, 0)
+		self.assertEqual(merged["id"], "501")
+		self.assertEqual(merged["notifications_count"], 121)
+		self.assertEqual(merged["accounts"][0], newcomer)
+		self.assertEqual(len(merged["accounts"]), GROUP_SAMPLE_SIZE)
+		self.assertEqual(merged["status"]["id"], "s1")
+		self.assertEqual(groups[0]["notifications_count"], 120)
+
+	def test_ungrouped_types_start_their_own_row(self):
+		groups = groups_from_page(viral_page())
+		index, item = merge_notification(groups, {"id": "502", "type": "mention", "group_key": "ungrouped-502", "account": account("2", "Kim")})
+		self.assertIsNone(index)
+		self.assertEqual(item["notifications_count"], 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from mastodon import MastodonNotFoundError
+
+from hydration import StatusHydrator, hydrated_item, shallow_quote_id
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+class FakeMastodon:
+	def __init__(self, statuses=None, missing_endpoint=False):
+		self.statuses = statuses or {}
+		self.missing_endpoint = missing_endpoint
+		self.calls = []
+
+	def _Mastodon__api_request(self, method, endpoint, params={}, use_json=False):
+		self.calls.append((method, endpoint, params["id[]"]))
+		if self.missing_endpoint:
+			raise MastodonNotFoundError("Not found")
+		return [self.statuses[status_id] for status_id in params["id[]"] if status_id in self.statuses]
+
+
+def status(status_id, favourites=0, quote=None, reblog=None):
+	return {"id": status_id, "content": f"<p>post {status_id}</p>", "favourites_count": favourites, "quote": quote, "reblog": reblog}
+
+
+class HydratedItemTests(unittest.TestCase):
+	def test_replaces_a_status_with_its_fresh_copy(self):
+		old = status("1")
+		new = status("1", favourites=5)
+		self.assertIs(hydrated_item(old, {"1": new}), new)
+
+	def test_unchanged_items_are_returned_as_is(self):
+		old = status("1")
+		self.assertIs(hydrated_item(old, {"1": status("1")}), old)
+		self.assertIs(hydrated_item(old, {"2": status("2")}), old)
+
+	def test_boosts_keep_their_wrapper_and_take_the_fresh_post(self):
+		boost = status("10", reblog=status("1"))
+		result = hydrated_item(boost, {"1": status("1", favourites=3)})
+		self.assertEqual(result["id"], "10")
+		self.assertEqual(result["reblog"]["favourites_count"], 3)
+		self.assertEqual(boost["reblog"]["favourites_count"], 0)
+
+	def test_notifications_take_the_fresh_post(self):
+		notification = {"id": "n1", "type": "favourite", "status": status("1")}
+		result = hydrated_item(notification, {"1": status("1", favourites=2)})
+		self.assertEqual(result["id"], "n1")
+		self.assertEqual(result["status"]["favourites_count"], 2)
+
+	def test_shallow_quotes_are_filled_in(self):
+		quoting = status("1", quote={"state": "accepted", "quoted_status_id": "7"})
+		self.assertEqual(shallow_quote_id(quoting), "7")
+		result = hydrated_item(quoting, {"7": status("7")})
+		self.assertEqual(result["quote"]["quoted_status"]["id"], "7")
+		self.assertEqual(result["quote"]["state"], "accepted")
+		self.assertIsNone(shallow_quote_id(result))
+
+
+class StatusHydratorTests(unittest.TestCase):
+	def test_only_stale_posts_and_shallow_quotes_are_requested(self):
+		clock = FakeClock()
+		hydrator = StatusHydrator(ttl=60, clock=clock)
+		items = [status("1"), status("2", quote={"quoted_status_id": "9"}), {"id": "n", "type": "mention", "status": status("3")}]
+		hydrator.mark_fresh(items)
+		self.assertEqual(hydrator.stale_ids(items), ["9"])
+		clock.now = 61
+		self.assertEqual(hydrator.stale_ids(items), ["1", "2", "9", "3"])
+		self.assertEqual(hydrator.stale_ids(items, limit=2), ["1", "2"])
+
+	def test_fetches_twenty_ids_per_request(self):
+		api = FakeMastodon({str(i): status(str(i)) for i in range(45)})
+		hydrator = StatusHydrator()
+		ids = [str(i) for i in range(45)]
+		found = hydrator.fetch(api, ids)
+		self.assertEqual([len(call[2]) for call in api.calls], [20, 20, 5])
+		self.assertEqual(api.calls[0][:2], ("GET", "/api/v1/statuses"))
+		self.assertEqual(len(found), 45)
+		self.assertEqual(hydrator.stale_ids([status(i) for i in ids]), [])
+
+	def test_missing_statuses_are_not_asked_for_again_while_fresh(self):
+		api = FakeMastodon({})
+		hydrator = StatusHydrator()
+		self.assertEqual(hydrator.fetch(api, ["5"]), {})
+		self.assertEqual(hydrator.stale_ids([status("5")]), [])
+
+	def test_servers_without_the_endpoint_stop_further_requests(self):
+		api = FakeMastodon(missing_endpoint=True)
+		hydrator = StatusHydrator()
+		self.assertEqual(hydrator.fetch(api, [str(i) for i in range(40)]), {})
+		self.assertFalse(hydrator.supported)
+		self.assertEqual(len(api.calls), 1)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,148 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from local_search import (
+	LocalSearchStore,
+	compose_search_query,
+	fts_query,
+	merge_search_results,
+	parse_search_query,
+	server_query,
+)
+from post_rendering import derived_text
+
+
+def status(status_id, content, acct="alex", day=1, visibility="public", media=False, **extra):
+	return dict({
+		"id": status_id,
+		"content": f"<p>{content}</p>",
+		"spoiler_text": "",
+		"visibility": visibility,
+		"created_at": datetime(2024, 5, day, 12, tzinfo=timezone.utc),
+		"media_attachments": [{"type": "image"}] if media else [],
+		"tags": [],
+		"account": {"id": f"a-{acct}", "acct": acct, "username": acct, "display_name": acct.title(), "note": '<p>Writes about birds with <span class="h-card"><a href="https://example.com/@robin" class="u-url mention">@robin</a></span></p>'},
+	}, **extra)
+
+
+class QueryTests(unittest.TestCase):
+	def test_parse_search_query_pulls_out_filters(self):
+		text, filters = parse_search_query('garden "cut flowers" from:@Sam has:media after:2024-05-01 before:2024-05-10 visibility:unlisted is:reply')
+		self.assertEqual(text, 'garden "cut flowers" is:reply')
+		self.assertEqual(filters["author"], "sam")
+		self.assertTrue(filters["has_media"])
+		self.assertEqual(filters["visibility"], "unlisted")
+		self.assertEqual(filters["after"], datetime(2024, 5, 2, tzinfo=timezone.utc).timestamp())
+		self.assertEqual(filters["before"], datetime(2024, 5, 10, tzinfo=timezone.utc).timestamp())
+
+	def test_compose_and_server_query(self):
+		query = compose_search_query("garden", "@sam", after="2024-05-01", has_media=True, visibility="private")
+		self.assertEqual(query, "garden from:sam after:2024-05-01 has:media visibility:private")
+		self.assertEqual(server_query(query), "garden from:sam after:2024-05-01 has:media")
+		with self.assertRaises(ValueError):
+			compose_search_query("garden", before="last week")
+
+	def test_fts_query_prefixes_words_and_keeps_phrases(self):
+		self.assertEqual(fts_query('Gard "cut  flowers" x"y'), '"gard"* "cut flowers" "x"* "y"*')
+		self.assertEqual(fts_query("  "), "")
+
+
+class LocalSearchStoreTests(unittest.TestCase):
+	def setUp(self):
+		derived_text.clear()
+		self.store = LocalSearchStore(":memory:")
+		self.store.add_many([
+			status("1", "Morning coffee in the garden", day=1),
+			status("2", "Garden party photos", acct="sam", day=3, media=True),
+			status("3", "Private garden notes", day=5, visibility="private"),
+			{"id": "n1", "type": "follow", "account": {"id": "a-kim", "acct": "kim", "display_name": "Kim", "note": ""}},
+			{"id": "n2", "type": "mention", "account": status("x", "", acct="sam")["account"], "status": status("4", "Coffee tasting with sam", acct="lee", day=7)},
+		])
+
+	def tearDown(self):
+		self.store.close()
+		derived_text.clear()
+
+	def ids(self, query):
+		return [item["id"] for item in self.store.search(query)]
+
+	def test_prefix_phrase_and_filters(self):
+		self.assertEqual(set(self.ids("gard")), {"1", "2", "3"})
+		self.assertEqual(self.ids('"coffee in the garden"'), ["1"])
+		self.assertEqual(self.ids("garden from:sam"), ["2"])
+		self.assertEqual(self.ids("garden has:media"), ["2"])
+		self.assertEqual(self.ids("garden visibility:private"), ["3"])
+		self.assertEqual(set(self.ids("after:2024-05-02")), {"2", "3", "4"})
+		self.assertEqual(self.ids("before:2024-05-03"), ["1"])
+		self.assertEqual(self.store.search(""), [])
+
+	def test_results_round_trip_with_datetimes(self):
+		found = self.store.search("tasting")[0]
+		self.assertEqual(found["created_at"], datetime(2024, 5, 7, 12, tzinfo=timezone.utc))
+		self.assertEqual(found["account"]["acct"], "lee")
+
+	def test_author_matches_rank_first(self):
+		self.assertEqual(self.ids("sam")[0], "2")
+
+	def test_accounts_from_statuses_and_notifications(self):
+		self.assertEqual([a["acct"] for a in self.store.search_accounts("@ki")], ["kim"])
+		self.assertEqual({a["acct"] for a in self.store.search_accounts("birds")}, {"alex", "sam", "lee"})
+		# Bios are indexed as text, so their markup does not make every account match.
+		self.assertEqual(self.store.search_accounts("mention"), [])
+
+	def test_edits_replace_and_deletes_remove(self):
+		self.store.add(status("1", "Evening tea", edited_at=datetime(2024, 5, 2, tzinfo=timezone.utc)))
+		self.assertNotIn("1", self.ids("coffee"))
+		self.assertEqual(self.ids("tea"), ["1"])
+		self.store.add_later([status("5", "Queued write")])
+		self.store.remove_later("2")
+		self.store.flush()
+		self.assertEqual(self.ids("queued"), ["5"])
+		self.assertEqual(self.ids("party"), [])
+		self.assertEqual(len(self.store), 4)
+
+	def test_persists_between_sessions(self):
+		with tempfile.TemporaryDirectory() as folder:
+			path = os.path.join(folder, "search.db")
+			store = LocalSearchStore(path)
+			store.add(status("9", "Saved for later"))
+			store.close()
+			store = LocalSearchStore(path)
+			self.assertEqual([item["id"] for item in store.search("saved")], ["9"])
+			store.close()
+
+
+	def test_bios_indexed_as_html_by_an_older_version_are_reindexed_on_open(self):
+		with tempfile.TemporaryDirectory() as folder:
+			path = os.path.join(folder, "search.db")
+			store = LocalSearchStore(path)
+			store.add(status("9", "Saved for later"))
+			with store.conn:
+				# What the first release wrote: the raw note HTML, and no schema version.
+				store.conn.execute("UPDATE accounts_fts SET note = ?", ('<p>Writes about birds with <a class="u-url mention">@robin</a></p>',))
+				store.conn.execute("PRAGMA user_version = 0")
+			self.assertEqual(len(store.search_accounts("mention")), 1)
+			store.close()
+			store = LocalSearchStore(path)
+			self.assertEqual(store.search_accounts("mention"), [])
+			self.assertEqual([account["acct"] for account in store.search_accounts("birds")], ["alex"])
+			store.close()
+
+class MergeTests(unittest.TestCase):
+	def test_server_results_append_after_local_and_respect_filters(self):
+		local = [status("1", "a"), status("2", "b")]
+		server = [status("2", "b"), status("3", "c"), status("4", "d", visibility="direct")]
+		merged = merge_search_results(local, server, {"visibility": "public"})
+		self.assertEqual([item["id"] for item in merged], ["1", "2", "3"])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from markers import ReadPositions, id_newer, unread_count
+
+
+class IdTests(unittest.TestCase):
+	def test_longer_ids_are_newer(self):
+		self.assertTrue(id_newer("100", "99"))
+		self.assertFalse(id_newer("99", "100"))
+		self.assertFalse(id_newer("100", "100"))
+
+	def test_unread_stops_at_the_first_read_item(self):
+		items = [{"id": "105"}, {"id": "104"}, {"id": "103"}, {"id": "102"}]
+		self.assertEqual(unread_count(items, "103"), 2)
+		self.assertEqual(unread_count(items, "105"), 0)
+		self.assertEqual(unread_count(items, None), 0)
+
+
+class ReadPositionsTests(unittest.TestCase):
+	def test_positions_only_move_forward(self):
+		positions = ReadPositions({"home": "100"})
+		self.assertFalse(positions.advance("home", "90"))
+		self.assertTrue(positions.advance("home", "110"))
+		self.assertEqual(positions.get("home"), "110")
+		self.assertFalse(positions.advance("local", "1"))
+
+	def test_server_markers_ahead_of_ours_win_and_ours_ahead_are_resent(self):
+		positions = ReadPositions({"home": "100", "notifications": "50"})
+		positions.merge({"home": {"last_read_id": "120"}, "notifications": {"last_read_id": "40"}})
+		self.assertEqual(positions.get("home"), "120")
+		self.assertEqual(positions.take_pending(), {"notifications": "50"})
+
+	def test_pending_positions_are_taken_once_and_can_be_put_back(self):
+		positions = ReadPositions()
+		positions.advance("home", "7")
+		self.assertEqual(positions.take_pending(), {"home": "7"})
+		self.assertEqual(positions.take_pending(), {})
+		positions.mark_unsaved(["home"])
+		self.assertEqual(positions.take_pending(), {"home": "7"})
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -11,8 +11,13 @@ from mastodon_api import (
 	SUPPORTED_NOTIFICATION_TYPES,
 	collections_from_response,
 	fetch_account_statuses,
+	fetch_accounts,
+	fetch_markers,
 	fetch_notification_policy,
 	fetch_notifications,
+	fetch_statuses,
+	fetch_unread_count,
+	save_markers,
 	search_v2,
 	update_current_profile,
 	update_notification_policy,
@@ -72,6 +77,38 @@ class MastodonApiTests(unittest.TestCase):
 		self.assertEqual(api.calls[0][2]["exclude_direct"], True)
 		self.assertEqual(api.calls[0][2]["limit"], 20)
 
+	def test_statuses_are_fetched_in_one_multi_id_request(self):
+		api = FakeMastodon()
+
+		fetch_statuses(api, ("1", "2", "3"))
+
+		self.assertEqual(api.calls[0], ("GET", "/api/v1/statuses", {"id[]": ["1", "2", "3"]}, False))
+
+	def test_accounts_are_fetched_in_one_multi_id_request(self):
+		api = FakeMastodon()
+
+		fetch_accounts(api, ["4", "5"])
+
+		self.assertEqual(api.calls[0], ("GET", "/api/v1/accounts", {"id[]": ["4", "5"]}, False))
+
+	def test_unread_count_can_be_limited_to_types(self):
+		api = FakeMastodon()
+
+		fetch_unread_count(api)
+		fetch_unread_count(api, types=["mention"])
+
+		self.assertEqual(api.calls[0], ("GET", "/api/v1/notifications/unread_count", {}, False))
+		self.assertEqual(api.calls[1][2], {"types[]": ["mention"]})
+
+	def test_markers_are_read_and_written_per_timeline(self):
+		api = FakeMastodon()
+
+		fetch_markers(api, ("home", "notifications"))
+		save_markers(api, {"home": "103"})
+
+		self.assertEqual(api.calls[0], ("GET", "/api/v1/markers", {"timeline[]": ["home", "notifications"]}, False))
+		self.assertEqual(api.calls[1], ("POST", "/api/v1/markers", {"home": {"last_read_id": "103"}}, True))
+
 	def test_profile_update_flattens_field_attributes(self):
 		api = FakeMastodon()
 
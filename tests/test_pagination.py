@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from pagination import AccountPager, near_end
+
+
+class Page(list):
+	def __init__(self, items, next_page=None):
+		super().__init__(items)
+		self._pagination_next = next_page
+
+
+class FakeMastodon:
+	def __init__(self, pages):
+		self.pages = pages
+		self.calls = []
+
+	def fetch_next(self, previous_page):
+		self.calls.append(previous_page._pagination_next)
+		return self.pages[previous_page._pagination_next]
+
+
+class AccountPagerTests(unittest.TestCase):
+	def test_follows_next_links_until_exhausted(self):
+		mastodon = FakeMastodon({
+			"p2": Page([{"id": "3"}, {"id": "4"}], "p3"),
+			"p3": Page([{"id": "5"}]),
+		})
+		pager = AccountPager(mastodon, lambda: Page([{"id": "1"}, {"id": "2"}], "p2"))
+		while pager.has_more:
+			pager.add_page(pager.fetch())
+		self.assertEqual([account["id"] for account in pager.items], ["1", "2", "3", "4", "5"])
+		self.assertEqual(mastodon.calls, ["p2", "p3"])
+		self.assertEqual(pager.pages, 3)
+		self.assertIsNone(pager.fetch())
+
+	def test_plain_list_is_a_single_page(self):
+		pager = AccountPager(FakeMastodon({}), lambda: [{"id": "1"}])
+		self.assertTrue(pager.has_more)
+		pager.add_page(pager.fetch())
+		self.assertFalse(pager.has_more)
+
+	def test_duplicate_accounts_across_pages_are_skipped(self):
+		pager = AccountPager(FakeMastodon({}), lambda: None)
+		pager.add_page(Page([{"id": "1"}], "next"))
+		added = pager.add_page(Page([{"id": "1"}, {"id": "2"}]))
+		self.assertEqual(added, [{"id": "2"}])
+		pager.remove(0)
+		self.assertTrue(pager.append({"id": "1"}))
+		self.assertFalse(pager.append({"id": "2"}))
+
+
+class NearEndTests(unittest.TestCase):
+	def test_margin(self):
+		self.assertFalse(near_end(5, 80, margin=10))
+		self.assertTrue(near_end(70, 80, margin=10))
+		self.assertFalse(near_end(-1, 0))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from polling import POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, STREAM_RETRY_MAX, STREAM_RETRY_MIN, RefreshScheduler, rate_limited_interval
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+class RateLimitTests(unittest.TestCase):
+	def test_spreads_a_share_of_the_remaining_requests_over_the_window(self):
+		self.assertEqual(rate_limited_interval(100, 250, 2), 20)
+		self.assertEqual(rate_limited_interval(None, 250, 2), 0)
+		self.assertEqual(rate_limited_interval(100, -5, 2), 0)
+
+
+class RefreshSchedulerTests(unittest.TestCase):
+	def test_nothing_is_polled_while_the_stream_is_up(self):
+		scheduler = RefreshScheduler(["home"], clock=FakeClock())
+		self.assertEqual(scheduler.due(), [])
+
+	def test_every_timeline_is_due_once_the_stream_drops_and_not_again_until_polled(self):
+		scheduler = RefreshScheduler(["home", "notifications"], clock=FakeClock())
+		scheduler.stream_lost()
+		self.assertEqual(scheduler.due(), ["home", "notifications"])
+		self.assertEqual(scheduler.due(), [])
+
+	def test_quiet_timelines_back_off_and_busy_ones_reset(self):
+		clock = FakeClock()
+		scheduler = RefreshScheduler(["home"], clock=clock)
+		scheduler.stream_lost()
+		for _ in range(20):
+			scheduler.due()
+			scheduler.polled("home", 0)
+		self.assertEqual(scheduler.schedules["home"].interval, POLL_MAX_INTERVAL)
+		scheduler.polled("home", 3)
+		self.assertEqual(scheduler.schedules["home"].next_at, POLL_MIN_INTERVAL)
+		clock.now = POLL_MIN_INTERVAL
+		self.assertEqual(scheduler.due(), ["home"])
+
+	def test_low_rate_limit_stretches_the_interval(self):
+		scheduler = RefreshScheduler(["home"], clock=FakeClock())
+		scheduler.stream_lost()
+		scheduler.polled("home", 5, remaining=4, reset_in=100)
+		self.assertEqual(scheduler.schedules["home"].next_at, 100)
+
+	def test_reconnects_back_off_until_the_stream_is_alive_again(self):
+		scheduler = RefreshScheduler(["home"], clock=FakeClock())
+		self.assertEqual(scheduler.stream_lost(), STREAM_RETRY_MIN)
+		self.assertEqual(scheduler.stream_lost(), STREAM_RETRY_MIN * 2)
+		for _ in range(10):
+			scheduler.stream_lost()
+		self.assertEqual(scheduler.stream_lost(), STREAM_RETRY_MAX)
+		self.assertTrue(scheduler.stream_alive())
+		self.assertFalse(scheduler.stream_alive())
+		self.assertEqual(scheduler.due(), [])
+		self.assertEqual(scheduler.stream_lost(), STREAM_RETRY_MIN)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -1,13 +1,27 @@
 import os
+import re
 import sys
 import unittest
+from collections import Counter
+from unittest import mock
 
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
 sys.path.insert(0, MASTODON_DIR)
 
-from post_rendering import build_status_body_html, status_plain_text
+import post_rendering
+from post_rendering import (
+	DerivedTextCache,
+	build_status_body_html,
+	derived_text,
+	extract_links,
+	html_to_plain_text,
+	status_plain_text,
+	status_quote,
+	strip_quote_url_from_html,
+	strip_quote_url_from_text,
+)
 
 
 class PostRenderingTests(unittest.TestCase):
@@ -76,11 +90,182 @@ class PostRenderingTests(unittest.TestCase):
 		self.assertIn("My response", main_article)
 		self.assertNotIn(quoted_url, main_article)
 
+	def test_quote_url_strippers_leave_other_posts_alone(self):
+		url = "https://social.example/@quoted/123"
+		self.assertEqual(strip_quote_url_from_text(f"RE: {url}\n\nReply", url), "Reply")
+		self.assertEqual(strip_quote_url_from_text(f"Reply {url}", url), "Reply")
+		self.assertEqual(strip_quote_url_from_text("RE: https://other.example/1 Reply", url), "RE: https://other.example/1 Reply")
+		html = '<p>Nothing quoted here</p>'
+		self.assertIs(strip_quote_url_from_html(html, url), html)
+		escaped = url + "?a=1&b=2"
+		stripped = strip_quote_url_from_html(f'<p>Reply <a href="{escaped.replace("&", "&amp;")}">{escaped.replace("&", "&amp;")}</a></p>', escaped)
+		self.assertEqual(stripped, "<p>Reply</p>")
+
 	def test_plain_text_matches_copy_and_edit_needs(self):
 		status = {"content": "<p>First<br />Second</p><p>Third</p>"}
 
 		self.assertEqual(status_plain_text(status), "First\nSecond\n\nThird")
 
+	def test_plain_text_keeps_mention_and_link_text(self):
+		content = (
+			'<p><span class="h-card"><a href="https://example.com/@bob" class="u-url mention">@<span>bob</span></a></span> see '
+			'<a href="https://example.com/a/long/path"><span class="invisible">https://</span><span class="ellipsis">example.com/a/lo</span>'
+			'<span class="invisible">ng/path</span></a> &amp; more<br/>next</p><P>Last</P>'
+		)
+
+		self.assertEqual(html_to_plain_text(content), "@bob see https://example.com/a/long/path & more\nnext\n\nLast")
+
+	def test_plain_text_paragraph_break_and_literal_brackets(self):
+		self.assertEqual(html_to_plain_text("<p>One</p><p>Two</p>", paragraph_break=" "), "One Two")
+		self.assertEqual(html_to_plain_text("<p>1 &lt; 2 and 3 < 4</p>"), "1 < 2 and 3 < 4")
+		self.assertEqual(html_to_plain_text(None), "")
+
+	def test_plain_text_keeps_a_long_unclosed_tag_as_text(self):
+		# Backtracking between the tag name and its attributes made this quadratic: tens of seconds at this length.
+		text = "<" + "a" * 100000
+		self.assertEqual(html_to_plain_text(f"<p>{text}</p>"), text)
+		self.assertEqual(html_to_plain_text('<a href="x" class="y">link</a><br/>'), "link")
+
+	def test_extract_links_prefers_hrefs_and_cleans_bare_urls(self):
+		content = '<p><a href="https://example.com/a">example.com/a</a> and www.example.org.</p><p>https://example.net</p>'
+
+		self.assertEqual(extract_links(content), ["https://example.com/a", "www.example.org", "https://example.net"])
+
+
+class DerivedTextCacheTests(unittest.TestCase):
+	def setUp(self):
+		self.calls = []
+
+	def compute(self, status):
+		self.calls.append(status["id"])
+		return status["content"].upper()
+
+	def test_reuses_values_until_the_status_is_edited(self):
+		cache = DerivedTextCache()
+		status = {"id": "1", "content": "a", "edited_at": None}
+
+		self.assertEqual(cache.get(status, "text", self.compute), "A")
+		self.assertEqual(cache.get(dict(status), "text", self.compute), "A")
+		edited = {"id": "1", "content": "b", "edited_at": "2025-01-01T00:00:00Z"}
+		self.assertEqual(cache.get(edited, "text", self.compute), "B")
+		self.assertEqual(self.calls, ["1", "1"])
+
+	def test_boost_key_follows_the_boosted_post_edits(self):
+		boost = {"id": "9", "reblog": {"id": "1", "edited_at": "later"}}
+
+		self.assertEqual(DerivedTextCache.key(boost), ("9", "later"))
+
+	def test_invalidate_and_size_bound(self):
+		cache = DerivedTextCache(limit=2)
+		for status_id in ("1", "2", "3"):
+			cache.get({"id": status_id, "content": "x"}, "text", self.compute)
+		self.assertEqual(len(cache), 2)
+		cache.get({"id": "1", "content": "x"}, "text", self.compute)
+		self.assertEqual(self.calls, ["1", "2", "3", "1"])
+		cache.invalidate("3")
+		cache.get({"id": "3", "content": "x"}, "text", self.compute)
+		self.assertEqual(self.calls[-1], "3")
+
+	def test_statuses_without_ids_are_not_cached(self):
+		cache = DerivedTextCache()
+		cache.get({"id": None, "content": "x"}, "text", self.compute)
+		self.assertEqual(len(cache), 0)
+
+
+def _timeline_page(quoted, size=40):
+	page = []
+	for i in range(size):
+		url = f"https://social.example/@quoted/{i}"
+		status = {
+			"id": str(i),
+			"content": f'<p>Post {i} about <a href="https://example.com/{i}">a link</a> and #tag</p><p>More text</p>',
+			"account": {"display_name": "Alex", "acct": "alex@example.com"},
+		}
+		if quoted:
+			status["content"] = f'<p>RE: <a href="{url}"><span class="invisible">https://</span>social.example/@quoted/{i}</a></p>' + status["content"]
+			status["quote"] = {"quoted_status": {
+				"id": f"q{i}",
+				"url": url,
+				"content": "<p>Quoted body</p>",
+				"account": {"display_name": "Quoted", "acct": "quoted@example.com"},
+			}}
+		page.append(status)
+	return page
+
+
+class _CountingPattern:
+	"""Stands in for a compiled pattern and counts every match, search or substitution run through it."""
+
+	def __init__(self, pattern, counts):
+		self._pattern = pattern
+		self._counts = counts
+
+	def __getattr__(self, name):
+		method = getattr(self._pattern, name)
+		if not callable(method):
+			return method
+
+		def counted(*args, **kwargs):
+			self._counts["regex"] += 1
+			return method(*args, **kwargs)
+		return counted
+
+
+class QuoteRenderingCacheTests(unittest.TestCase):
+	def render(self, page):
+		for status in page:
+			status_plain_text(status)
+			build_status_body_html(status)
+
+	def setUp(self):
+		derived_text.clear()
+
+	def tearDown(self):
+		derived_text.clear()
+
+	def work_per_page(self, page):
+		"""Regex compiles, regex operations and quote-part computations for rendering page twice from a cold cache."""
+		derived_text.clear()
+		counts = Counter()
+		compile_pattern = re._compile
+		quote_parts = post_rendering._quote_parts
+
+		def counting_compile(*args, **kwargs):
+			counts["compile"] += 1
+			return compile_pattern(*args, **kwargs)
+
+		def counting_quote_parts(status):
+			counts["quote_parts"] += 1
+			return quote_parts(status)
+
+		patterns = {name: _CountingPattern(value, counts) for name, value in vars(post_rendering).items() if isinstance(value, re.Pattern)}
+		# re.sub and friends called with a pattern string go through re._compile, cached or not.
+		with mock.patch.object(re, "_compile", counting_compile), mock.patch.multiple(post_rendering, **patterns), mock.patch.object(post_rendering, "_quote_parts", counting_quote_parts):
+			self.render(page)
+			self.render([dict(status) for status in page])
+		return counts
+
+	def test_quote_heavy_page_costs_a_fixed_amount_of_regex_work_per_row(self):
+		size = 40
+		plain = self.work_per_page(_timeline_page(False, size))
+		quoted = self.work_per_page(_timeline_page(True, size))
+		self.assertEqual(plain["compile"], 0)
+		self.assertEqual(quoted["compile"], 0)
+		# One computation per status, none on the second render.
+		self.assertEqual(plain["quote_parts"], size)
+		self.assertEqual(quoted["quote_parts"], size)
+		# Stripping the quote URL is a fixed handful of regex passes per status, and none on the repeat render.
+		self.assertLessEqual(quoted["regex"], plain["regex"] + 8 * size)
+
+	def test_repeat_render_reuses_the_cached_quote_parts(self):
+		page = _timeline_page(True)
+		self.render(page)
+		first = [status_quote(status) for status in page]
+		with mock.patch.object(post_rendering, "_quote_parts", side_effect=AssertionError("quote parts recomputed")):
+			self.render([dict(status) for status in page])
+			self.assertTrue(all(status_quote(dict(status)) is quote for status, quote in zip(page, first)))
+		self.assertEqual(first[0]["quoted_status"]["id"], "q0")
+
 
 if __name__ == "__main__":
 	unittest.main()
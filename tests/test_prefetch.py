@@ -0,0 +1,100 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from prefetch import Prefetcher, RateBudget
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+class ManualTimer:
+	created = []
+
+	def __init__(self, delay, function, args=()):
+		self.function = function
+		self.args = args
+		self.cancelled = False
+		self.daemon = False
+		ManualTimer.created.append(self)
+
+	def start(self):
+		pass
+
+	def cancel(self):
+		self.cancelled = True
+
+	def fire(self):
+		if not self.cancelled:
+			self.function(*self.args)
+
+
+class RateBudgetTests(unittest.TestCase):
+	def test_refills_over_the_period(self):
+		clock = FakeClock()
+		budget = RateBudget(2, period=60, clock=clock)
+		self.assertTrue(budget.take())
+		self.assertTrue(budget.take())
+		self.assertFalse(budget.take())
+		clock.now = 30
+		self.assertTrue(budget.take())
+		self.assertFalse(budget.take())
+
+
+class PrefetcherTests(unittest.TestCase):
+	def setUp(self):
+		ManualTimer.created = []
+
+	def test_moving_the_selection_cancels_pending_jobs(self):
+		ran = []
+		prefetcher = Prefetcher(timer_factory=ManualTimer)
+		prefetcher.schedule([lambda: ran.append("old")])
+		prefetcher.schedule([lambda: ran.append("new")])
+		for timer in ManualTimer.created:
+			timer.fire()
+		self.assertEqual(ran, ["new"])
+
+	def test_jobs_stop_when_superseded_mid_run(self):
+		ran = []
+		prefetcher = Prefetcher(timer_factory=ManualTimer)
+
+		def first():
+			ran.append("first")
+			prefetcher.cancel()
+
+		prefetcher.schedule([first, lambda: ran.append("second")])
+		ManualTimer.created[0].fire()
+		self.assertEqual(ran, ["first"])
+
+	def test_budget_and_job_limit_cap_requests(self):
+		ran = []
+		clock = FakeClock()
+		prefetcher = Prefetcher(budget=RateBudget(2, clock=clock), max_jobs=3, timer_factory=ManualTimer)
+		prefetcher.schedule([lambda i=i: ran.append(i) for i in range(5)])
+		ManualTimer.created[0].fire()
+		self.assertEqual(ran, [0, 1])
+
+	def test_failing_job_does_not_stop_the_rest(self):
+		ran = []
+		prefetcher = Prefetcher(timer_factory=ManualTimer)
+
+		def broken():
+			raise RuntimeError("offline")
+
+		prefetcher.schedule([broken, lambda: ran.append("ok")])
+		ManualTimer.created[0].fire()
+		self.assertEqual(ran, ["ok"])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from relative_time import epoch_seconds, parse_timestamp, relative_label, time_bucket
+
+
+class ParseTimestampTests(unittest.TestCase):
+	def test_mastodon_iso_format_uses_the_fast_path(self):
+		parsed = parse_timestamp("2024-05-01T12:34:56.789Z")
+		self.assertEqual(parsed, datetime(2024, 5, 1, 12, 34, 56, 789000, tzinfo=timezone.utc))
+
+	def test_other_formats_fall_back_to_dateutil(self):
+		parsed = parse_timestamp("Wed, 01 May 2024 12:34:56 +0000")
+		self.assertEqual(parsed, datetime(2024, 5, 1, 12, 34, 56, tzinfo=timezone.utc))
+
+	def test_bad_values_parse_to_none(self):
+		self.assertIsNone(parse_timestamp("not a date"))
+		self.assertIsNone(parse_timestamp(""))
+		self.assertIsNone(epoch_seconds(None))
+
+	def test_datetimes_and_strings_agree(self):
+		moment = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+		self.assertEqual(epoch_seconds(moment), epoch_seconds("2024-05-01T12:00:00.000Z"))
+
+
+class RelativeLabelTests(unittest.TestCase):
+	def setUp(self):
+		self.created = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+		self.epoch = self.created.timestamp()
+
+	def label(self, **age):
+		return relative_label(self.created, self.epoch + timedelta(**age).total_seconds())
+
+	def test_labels_are_singular_and_plural(self):
+		self.assertEqual(self.label(seconds=3), "just now")
+		self.assertEqual(self.label(seconds=47), "40 seconds ago")
+		self.assertEqual(self.label(minutes=1, seconds=30), "1 minute ago")
+		self.assertEqual(self.label(minutes=59), "59 minutes ago")
+		self.assertEqual(self.label(hours=1), "1 hour ago")
+		self.assertEqual(self.label(days=3, hours=5), "3 days ago")
+
+	def test_future_timestamps_read_as_just_now(self):
+		self.assertEqual(self.label(seconds=-30), "just now")
+
+	def test_ages_in_one_bucket_share_a_label_object(self):
+		self.assertEqual(time_bucket(121), time_bucket(179))
+		self.assertIs(self.label(minutes=2, seconds=1), self.label(minutes=2, seconds=59))
+
+	def test_accepts_precomputed_epoch_seconds(self):
+		self.assertEqual(relative_label(self.epoch, self.epoch + 7200), "2 hours ago")
+		self.assertEqual(relative_label("garbage", self.epoch), "")
+
+
+if __name__ == "__main__":
+	unittest.main()
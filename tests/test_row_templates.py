@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from row_templates import DEFAULT_ROW_TEMPLATE, RowTemplate, RowTemplateError, validate_row_template
+
+
+class RowTemplateTests(unittest.TestCase):
+	def setUp(self):
+		self.calls = []
+
+		def field(name):
+			def get(status):
+				self.calls.append(name)
+				return status.get(name)
+			return get
+
+		self.fields = {name: field(name) for name in ("author", "content", "cw", "time", "client", "replies")}
+		self.status = {"author": "Alex", "content": "Hello there, world", "cw": "", "time": "2 minutes ago", "client": "Web", "replies": 0}
+
+	def test_default_template_keeps_the_four_classic_columns(self):
+		row = RowTemplate(DEFAULT_ROW_TEMPLATE, self.fields)(self.status)
+		self.assertEqual(row, ["Alex", "Hello there, world", "2 minutes ago", "Web"])
+		self.assertEqual(RowTemplate("", self.fields).template, DEFAULT_ROW_TEMPLATE)
+
+	def test_reorders_combines_and_truncates(self):
+		template = RowTemplate("{author}: {content:5} | {time} via {client}", self.fields)
+		self.assertEqual(template(self.status), ["Alex: Hello", "2 minutes ago via Web", "", ""])
+		self.assertEqual(template.headers, ["Author", "Time", "", ""])
+
+	def test_only_used_fields_are_computed(self):
+		RowTemplate("{author} | {content}", self.fields)(self.status)
+		self.assertEqual(sorted(self.calls), ["author", "content"])
+
+	def test_zero_and_none_values(self):
+		template = RowTemplate("{replies} replies{cw}", dict(self.fields, cw=lambda s: None))
+		self.assertEqual(template(self.status)[0], "0 replies")
+
+	def test_literal_braces_survive(self):
+		self.assertEqual(RowTemplate("{{{author}}}", self.fields)(self.status)[0], "{Alex}")
+
+	def test_render_columns_refreshes_only_the_time_cell(self):
+		template = RowTemplate("{content} | {author} at {time}", self.fields)
+		self.assertEqual(template.columns_with("time"), [1])
+		self.assertEqual(template.render_columns(self.status, [1]), {1: "Alex at 2 minutes ago"})
+		self.assertNotIn("content", self.calls)
+
+	def test_prepare_runs_once_per_row(self):
+		prepared = []
+		fields = {"author": lambda parts: parts[0], "content": lambda parts: parts[1]}
+
+		def prepare(text):
+			prepared.append(text)
+			return text.split(":", 1)
+
+		self.assertEqual(RowTemplate("{author} | {content}", fields, prepare)("Alex:hi"), ["Alex", "hi", "", ""])
+		self.assertEqual(prepared, ["Alex:hi"])
+
+	def test_rejects_bad_templates(self):
+		for template in ("{nope}", "{author:>10}", "{author!r}", "{author", "a|b|c|d|e"):
+			with self.assertRaises(RowTemplateError, msg=template):
+				validate_row_template(template, self.fields)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from post_rendering import derived_text
+from search_index import SearchIndex, parse_query
+
+
+def status(status_id, content, name="Alex", cw="", tags=(), edited_at=None):
+	return {
+		"id": status_id,
+		"content": f"<p>{content}</p>",
+		"spoiler_text": cw,
+		"edited_at": edited_at,
+		"tags": [{"name": tag} for tag in tags],
+		"account": {"display_name": name, "username": name.lower(), "acct": name.lower()},
+	}
+
+
+class CountingDict(dict):
+	def __init__(self, items):
+		super().__init__(items)
+		self.reads = 0
+
+	def __getitem__(self, key):
+		self.reads += 1
+		return super().__getitem__(key)
+
+
+class SearchIndexTests(unittest.TestCase):
+	def setUp(self):
+		derived_text.clear()
+		self.index = SearchIndex()
+		self.index.add_many([
+			status(1, "Morning coffee in the garden"),
+			status(2, "Garden party tonight", name="Sam", tags=["gardening"]),
+			status(3, "Nothing to see", cw="coffee spill"),
+			{"id": "n1", "type": "mention", "status": status(4, "Coffee garden tour")},
+			{"id": "n2", "type": "follow", "account": {"id": "9"}},
+		])
+
+	def tearDown(self):
+		derived_text.clear()
+
+	def test_parse_query_splits_terms_and_phrases(self):
+		self.assertEqual(parse_query('Coffee "in the Garden" x'), (["coffee", "in", "the", "garden", "x"], [["in", "the", "garden"]]))
+
+	def test_terms_match_as_word_prefixes_and_all_must_match(self):
+		self.assertEqual(set(self.index.search("gard")), {"1", "2", "4"})
+		self.assertEqual(set(self.index.search("coff gard")), {"1", "4"})
+		self.assertEqual(self.index.search("tea"), {})
+
+	def test_phrases_must_appear_in_order(self):
+		self.assertEqual(set(self.index.search('"coffee garden"')), {"4"})
+		self.assertEqual(set(self.index.search('"garden coffee"')), set())
+
+	def test_author_tag_and_cw_matches_rank_above_body_text(self):
+		hits = self.index.search("sam")
+		self.assertEqual(set(hits), {"2"})
+		ranked = sorted(self.index.search("coffee"), key=lambda doc: -self.index.search("coffee")[doc])
+		self.assertEqual(ranked[0], "3")
+		self.assertGreater(self.index.search("garden")["2"], self.index.search("garden")["1"])
+
+	def test_edits_reindex_and_sync_drops_unloaded_posts(self):
+		self.index.add(status(1, "Evening tea", edited_at="2024-05-01T12:00:00Z"))
+		self.assertNotIn("1", self.index.search("coffee"))
+		self.assertIn("1", self.index.search("tea"))
+		self.index.sync([status(2, "Garden party tonight", name="Sam", tags=["gardening"])])
+		self.assertEqual(len(self.index), 1)
+		self.assertEqual(set(self.index.search("gard")), {"2"})
+		self.index.remove(2)
+		self.assertEqual(len(self.index), 0)
+		self.assertEqual(self.index.postings, {})
+
+	def test_searching_twenty_thousand_posts_reads_only_matching_postings(self):
+		words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+		# The fixture's posts reuse these ids with other text.
+		derived_text.clear()
+		index = SearchIndex()
+		index.add_many(status(i, f"{words[i % 10]} {words[(i // 10) % 10]} post number {i}") for i in range(20000))
+		index.postings = CountingDict(index.postings)
+		index.docs = CountingDict(index.docs)
+		hits = index.search('"alpha bravo" post')
+		self.assertEqual(len(hits), 200)
+		# One posting list per query word, and only the posts holding every word are opened for the phrase.
+		self.assertEqual(index.postings.reads, 3)
+		self.assertEqual(index.docs.reads, 400)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import threading
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from tasks import BackgroundTask, TaskGroup, run_concurrently
+
+
+class QueuedCalls:
+	def __init__(self):
+		self.pending = []
+
+	def __call__(self, func, *args):
+		self.pending.append((func, args))
+
+	def flush(self):
+		while self.pending:
+			func, args = self.pending.pop(0)
+			func(*args)
+
+
+class BackgroundTaskTests(unittest.TestCase):
+	def test_result_is_delivered_through_call_after(self):
+		queue = QueuedCalls()
+		results = []
+		task = BackgroundTask(lambda: 42, results.append, call_after=queue)
+		task.start().thread.join()
+		self.assertEqual(results, [])
+		queue.flush()
+		self.assertEqual(results, [42])
+
+	def test_errors_go_to_on_error(self):
+		errors = []
+
+		def fetch():
+			raise RuntimeError("boom")
+
+		task = BackgroundTask(fetch, lambda result: self.fail("unexpected result"), errors.append)
+		task.run()
+		self.assertEqual(len(errors), 1)
+		self.assertIsInstance(errors[0], RuntimeError)
+
+	def test_cancel_after_queueing_drops_the_result(self):
+		queue = QueuedCalls()
+		results = []
+		task = BackgroundTask(lambda: "data", results.append, call_after=queue)
+		task.run()
+		task.cancel()
+		queue.flush()
+		self.assertEqual(results, [])
+
+
+class TaskGroupTests(unittest.TestCase):
+	def test_cancel_stops_every_task_and_rejects_new_ones(self):
+		queue = QueuedCalls()
+		results = []
+		group = TaskGroup(queue)
+		first = group.run(lambda: 1, results.append)
+		first.thread.join()
+		group.cancel()
+		late = group.run(lambda: 2, results.append)
+		queue.flush()
+		self.assertTrue(first.cancelled)
+		self.assertTrue(late.cancelled)
+		self.assertIsNone(late.thread)
+		self.assertEqual(results, [])
+
+
+class RunConcurrentlyTests(unittest.TestCase):
+	def test_fetches_overlap_and_results_keep_their_order(self):
+		both_started = threading.Barrier(2, timeout=5)
+
+		def fetch(value):
+			# Each fetch waits for the other, so a sequential run would time out.
+			both_started.wait()
+			return value
+
+		self.assertEqual(run_concurrently(lambda: fetch("owned"), lambda: fetch("included")), ["owned", "included"])
+
+	def test_errors_are_raised_after_every_fetch_finishes(self):
+		finished = []
+
+		def fail():
+			raise ValueError("boom")
+
+		with self.assertRaises(ValueError):
+			run_concurrently(fail, lambda: finished.append(True))
+		self.assertEqual(finished, [True])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from threads import ReplyIndex, chunk_bounds, splice_positions
+
+
+def status(status_id, parent=None, created_at=None):
+	return {"id": status_id, "in_reply_to_id": parent, "created_at": created_at or status_id, "content": ""}
+
+
+class ReplyIndexTests(unittest.TestCase):
+	def build(self):
+		index = ReplyIndex()
+		index.add_many([
+			status("1"),
+			status("2", "1"),
+			status("4", "2"),
+			status("3", "1"),
+			status("5", "3"),
+		])
+		return index
+
+	def ids(self, statuses):
+		return [item["id"] for item in statuses]
+
+	def test_thread_lists_ancestors_and_depth_first_descendants(self):
+		index = self.build()
+		ancestors, descendants = index.thread("3")
+		self.assertEqual(self.ids(ancestors), ["1"])
+		self.assertEqual(self.ids(descendants), ["5"])
+		ancestors, descendants = index.thread("1")
+		self.assertEqual(ancestors, [])
+		self.assertEqual(self.ids(descendants), ["2", "4", "3", "5"])
+
+	def test_unknown_parent_stops_the_ancestor_walk(self):
+		index = ReplyIndex()
+		index.add(status("9", "8"))
+		self.assertEqual(index.thread("9"), ([], []))
+
+	def test_context_reblogs_notifications_and_removal(self):
+		index = self.build()
+		index.add({"id": "r1", "reblog": status("6", "4")})
+		index.add_many([{"id": "n1", "type": "mention", "status": status("7", "5")}])
+		index.add_context({"ancestors": [status("0")], "descendants": []})
+		index.add(status("1", "0"))
+		ancestors, descendants = index.thread("2")
+		self.assertEqual(self.ids(ancestors), ["0", "1"])
+		self.assertEqual(self.ids(descendants), ["4", "6"])
+		index.remove("4")
+		self.assertEqual(index.thread("2")[1], [])
+		self.assertIsNone(index.get("r1"))
+
+	def test_least_recently_seen_statuses_are_dropped_past_the_limit(self):
+		index = ReplyIndex(limit=3)
+		index.add_many([status("1"), status("2", "1"), status("3", "1")])
+		index.add(status("1"))
+		index.add(status("4", "3"))
+		self.assertIsNone(index.get("2"))
+		self.assertEqual(self.ids(index.thread("1")[1]), ["3", "4"])
+		self.assertEqual(index.replies, {"1": {"3"}, "3": {"4"}})
+
+
+class SplicePositionsTests(unittest.TestCase):
+	def test_inserts_new_rows_around_existing_ones(self):
+		self.assertEqual(splice_positions(["2", "3"], ["1", "2", "5", "3", "4"]), [(0, "1"), (2, "5"), (4, "4")])
+
+	def test_reordered_or_missing_rows_need_a_rebuild(self):
+		self.assertIsNone(splice_positions(["3", "2"], ["2", "3"]))
+		self.assertIsNone(splice_positions(["2", "9"], ["2", "3"]))
+
+
+class ChunkBoundsTests(unittest.TestCase):
+	def test_first_chunk_reaches_the_focused_post(self):
+		self.assertEqual(chunk_bounds(250, first_end=130, size=100), [(0, 130), (130, 230), (230, 250)])
+
+	def test_small_and_empty_threads(self):
+		self.assertEqual(chunk_bounds(5, first_end=1, size=100), [(0, 5)])
+		self.assertEqual(chunk_bounds(0), [])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,163 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from mastodon import MastodonNotFoundError
+
+from conversations import ConversationStore
+from timelines import Timeline, build_timeline, mention_statuses, merge_older
+
+
+class Page(list):
+	def __init__(self, items, next_params=None):
+		super().__init__(items)
+		self._pagination_next = next_params
+
+
+class RecordingFetch:
+	def __init__(self, *pages):
+		self.pages = list(pages)
+		self.calls = []
+
+	def __call__(self, **params):
+		self.calls.append(params)
+		return self.pages.pop(0)
+
+
+class FakeMastodon:
+	def __init__(self):
+		self.calls = []
+
+	def favourites(self, **params):
+		self.calls.append(("favourites", params))
+		return Page([{"id": "900"}], {"_pagination_method": "GET", "_pagination_endpoint": "/api/v1/favourites", "max_id": 12, "limit": 40})
+
+	def _Mastodon__api_request(self, method, endpoint, params={}, files={}, headers={}, access_token_override=None, base_url_override=None, do_ratelimiting=True, use_json=False, parse=True, return_response_object=False, skip_error_check=False, lang_override=None, override_type=None, force_pagination=False):
+		self.calls.append((endpoint, params))
+		return Page([{"id": "n2", "status": {"id": "s2"}}, {"id": "n1", "status": None}], {"max_id": "n1", "types": ["mention"]})
+
+
+class TimelineTests(unittest.TestCase):
+	def test_link_header_cursor_is_used_instead_of_item_ids(self):
+		mastodon = FakeMastodon()
+		timeline = build_timeline(mastodon, None, "favourites")
+		self.assertEqual(timeline.load(), [{"id": "900"}])
+		timeline.load_older()
+		self.assertEqual(mastodon.calls[-1], ("favourites", {"limit": 40, "max_id": 12}))
+
+	def test_mentions_page_by_notification_id(self):
+		mastodon = FakeMastodon()
+		timeline = build_timeline(mastodon, None, "mentions")
+		self.assertEqual(timeline.load(), [{"id": "s2"}])
+		timeline.load_older()
+		endpoint, params = mastodon.calls[-1]
+		self.assertEqual(endpoint, "/api/v1/notifications")
+		self.assertEqual(params["max_id"], "n1")
+		self.assertEqual(params["types"], ["mention"])
+
+	def test_falls_back_to_last_id_only_when_id_paged(self):
+		fetch = RecordingFetch([{"id": "3"}, {"id": "2"}], [])
+		timeline = Timeline("home", fetch)
+		timeline.load()
+		timeline.load_older()
+		self.assertEqual(fetch.calls[-1], {"limit": 40, "max_id": "2"})
+		self.assertFalse(timeline.has_more)
+
+		unpaged = Timeline("favourites", RecordingFetch([{"id": "3"}]), id_paged=False)
+		unpaged.load()
+		self.assertFalse(unpaged.has_more)
+		self.assertEqual(unpaged.load_older(), [])
+
+	def test_grouped_notifications_page_by_the_oldest_grouped_id(self):
+		fetch_calls = []
+
+		class GroupedMastodon:
+			def _Mastodon__api_request(self, method, endpoint, params={}, use_json=False):
+				fetch_calls.append((endpoint, dict(params)))
+				return {"accounts": [], "statuses": [], "notification_groups": [{"group_key": "follow-1", "type": "follow", "most_recent_notification_id": "9", "page_min_id": "4", "sample_account_ids": []}]}
+
+		timeline = build_timeline(GroupedMastodon(), None, "notifications", grouped_notifications=True)
+		self.assertEqual([item["group_key"] for item in timeline.load()], ["follow-1"])
+		timeline.load_older()
+		endpoint, params = fetch_calls[-1]
+		self.assertEqual(endpoint, "/api/v2/notifications")
+		self.assertEqual(params["max_id"], "4")
+		self.assertEqual(params["grouped_types[]"], ["favourite", "reblog", "follow"])
+
+	def test_grouped_notifications_fall_back_to_v1_on_older_servers(self):
+		class OldServer(FakeMastodon):
+			def _Mastodon__api_request(self, method, endpoint, params={}, **kwargs):
+				if endpoint == "/api/v2/notifications":
+					raise MastodonNotFoundError("Not found")
+				return super()._Mastodon__api_request(method, endpoint, params)
+
+		mastodon = OldServer()
+		items = build_timeline(mastodon, None, "notifications", grouped_notifications=True).load()
+		self.assertEqual([item["id"] for item in items], ["n2", "n1"])
+		self.assertEqual(items[0]["notifications_count"], 1)
+		self.assertEqual(mastodon.calls[-1][0], "/api/v1/notifications")
+
+	def test_catching_up_fills_the_gap_between_the_marker_and_the_newest_page(self):
+		ids = lambda *numbers: Page([{"id": str(n)} for n in numbers])
+		fetch = RecordingFetch(ids(100, 99, 98), ids(93, 92, 91), ids(96, 95, 94), ids(99, 98, 97))
+		timeline = Timeline("home", fetch, page_size=3)
+		self.assertEqual([item["id"] for item in timeline.load_since("90")], ["100", "99", "98", "97", "96", "95", "94", "93", "92", "91"])
+		self.assertEqual([call.get("min_id") for call in fetch.calls], [None, "90", "93", "96"])
+		self.assertEqual(timeline._next_params, {"max_id": "91"})
+
+	def test_a_newest_page_reaching_the_marker_is_a_single_request(self):
+		fetch = RecordingFetch(Page([{"id": "12"}, {"id": "11"}, {"id": "10"}]))
+		timeline = Timeline("home", fetch, page_size=3)
+		self.assertEqual(len(timeline.load_since("11")), 3)
+		self.assertEqual(len(fetch.calls), 1)
+
+	def test_too_far_behind_keeps_only_the_newest_page(self):
+		fetch = RecordingFetch(*[Page([{"id": str(n)} for n in range(start, start - 2, -1)]) for start in (100, 11, 21, 31)])
+		timeline = Timeline("home", fetch, page_size=2)
+		self.assertEqual([item["id"] for item in timeline.load_since("1", max_pages=3)], ["100", "99"])
+		self.assertEqual(timeline._next_params, {"max_id": "99"})
+
+	def test_direct_messages_record_their_conversations(self):
+		class Conversations:
+			def conversations(self, **params):
+				return Page([{"id": "c1", "unread": True, "last_status": {"id": "5"}}], {"max_id": "5"})
+
+		store = ConversationStore()
+		timeline = build_timeline(Conversations(), None, "direct_messages", conversations=store)
+		self.assertEqual(timeline.load(), [{"id": "5"}])
+		self.assertTrue(store.is_unread({"id": "5"}))
+		self.assertEqual(timeline._next_params, {"max_id": "5"})
+
+	def test_mentions_continue_below_the_loaded_notifications(self):
+		mastodon = FakeMastodon()
+		notifications = [{"id": "n3", "type": "mention", "status": {"id": "s3"}}, {"id": "n2", "type": "favourite", "status": {"id": "s1"}}, {"id": "n1", "type": "mention", "status": None}]
+		self.assertEqual(mention_statuses(notifications), [{"id": "s3"}])
+		timeline = build_timeline(mastodon, None, "mentions")
+		self.assertFalse(timeline.has_more)
+		timeline.start_after("n1")
+		timeline.load_older()
+		endpoint, params = mastodon.calls[-1]
+		self.assertEqual(params["max_id"], "n1")
+		self.assertEqual(params["types"], ["mention"])
+		self.assertEqual(timeline.next_max_id, "n1")
+
+	def test_unknown_kinds_have_no_timeline(self):
+		self.assertIsNone(build_timeline(FakeMastodon(), None, "unknown:1"))
+		self.assertEqual(build_timeline(FakeMastodon(), None, "hashtag:python").key, "hashtag:python")
+
+
+class MergeOlderTests(unittest.TestCase):
+	def test_overlapping_items_are_skipped(self):
+		existing = [{"id": "3"}, {"id": "2"}]
+		added = merge_older(existing, [{"id": "2"}, {"id": "1"}])
+		self.assertEqual(added, [{"id": "1"}])
+		self.assertEqual([item["id"] for item in existing], ["3", "2", "1"])
+
+
+if __name__ == "__main__":
+	unittest.main()
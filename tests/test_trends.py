@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from trends import TREND_PAGE_SIZE, TrendFeed, TrendsCache
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+class FakeTrends:
+	def __init__(self, total):
+		self.tags = [{"name": f"tag{n}"} for n in range(total)]
+		self.calls = []
+
+	def __call__(self, limit=None, offset=None):
+		self.calls.append((limit, offset))
+		return self.tags[offset:offset + limit]
+
+
+class TrendFeedTests(unittest.TestCase):
+	def test_pages_by_offset_until_a_short_page(self):
+		api = FakeTrends(TREND_PAGE_SIZE + 5)
+		feed = TrendFeed("tags", api)
+		feed.replace(feed.fetch_first())
+		self.assertTrue(feed.has_more)
+		added = feed.add_page(feed.fetch_more())
+		self.assertEqual(len(added), 5)
+		self.assertFalse(feed.has_more)
+		self.assertEqual(api.calls, [(TREND_PAGE_SIZE, 0), (TREND_PAGE_SIZE, TREND_PAGE_SIZE)])
+
+	def test_entries_shifted_between_pages_are_not_shown_twice(self):
+		feed = TrendFeed("tags", FakeTrends(0), page_size=2)
+		feed.replace([{"name": "a"}, {"name": "B"}])
+		self.assertEqual(feed.add_page([{"name": "b"}, {"name": "c"}]), [{"name": "c"}])
+
+	def test_skipped_duplicates_still_advance_the_offset(self):
+		api = FakeTrends(6)
+		api.tags[2] = dict(api.tags[1])
+		feed = TrendFeed("tags", api, page_size=3)
+		feed.replace(feed.fetch_first())
+		self.assertEqual(len(feed.items), 2)
+		self.assertEqual([entry["name"] for entry in feed.add_page(feed.fetch_more())], ["tag3", "tag4", "tag5"])
+		self.assertEqual(api.calls, [(3, 0), (3, 3)])
+
+	def test_goes_stale_after_the_ttl_and_refresh_keeps_the_same_list(self):
+		clock = FakeClock()
+		feed = TrendFeed("tags", FakeTrends(0), ttl=60, clock=clock)
+		self.assertTrue(feed.stale)
+		items = feed.items
+		feed.replace([{"name": "a"}])
+		self.assertFalse(feed.stale)
+		clock.now = 61
+		self.assertTrue(feed.stale)
+		feed.replace([{"name": "b"}])
+		self.assertIs(feed.items, items)
+		self.assertEqual(items, [{"name": "b"}])
+
+
+class TrendsCacheTests(unittest.TestCase):
+	def test_feeds_are_kept_per_instance_and_kind(self):
+		cache = TrendsCache()
+		home = cache.feed("https://a.example", "tags", FakeTrends(1))
+		self.assertIs(cache.feed("https://a.example", "tags", FakeTrends(1)), home)
+		self.assertIsNot(cache.feed("https://b.example", "tags", FakeTrends(1)), home)
+		self.assertIsNot(cache.feed("https://a.example", "links", FakeTrends(1)), home)
+
+
+if __name__ == "__main__":
+	unittest.main()
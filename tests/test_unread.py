@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MASTODON_DIR = os.path.join(PROJECT_ROOT, "Mastodon")
+sys.path.insert(0, MASTODON_DIR)
+
+from unread import UnreadCounter, unread_label
+
+
+class UnreadCounterTests(unittest.TestCase):
+	def test_interval_backs_off_while_nothing_changes(self):
+		counter = UnreadCounter(min_interval=30, max_interval=200)
+		self.assertEqual(counter.update(3), 0)
+		self.assertEqual(counter.interval, 30)
+		intervals = []
+		for _ in range(4):
+			counter.update(3)
+			intervals.append(counter.interval)
+		self.assertEqual(intervals, [60, 120, 200, 200])
+
+	def test_growth_is_reported_and_polling_speeds_up_again(self):
+		counter = UnreadCounter(min_interval=30, max_interval=300)
+		counter.update(3)
+		counter.update(3)
+		self.assertEqual(counter.update(5), 2)
+		self.assertEqual(counter.interval, 30)
+
+	def test_counts_read_elsewhere_change_the_label_without_a_fetch(self):
+		counter = UnreadCounter()
+		counter.update(5)
+		self.assertEqual(counter.update(0), 0)
+		self.assertEqual(counter.interval, counter.min_interval)
+		self.assertEqual(unread_label("Mentions", 0), "Mentions")
+		self.assertEqual(unread_label("Mentions", 4), "Mentions (4)")
+
+
+if __name__ == "__main__":
+	unittest.main()